@@ -0,0 +1 @@
+"""Performance benchmarks run against the mock SDDC Manager."""
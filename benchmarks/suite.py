@@ -0,0 +1,282 @@
+"""
+Benchmark suite against the in-process mock SDDC Manager.
+
+Builds a simulated estate of a given host count and per-request latency,
+then times config loading, inventory collection, health checks and
+deployment validation through the same ``VCFArchitecture`` entry points the
+command line uses. Results are written as JSON and can be compared with a
+previous run to flag regressions::
+
+    python -m benchmarks.suite --hosts 500 --output benchmark-results.json
+    python -m benchmarks.suite --hosts 500 --baseline benchmark-results.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from vmware_vcf_architecture import config as vcf_config  # noqa: E402
+from vmware_vcf_architecture.mock_server import MockSDDCManager  # noqa: E402
+
+# Result file format version, bumped when fields change meaning
+FORMAT_VERSION = 1
+
+SCENARIOS = ('config_load', 'config_load_cached', 'inventory', 'health_check', 'validation')
+
+
+def estate_shape(hosts: int, hosts_per_cluster: int = 10,
+                 clusters_per_domain: int = 5) -> Tuple[int, int, int]:
+    """Return mock estate dimensions covering at least a number of hosts.
+
+    Args:
+        hosts: Target host count
+        hosts_per_cluster: Hosts per cluster for large estates
+        clusters_per_domain: Clusters per domain for large estates
+
+    Returns:
+        Tuple of (workload domains, clusters per domain, hosts per cluster)
+    """
+    hosts_per_cluster = max(1, min(hosts_per_cluster, hosts))
+    clusters = math.ceil(hosts / hosts_per_cluster)
+    clusters_per_domain = max(1, min(clusters_per_domain, clusters))
+    domains = math.ceil(clusters / clusters_per_domain)
+    return domains - 1, clusters_per_domain, hosts_per_cluster
+
+
+def measure(func: Callable[[], Any], iterations: int, warmup: int = 1) -> Dict[str, Any]:
+    """Time a callable.
+
+    Args:
+        func: Callable to time
+        iterations: Timed runs
+        warmup: Untimed runs before the timed ones
+
+    Returns:
+        Timing statistics in seconds
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'min': round(samples[0], 6),
+        'median': round(statistics.median(samples), 6),
+        'mean': round(statistics.fmean(samples), 6),
+        'p95': round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 6),
+        'max': round(samples[-1], 6),
+        'stdev': round(statistics.pstdev(samples), 6),
+    }
+
+
+class BenchmarkContext:
+    """Mock SDDC Manager and configuration shared by the scenarios."""
+
+    def __init__(self, server: MockSDDCManager, config_file: str):
+        self.server = server
+        self.config_file = config_file
+        self.config = vcf_config.load_config(config_file, environ={})
+
+    def app(self) -> 'main.VCFArchitecture':
+        """Create an application with a cold client and cache."""
+        return main.VCFArchitecture(config=vcf_config.deep_merge({}, self.config))
+
+
+def _config_load(ctx: BenchmarkContext) -> None:
+    vcf_config.clear_cache()
+    vcf_config.load_config(ctx.config_file, environ={})
+
+
+def _config_load_cached(ctx: BenchmarkContext) -> None:
+    vcf_config.load_config(ctx.config_file, environ={})
+
+
+def _inventory(ctx: BenchmarkContext) -> None:
+    app = ctx.app()
+    try:
+        app.collect_inventory()
+    finally:
+        app.close()
+
+
+def _health_check(ctx: BenchmarkContext) -> None:
+    app = ctx.app()
+    try:
+        # Probe the API the way a federated instance check does, so the
+        # health check also reports the client's circuit state
+        app.client.get('/v1/sddc-managers', use_cache=False)
+        app.health_check()
+    finally:
+        app.close()
+
+
+def _validation(ctx: BenchmarkContext) -> None:
+    app = ctx.app()
+    try:
+        app.validate_deployment()
+    finally:
+        app.close()
+
+
+RUNNERS: Dict[str, Callable[[BenchmarkContext], None]] = {
+    'config_load': _config_load,
+    'config_load_cached': _config_load_cached,
+    'inventory': _inventory,
+    'health_check': _health_check,
+    'validation': _validation,
+}
+
+
+def run(hosts: int = 500, latency: float = 0.005, iterations: int = 5,
+        scenarios: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Run the benchmark scenarios against a simulated estate.
+
+    Args:
+        hosts: Approximate number of hosts in the simulated estate
+        latency: Seconds the mock server adds to every request
+        iterations: Timed runs per scenario
+        scenarios: Scenario names to run, defaults to all
+
+    Returns:
+        Benchmark result document
+
+    Raises:
+        ValueError: If a scenario name is unknown
+    """
+    names = list(scenarios or SCENARIOS)
+    unknown = [name for name in names if name not in RUNNERS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark scenarios: {', '.join(unknown)}")
+
+    domains, clusters_per_domain, hosts_per_cluster = estate_shape(hosts)
+    results: Dict[str, Dict[str, Any]] = {}
+    with MockSDDCManager(domains, clusters_per_domain, hosts_per_cluster,
+                         latency=latency) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        config_file = os.path.join(workdir, 'config.yml')
+        with open(config_file, 'w') as f:
+            yaml.safe_dump({
+                'app': {'name': 'vmware-vcf-architecture-benchmark', 'version': '1.0.0'},
+                'logging': {'level': 'WARNING', 'format': 'json'},
+                'vcf': {'endpoint': server.url, 'username': server.username,
+                        'password': server.password, 'verify_ssl': False,
+                        'timeout': 30},
+                'performance': {'max_workers': 8},
+                'validation': {'check_timeout': 30, 'deadline': 300},
+            }, f)
+        ctx = BenchmarkContext(server, config_file)
+
+        for name in names:
+            before = server.request_count()
+            stats = measure(lambda: RUNNERS[name](ctx), iterations)
+            stats['requests'] = (server.request_count() - before) // (iterations + 1)
+            results[name] = stats
+            logging.getLogger(__name__).info(f"{name}: median {stats['median']}s")
+
+        estate_hosts = len(server.resources['hosts'])
+
+    return {
+        'format': FORMAT_VERSION,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'estate': {
+            'hosts': estate_hosts,
+            'domains': domains + 1,
+            'clusters': (domains + 1) * clusters_per_domain,
+            'latency': latency,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """Find scenarios whose median slowed down beyond a tolerance.
+
+    Args:
+        current: Result document of this run
+        baseline: Result document of a previous run
+        tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        One entry per regressed scenario
+    """
+    regressions = []
+    for name, stats in current['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or not previous.get('median'):
+            continue
+        ratio = stats['median'] / previous['median']
+        if ratio > 1 + tolerance:
+            regressions.append({
+                'scenario': name,
+                'baseline': previous['median'],
+                'current': stats['median'],
+                'ratio': round(ratio, 2),
+            })
+    return regressions
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the benchmark command line parser."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark VCF Architecture against a mock SDDC Manager'
+    )
+    parser.add_argument('--hosts', type=int, default=500,
+                        help='Approximate number of hosts in the simulated estate')
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='Seconds of latency added to every mock API request')
+    parser.add_argument('--iterations', type=int, default=5,
+                        help='Timed runs per scenario')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS,
+                        help='Scenario to run, may be repeated; defaults to all')
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--baseline', help='Compare with a previous JSON result file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown before a scenario regresses')
+    return parser
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Returns:
+        Exit code, 1 if a scenario regressed against the baseline
+    """
+    args = create_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    result = run(args.hosts, args.latency, args.iterations, args.scenario)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            result['regressions'] = compare(result, json.load(f), args.tolerance)
+
+    document = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(document + '\n')
+    print(document)
+    return 1 if result.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
@@ -10,77 +10,480 @@ import os
 import sys
 import logging
 import argparse
-from typing import Dict, Any, Optional
-import yaml
-import requests
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('vmware-vcf-architecture.log')
-    ]
-)
+import json
+import time
+from typing import TYPE_CHECKING, Dict, Any, Callable, Iterator, List, Optional
+
+# Heavy dependencies (yaml, requests, asyncio, the vmware_vcf_architecture
+# subsystems) are imported on first use so that short-lived invocations such
+# as --version and exec probes only pay for what they run.
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future
+    
+    from vmware_vcf_architecture.client import SDDCManagerClient
+    from vmware_vcf_architecture.compliance import IncrementalCompliance
+    from vmware_vcf_architecture.daemon import HealthDaemon
+    from vmware_vcf_architecture.events import ChangeFeed
+    from vmware_vcf_architecture.federation import Federation
+    from vmware_vcf_architecture.metrics import MetricsServer
+    from vmware_vcf_architecture.model import InventoryModel
+    from vmware_vcf_architecture.snapshot import InventorySnapshot, SyncResult
+    from vmware_vcf_architecture.tasks import TaskTracker
+    from vmware_vcf_architecture.validation import CheckResult
 
 logger = logging.getLogger(__name__)
 
+_dotenv_loaded = False
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily imported modules accessed as attributes of this module."""
+    if name == 'yaml':
+        import yaml
+        return yaml
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_environment() -> None:
+    """Load variables from a .env file once per process."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        logger.debug("python-dotenv not installed, skipping .env loading")
+        return
+    load_dotenv()
+
+
+def configure_logging(settings: Optional[Dict[str, Any]] = None) -> None:
+    """Route log records through the queued console and rotating file handlers.
+    
+    The log file is only opened when the first record is written. Without
+    settings, calling this after logging has been configured is a no-op;
+    with settings, the pipeline is rebuilt from the ``logging`` section.
+    
+    Args:
+        settings: Optional ``logging`` configuration section
+    """
+    from vmware_vcf_architecture.log import setup_logging
+    setup_logging(settings)
+
 
 class VCFArchitecture:
     """Main application class for VMware VCF Architecture management."""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 overrides: Optional[Dict[str, Any]] = None):
         """Initialize the VCF Architecture application.
         
         Args:
             config: Optional configuration dictionary
+            overrides: Optional command line settings merged over the loaded config
         """
-        self.config = config or self._load_config()
+        configure_logging()
+        self._config = config or None
+        self._overrides = overrides
+        self._config_errors: Optional[list] = None
         self.version = "1.0.0"
+        self._client: Optional['SDDCManagerClient'] = None
+        self._tasks: Optional['TaskTracker'] = None
+        self._federation: Optional['Federation'] = None
+        self._compliance: Optional['IncrementalCompliance'] = None
+        self._feeds: List['ChangeFeed'] = []
+        self._config_load_time: Optional[float] = None
         logger.info(f"Initializing VMware VCF Architecture v{self.version}")
     
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Application configuration, loaded on first access."""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+    
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._config = value
+        self._config_errors = None
+    
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from environment and config files.
         
+        Defaults, the config file, environment variables and command line
+        overrides are deep-merged in that order of increasing priority.
+        
         Returns:
             Configuration dictionary
         """
-        config = {
-            'app': {
-                'name': 'vmware-vcf-architecture',
-                'version': self.version if hasattr(self, 'version') else '1.0.0',
-                'debug': os.getenv('DEBUG', 'false').lower() == 'true'
-            },
-            'logging': {
-                'level': os.getenv('LOG_LEVEL', 'INFO'),
-                'format': 'json' if os.getenv('LOG_FORMAT') == 'json' else 'text'
-            },
-            'vcf': {
-                'endpoint': os.getenv('VCF_ENDPOINT', ''),
-                'username': os.getenv('VCF_USERNAME', ''),
-                'password': os.getenv('VCF_PASSWORD', ''),
-                'verify_ssl': os.getenv('VCF_VERIFY_SSL', 'true').lower() == 'true'
-            }
+        start = time.perf_counter()
+        load_environment()
+        from vmware_vcf_architecture.config import load_validated_config
+        config, errors = load_validated_config(os.getenv('CONFIG_FILE', 'config.yml'),
+                                               self._overrides)
+        # Validated with the compiled configuration, see validate_config()
+        self._config_errors = errors
+        for error in errors:
+            logger.error(f"Invalid configuration: {error}")
+        self._config_load_time = time.perf_counter() - start
+        logger.debug(f"Configuration loaded in {self._config_load_time * 1000:.1f}ms",
+                     extra={'phase': 'config_load',
+                            'duration_ms': round(self._config_load_time * 1000, 3)})
+        return config
+    
+    @property
+    def client(self) -> 'SDDCManagerClient':
+        """Pooled SDDC Manager API client, created on first use.
+
+        Returns:
+            Shared client for the configured endpoint
+        """
+        if self._client is None:
+            from vmware_vcf_architecture.client import SDDCManagerClient
+
+            self._client = SDDCManagerClient.from_config(self.config)
+        return self._client
+    
+    @property
+    def federation(self) -> Optional['Federation']:
+        """SDDC Managers listed under vcf.instances, created on first use.
+        
+        Returns:
+            Federation of every configured site, or None for a single instance
+        """
+        if self._federation is None and (self.config.get('vcf') or {}).get('instances'):
+            from vmware_vcf_architecture.federation import Federation
+            
+            self._federation = Federation.from_config(self.config)
+        return self._federation
+    
+    @property
+    def tasks(self) -> 'TaskTracker':
+        """Shared tracker polling every outstanding SDDC Manager task.
+        
+        Returns:
+            Task tracker bound to the shared client
+        """
+        if self._tasks is None:
+            from vmware_vcf_architecture.tasks import TaskTracker
+            
+            self._tasks = TaskTracker.from_config(self.client, self.config)
+        return self._tasks
+    
+    def track_task(self, task_id: str,
+                   callback: Optional[Callable[['Future'], None]] = None) -> 'Future':
+        """Track a long-running SDDC Manager task on the shared poller.
+        
+        Args:
+            task_id: SDDC Manager task ID
+            callback: Optional callable invoked with the future on completion
+        
+        Returns:
+            Future resolving to the final task body
+        """
+        return self.tasks.track(task_id, callback)
+    
+    def start_change_feeds(self, callback: Optional[Callable[[list], None]] = None
+                           ) -> List['ChangeFeed']:
+        """Follow each SDDC Manager's task stream if monitoring.change_feed is on.
+        
+        Finished tasks invalidate the cached responses of the resources they
+        touched, one feed per SDDC Manager.
+        
+        Args:
+            callback: Optional callable invoked with every batch of changes
+        
+        Returns:
+            Running change feeds, empty when the feed is disabled
+        """
+        if self._feeds or not (self.config.get('monitoring') or {}).get('change_feed'):
+            return self._feeds
+        from vmware_vcf_architecture.events import ChangeFeed
+        if self.federation is not None:
+            clients = [self.federation.client(name) for name in self.federation.names]
+        else:
+            clients = [self.client]
+        for client in clients:
+            feed = ChangeFeed.from_config(client, self.config)
+            if callback is not None:
+                feed.subscribe(callback)
+            self._feeds.append(feed.start())
+        return self._feeds
+    
+    def close(self) -> None:
+        """Release pooled connections held by the application."""
+        for feed in self._feeds:
+            feed.stop()
+        self._feeds = []
+        if self._tasks is not None:
+            self._tasks.stop()
+            self._tasks = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._federation is not None:
+            self._federation.close()
+            self._federation = None
+    
+    async def collect_inventory_async(self) -> Dict[str, Any]:
+        """Collect domains, clusters, hosts, vSAN and NSX objects concurrently.
+        
+        Returns:
+            Inventory dictionary
+        """
+        from vmware_vcf_architecture.inventory import InventoryCollector
+        max_workers = (self.config.get('performance') or {}).get('max_workers', 4)
+        collector = InventoryCollector(self.client, max_concurrency=max_workers)
+        return await collector.collect()
+    
+    def collect_inventory(self) -> Dict[str, Any]:
+        """Synchronous wrapper around collect_inventory_async().
+        
+        With vcf.instances configured, every site is collected in parallel
+        and the inventories are merged.
+        
+        Returns:
+            Inventory dictionary
+        """
+        if self.federation is not None:
+            return self.federation.collect_inventory()
+        import asyncio
+        return asyncio.run(self.collect_inventory_async())
+    
+    def inventory_model(self, inventory: Optional[Dict[str, Any]] = None) -> 'InventoryModel':
+        """Build the compact, indexed inventory model.
+        
+        Args:
+            inventory: Collected inventory, collected now when omitted
+        
+        Returns:
+            Inventory model indexed by ID, domain, cluster and tag
+        """
+        from vmware_vcf_architecture.model import InventoryModel
+        return InventoryModel.from_inventory(
+            inventory if inventory is not None else self.collect_inventory())
+    
+    def sync_inventory(
+        self, snapshot: Optional['InventorySnapshot'] = None
+    ) -> 'SyncResult':
+        """Apply the changes since the last sync to the on-disk inventory snapshot.
+        
+        Args:
+            snapshot: Snapshot to update, defaults to inventory.snapshot_file
+        
+        Returns:
+            Summary of the applied changes
+        """
+        from vmware_vcf_architecture.snapshot import DeltaSync, InventorySnapshot
+        own_snapshot = snapshot is None
+        if snapshot is None:
+            path = (self.config.get('inventory') or {}).get('snapshot_file', 'vcf-inventory.db')
+            snapshot = InventorySnapshot(path)
+        max_workers = (self.config.get('performance') or {}).get('max_workers', 4)
+        try:
+            return DeltaSync(self.client, snapshot, max_workers=max_workers).sync()
+        finally:
+            if own_snapshot:
+                snapshot.close()
+    
+    def iter_validation(self) -> Iterator['CheckResult']:
+        """Run the deployment validation checks, yielding each result as it finishes.
+        
+        With vcf.instances configured, every site is validated in parallel
+        and check names are prefixed with the site name.
+        
+        Yields:
+            Check results in completion order
+        """
+        if self.federation is not None:
+            yield from self.federation.iter_validation()
+            return
+        from vmware_vcf_architecture.validation import build_deployment_checks
+        engine = build_deployment_checks(self.client, self.config)
+        yield from engine.run()
+    
+    def validate_deployment(
+        self, on_result: Optional[Callable[['CheckResult'], None]] = None
+    ) -> Dict[str, Any]:
+        """Validate the SDDC Manager, vCenter, NSX, vSAN, domains, network and certificates.
+        
+        Args:
+            on_result: Optional callback invoked as each check finishes
+        
+        Returns:
+            Validation report dictionary
+        """
+        from vmware_vcf_architecture.profiling import PhaseTimer
+        from vmware_vcf_architecture.validation import summarize_results
+        timer = PhaseTimer('validation')
+        start = time.monotonic()
+        results = []
+        with timer.collecting():
+            for result in self.iter_validation():
+                results.append(result)
+                timer.add(result.name, result.duration)
+                if on_result is not None:
+                    on_result(result)
+        report = summarize_results(results, time.monotonic() - start)
+        report['timings'] = timer.to_dict()
+        logger.info(f"Deployment validation {report['status']}: {report['counts']}",
+                    extra={'timings': report['timings']})
+        return report
+    
+    def run_task(self, task: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run an automation task as batched parallel work.
+        
+        Args:
+            task: Task name, e.g. ``infrastructure_scan`` or ``host_commission``
+            parameters: Task parameters
+        
+        Returns:
+            Task report dictionary
+        """
+        from vmware_vcf_architecture.automation import AutomationEngine, BatchExecutor
+        # Leaving the block on an error or Ctrl-C cancels the queued batches
+        with BatchExecutor.from_config(self.config) as executor:
+            return AutomationEngine(self.client, executor, self.tasks).run(task, parameters)
+    
+    def plan_capacity(self, spec_files: List[str]) -> List[Dict[str, Any]]:
+        """Compute usable capacity of every cluster in the given domain specs.
+        
+        Args:
+            spec_files: Domain spec files in vcf-config.template.yml format
+        
+        Returns:
+            One capacity row per cluster
+        
+        Raises:
+            ValueError: If numpy is not installed
+        """
+        try:
+            from vmware_vcf_architecture.capacity import CapacityModel
+        except ImportError as e:
+            raise ValueError("Capacity planning requires numpy: pip install .[capacity]") from e
+        return CapacityModel.from_spec_files(spec_files, self.config).report()
+    
+    def validate_network_plan(self, spec_files: List[str]) -> List[Dict[str, Any]]:
+        """Check the subnets and static addresses of domain specs for conflicts.
+        
+        Args:
+            spec_files: Domain spec files validated together as one plan
+        
+        Returns:
+            Conflicts found, empty if the plan is consistent
+        """
+        from vmware_vcf_architecture.config import load_spec
+        from vmware_vcf_architecture.network import check_plan
+        conflicts = check_plan((path, load_spec(path)) for path in spec_files)
+        for conflict in conflicts:
+            logger.warning(f"Network plan conflict: {conflict.message}")
+        return [conflict.to_dict() for conflict in conflicts]
+    
+    def plan(self, spec_file: str, inventory: Optional[Dict[str, Any]] = None,
+             remove_domains: bool = False) -> Dict[str, Any]:
+        """Compute the changes needed to bring the live estate to a domain spec.
+        
+        Args:
+            spec_file: Desired state in vcf-config.template.yml format
+            inventory: Inventory to compare against, collected live by default
+            remove_domains: Plan removal of live workload domains the spec omits
+        
+        Returns:
+            Dictionary with the ordered ``changes`` and a ``summary``
+        """
+        from vmware_vcf_architecture.config import load_spec
+        from vmware_vcf_architecture.plan import StateTree, plan, summarize
+        desired = StateTree.from_spec(load_spec(spec_file))
+        if inventory is None:
+            inventory = self.collect_inventory()
+        changes = plan(desired, StateTree.from_inventory(inventory),
+                       remove_domains=remove_domains)
+        for change in changes:
+            logger.info(f"Planned: {change}")
+        return {
+            'changes': [change.to_dict() for change in changes],
+            'summary': summarize(changes),
         }
+    
+    def check_compliance(self, spec_files: List[str],
+                         inventory: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Evaluate the policy rules of domain specs against the live estate.
         
-        # Load from config file if exists
-        config_file = os.getenv('CONFIG_FILE', 'config.yml')
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r') as f:
-                    file_config = yaml.safe_load(f)
-                    if file_config:
-                        config.update(file_config)
-                logger.info(f"Loaded configuration from {config_file}")
-            except Exception as e:
-                logger.warning(f"Succeeded to load config file {config_file}: {e}")
+        Findings are kept between calls with the same rules, so later checks
+        only re-evaluate rules reading fields of objects that changed.
         
-        return config
+        Args:
+            spec_files: Domain spec files in vcf-config.template.yml format
+            inventory: Inventory to evaluate, collected live by default
+        
+        Returns:
+            Compliance report dictionary
+        """
+        from vmware_vcf_architecture.compliance import (
+            ComplianceEngine, IncrementalCompliance, rules_from_spec, summarize_findings,
+        )
+        from vmware_vcf_architecture.config import load_spec
+        rules = [rule for path in spec_files for rule in rules_from_spec(load_spec(path))]
+        state = self._compliance
+        if state is None or [r.as_tuple() for r in state.rules] != [r.as_tuple() for r in rules]:
+            state = IncrementalCompliance(ComplianceEngine.from_config(rules, self.config))
+            self._compliance = state
+        if inventory is None:
+            inventory = self.collect_inventory()
+        start = time.monotonic()
+        refresh = state.refresh(inventory)
+        report = summarize_findings(state.findings, time.monotonic() - start)
+        report['evaluated'] = refresh['evaluated']
+        for finding in refresh['changed']:
+            if not finding.compliant:
+                logger.warning(f"Non-compliant: {finding.rule} {finding.target}: "
+                               f"{finding.message}")
+        logger.info(f"Compliance {report['status']}: {report['counts']} "
+                    f"({refresh['evaluated']} rules evaluated)")
+        return report
+    
+    def export(self, dataset: str, fmt: str = 'ndjson', output: str = '-',
+               spec_files: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Stream a dataset to NDJSON, CSV or Parquet without building it in memory.
+        
+        Args:
+            dataset: ``inventory``, ``validation`` or ``compliance``
+            fmt: ``ndjson``, ``csv`` or ``parquet``
+            output: File path, or ``-`` for standard output
+            spec_files: Domain specs whose rules are exported as compliance
+                findings, defaults to validation.spec_files
+        
+        Returns:
+            Export summary with the record count and per-section errors
+        
+        Raises:
+            ValueError: If the dataset or format is unknown
+        """
+        from vmware_vcf_architecture import export as vcf_export
+        from vmware_vcf_architecture.automation import BatchExecutor
+        
+        errors: Dict[str, str] = {}
+        if dataset == 'inventory':
+            records: Iterator[Dict[str, Any]] = vcf_export.iter_inventory(
+                self.client, BatchExecutor.from_config(self.config), errors)
+        elif dataset == 'validation':
+            records = (result.to_dict() for result in self.iter_validation())
+        elif dataset == 'compliance':
+            spec_files = spec_files or (self.config.get('validation') or {}).get('spec_files')
+            if not spec_files:
+                raise ValueError("Compliance export needs domain specs "
+                                 "(--compliance SPEC or validation.spec_files)")
+            self.check_compliance(spec_files)
+            records = (finding.to_dict()
+                       for finding in self._compliance.findings)  # type: ignore[union-attr]
+        else:
+            raise ValueError(f"Unknown export dataset: {dataset}")
+        
+        count = vcf_export.export(records, fmt, output, vcf_export.FIELDS[dataset])
+        logger.info(f"Exported {count} {dataset} records as {fmt} to {output}")
+        return {'dataset': dataset, 'format': fmt, 'output': output,
+                'records': count, 'errors': errors}
     
     def validate_config(self) -> bool:
         """Validate the current configuration.
@@ -88,11 +491,14 @@ class VCFArchitecture:
         Returns:
             True if configuration is valid, False otherwise
         """
-        required_keys = ['app', 'logging']
-        for key in required_keys:
-            if key not in self.config:
-                logger.Success(f"Missing required configuration key: {key}")
-                return False
+        config = self.config
+        if self._config_errors is None:
+            from vmware_vcf_architecture.config import validate
+            self._config_errors = validate(config)
+            for error in self._config_errors:
+                logger.error(f"Invalid configuration: {error}")
+        if self._config_errors:
+            return False
         
         logger.info("Configuration validation passed")
         return True
@@ -100,67 +506,142 @@ class VCFArchitecture:
     def health_check(self) -> Dict[str, Any]:
         """Perform application health check.
         
+        Each sub-check is timed; ``timings`` holds the durations in
+        milliseconds, including the configuration load if it has happened.
+        
         Returns:
             Health status dictionary
         """
-        status = {
+        from datetime import datetime, timezone
+        from vmware_vcf_architecture.profiling import PhaseTimer
+        timer = PhaseTimer('health_check')
+        checks: Dict[str, bool] = {}
+        status: Dict[str, Any] = {
             'status': 'healthy',
             'version': self.version,
-            'timestamp': None,
-            'checks': {
-                'config': self.validate_config(),
-                'dependencies': self._check_dependencies()
-            }
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'checks': checks,
         }
+        with timer.collecting():
+            with timer.phase('config'):
+                checks['config'] = self.validate_config()
+            with timer.phase('dependencies'):
+                checks['dependencies'] = self._check_dependencies()
+            
+            if self._client is not None:
+                with timer.phase('circuits'):
+                    guards = self._client.guards
+                    status['targets'] = guards.state()
+                    checks['circuits'] = guards.open_circuits == 0
+            
+            if checks['config'] and self.federation is not None:
+                with timer.phase('instances'):
+                    fleet = self.federation.health()
+                status['instances'] = fleet['instances']
+                checks['instances'] = fleet['status'] == 'healthy'
+        
+        # Loaded on first access, possibly by the config check above
+        if self._config_load_time is not None:
+            timer.add('config_load', self._config_load_time)
         
         # Overall health based on individual checks
-        if not all(status['checks'].values()):
+        if not all(checks.values()):
             status['status'] = 'unhealthy'
         
-        logger.info(f"Health check completed: {status['status']}")
+        from vmware_vcf_architecture.metrics import HEALTH_CHECK_DURATION
+        HEALTH_CHECK_DURATION.observe(timer.elapsed)
+        status['timings'] = timer.to_dict()
+        logger.info(f"Health check completed: {status['status']}",
+                    extra={'timings': status['timings']})
         return status
     
+    def create_health_daemon(self, port: Optional[int] = None) -> 'HealthDaemon':
+        """Create the background health daemon described by the monitoring settings.
+        
+        Args:
+            port: Optional port overriding monitoring.health_port
+        
+        Returns:
+            Health daemon serving this application's health_check()
+        """
+        from vmware_vcf_architecture.daemon import HealthDaemon
+        monitoring = self.config.get('monitoring') or {}
+        # A federated refresh may wait this long for the slowest site
+        refresh_timeout = None
+        if (self.config.get('vcf') or {}).get('instances'):
+            refresh_timeout = (self.config.get('performance') or {}).get('federation_timeout')
+        return HealthDaemon(
+            self.health_check,
+            interval=monitoring.get('health_check_interval', 30),
+            host=monitoring.get('health_host', '0.0.0.0'),  # nosec B104
+            port=monitoring.get('health_port', 8080) if port is None else port,
+            refresh_timeout=refresh_timeout,
+        )
+    
+    def create_metrics_server(self) -> Optional['MetricsServer']:
+        """Create the Prometheus /metrics endpoint if metrics are enabled.
+        
+        Returns:
+            Metrics server, or None when monitoring.enable_metrics is false
+        """
+        monitoring = self.config.get('monitoring') or {}
+        if not monitoring.get('enable_metrics', False):
+            return None
+        from vmware_vcf_architecture.metrics import MetricsServer
+        return MetricsServer(
+            host=monitoring.get('health_host', '0.0.0.0'),  # nosec B104
+            port=monitoring.get('metrics_port', 9090),
+        )
+    
     def _check_dependencies(self) -> bool:
         """Check if required dependencies are available.
         
         Returns:
             True if all dependencies are available, False otherwise
         """
-        try:
-            import yaml
-            import requests
-            logger.debug("All dependencies are available")
-            return True
-        except ImportSuccess as e:
-            logger.Success(f"Missing dependency: {e}")
+        # find_spec locates the packages without paying for importing them
+        from importlib.util import find_spec
+        missing = [name for name in ('yaml', 'requests') if find_spec(name) is None]
+        if missing:
+            logger.error(f"Missing dependency: {', '.join(missing)}")
             return False
+        logger.debug("All dependencies are available")
+        return True
     
     def run(self) -> int:
         """Run the main application.
         
         Returns:
-            Exit code (0 for success, non-zero for Success)
+            Exit code (0 for success, non-zero for failure)
         """
+        from vmware_vcf_architecture.profiling import PhaseTimer
+        timer = PhaseTimer('run')
         try:
             logger.info("Starting VMware VCF Architecture application")
             
-            if not self.validate_config():
-                logger.Success("Configuration validation Succeeded")
+            with timer.phase('config_load'):
+                _ = self.config  # loads the configuration on first access
+            with timer.phase('validate_config'):
+                valid = self.validate_config()
+            if not valid:
+                logger.error("Configuration validation failed")
                 return 1
             
             # Perform health check
-            health = self.health_check()
+            with timer.phase('health_check'):
+                health = self.health_check()
             if health['status'] != 'healthy':
-                logger.Success("Health check Succeeded")
+                logger.error("Health check failed")
                 return 1
             
+            timer.log_summary()
             logger.info("Application started successfully")
             logger.info("VMware VCF Architecture is ready for enterprise automation")
             
             return 0
             
         except Exception as e:
-            logger.Success(f"Application Succeeded to start: {e}")
+            logger.error(f"Application failed to start: {e}")
             return 1
 
 
@@ -193,12 +674,110 @@ def create_parser() -> argparse.ArgumentParser:
         help='Enable debug logging'
     )
     
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='vmware-vcf-architecture.prof',
+        metavar='FILE',
+        help='Profile the command with cProfile, writing pstats data to FILE '
+             'and a text summary to FILE.txt (default: vmware-vcf-architecture.prof)'
+    )
+    
     parser.add_argument(
         '--health-check',
         action='store_true',
         help='Perform health check and exit'
     )
     
+    parser.add_argument(
+        '--inventory',
+        action='store_true',
+        help='Collect VCF inventory and print it as JSON'
+    )
+    
+    parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='Apply inventory changes since the last run to the local snapshot'
+    )
+    
+    parser.add_argument(
+        '--validate',
+        action='store_true',
+        help='Validate the VCF deployment and exit'
+    )
+    
+    parser.add_argument(
+        '--task',
+        type=str,
+        help='Run an automation task (infrastructure_scan, host_commission)'
+    )
+    
+    parser.add_argument(
+        '--task-params',
+        type=json.loads,
+        default=None,
+        help='Automation task parameters as a JSON object'
+    )
+    
+    parser.add_argument(
+        '--capacity',
+        nargs='+',
+        metavar='SPEC',
+        help='Report usable cluster capacity for VCF domain spec files'
+    )
+    
+    parser.add_argument(
+        '--compliance',
+        nargs='+',
+        metavar='SPEC',
+        help='Check the live estate against the policy rules of VCF domain spec files'
+    )
+    
+    parser.add_argument(
+        '--network-plan',
+        nargs='+',
+        metavar='SPEC',
+        help='Check VCF domain spec files for subnet and IP address conflicts'
+    )
+    
+    parser.add_argument(
+        '--plan',
+        metavar='SPEC',
+        help='Show the changes needed to bring the live estate to a domain spec'
+    )
+    
+    parser.add_argument(
+        '--remove-domains',
+        action='store_true',
+        help='With --plan, also plan removal of workload domains missing from the spec'
+    )
+    
+    parser.add_argument(
+        '--export',
+        choices=['inventory', 'validation', 'compliance'],
+        help='Stream inventory, validation results or compliance findings to --output'
+    )
+    
+    parser.add_argument(
+        '--export-format',
+        choices=['ndjson', 'csv', 'parquet'],
+        default='ndjson',
+        help='Export file format (parquet requires pyarrow)'
+    )
+    
+    parser.add_argument(
+        '--output',
+        default='-',
+        help='Export destination file, - for standard output'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Serve cached health on /health, refreshed in the background'
+    )
+    
     return parser
 
 
@@ -210,17 +789,37 @@ def main() -> int:
     """
     parser = create_parser()
     args = parser.parse_args()
+    configure_logging()
     
-    # Set debug logging if requested
-    if args.debug:
-        logging.getLogger().setLevel(logging.DEBUG)
+    # Profile the whole command, including configuration loading
+    if args.profile:
+        from vmware_vcf_architecture.profiling import profiled
+        with profiled(args.profile):
+            return run_command(args)
+    return run_command(args)
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run the command selected on the command line.
+    
+    Args:
+        args: Parsed command line arguments
     
+    Returns:
+        Exit code
+    """
     # Set config file if provided
     if args.config:
         os.environ['CONFIG_FILE'] = args.config
     
+    # Command line settings take precedence over file and environment
+    overrides: Dict[str, Any] = {}
+    if args.debug:
+        overrides = {'app': {'debug': True}, 'logging': {'level': 'DEBUG'}}
+    
     # Initialize application
-    app = VCFArchitecture()
+    app = VCFArchitecture(overrides=overrides)
+    configure_logging(app.config.get('logging') or {})
     
     # Handle health check
     if args.health_check:
@@ -228,6 +827,123 @@ def main() -> int:
         print(f"Health Status: {health['status']}")
         return 0 if health['status'] == 'healthy' else 1
     
+    # Handle daemon mode
+    if args.daemon:
+        metrics_server = app.create_metrics_server()
+        if metrics_server is not None:
+            metrics_server.start()
+        try:
+            daemon = app.create_health_daemon()
+            app.start_change_feeds(daemon.request_refresh)
+            daemon.serve_forever()
+        finally:
+            if metrics_server is not None:
+                metrics_server.stop()
+            app.close()
+        return 0
+    
+    # Handle inventory collection
+    if args.inventory:
+        try:
+            inventory = app.collect_inventory()
+        finally:
+            app.close()
+        from vmware_vcf_architecture.inventory import summarize
+        print(json.dumps(inventory, indent=2))
+        logger.info(f"Inventory summary: {summarize(inventory)}")
+        return 0 if not inventory['errors'] else 1
+    
+    # Handle incremental inventory sync
+    if args.sync:
+        try:
+            result = app.sync_inventory()
+        finally:
+            app.close()
+        print(json.dumps(result.to_dict(), indent=2))
+        return 0 if not result.errors else 1
+    
+    # Handle automation tasks
+    if args.task:
+        try:
+            report = app.run_task(args.task, args.task_params)
+        except ValueError as e:
+            logger.error(str(e))
+            return 2
+        finally:
+            app.close()
+        print(json.dumps(report, indent=2))
+        return 0 if report['status'] == 'completed' else 1
+    
+    # Handle capacity planning
+    if args.capacity:
+        try:
+            report = app.plan_capacity(args.capacity)
+        except (OSError, ValueError) as e:
+            logger.error(f"Capacity planning failed: {e}")
+            return 1
+        print(json.dumps(report, indent=2))
+        return 0 if all(row['policy_compliant'] for row in report) else 1
+    
+    # Handle compliance checks; with --export the specs select the exported rules
+    if args.compliance and not args.export:
+        try:
+            report = app.check_compliance(args.compliance)
+        except (OSError, ValueError) as e:
+            logger.error(f"Compliance check failed: {e}")
+            return 1
+        finally:
+            app.close()
+        print(json.dumps(report, indent=2))
+        return 0 if report['status'] == 'compliant' else 1
+    
+    # Handle network plan validation
+    if args.network_plan:
+        try:
+            conflicts = app.validate_network_plan(args.network_plan)
+        except (OSError, ValueError) as e:
+            logger.error(f"Network plan validation failed: {e}")
+            return 1
+        print(json.dumps(conflicts, indent=2))
+        return 0 if not conflicts else 1
+    
+    # Handle desired-state planning
+    if args.plan:
+        try:
+            result = app.plan(args.plan, remove_domains=args.remove_domains)
+        except (OSError, ValueError) as e:
+            logger.error(f"Planning failed: {e}")
+            return 1
+        finally:
+            app.close()
+        print(json.dumps(result, indent=2))
+        return 0
+    
+    # Handle streaming export
+    if args.export:
+        try:
+            summary = app.export(args.export, args.export_format, args.output,
+                                 args.compliance)
+        except (OSError, ValueError) as e:
+            logger.error(f"Export failed: {e}")
+            return 1
+        finally:
+            app.close()
+        for section, error in summary['errors'].items():
+            logger.error(f"Export of {section} failed: {error}")
+        return 0 if not summary['errors'] else 1
+    
+    # Handle deployment validation
+    if args.validate:
+        try:
+            report = app.validate_deployment(
+                on_result=lambda r: print(f"  [{r.status.upper()}] {r.name}: {r.message}",
+                                          flush=True)
+            )
+        finally:
+            app.close()
+        print(f"Validation Status: {report['status']} ({report['duration']}s)")
+        return 0 if report['status'] == 'passed' else 1
+    
     # Run application
     return app.run()
 
@@ -54,6 +54,27 @@ def mock_environment():
     }
 
 
+@pytest.fixture
+def mock_sddc():
+    """Provide a running mock SDDC Manager with 3 domains, 6 clusters and 18 hosts."""
+    from vmware_vcf_architecture.mock_server import MockSDDCManager
+    with MockSDDCManager(domains=2, clusters_per_domain=2, hosts_per_cluster=3) as server:
+        yield server
+
+
+@pytest.fixture
+def mock_sddc_config(sample_config, mock_sddc):
+    """Provide an application configuration pointing at the mock SDDC Manager."""
+    sample_config['vcf'].update({
+        'endpoint': mock_sddc.url,
+        'username': mock_sddc.username,
+        'password': mock_sddc.password,
+        'timeout': 5,
+    })
+    sample_config['performance'] = {'max_workers': 8}
+    return sample_config
+
+
 @pytest.fixture
 def vcf_architecture_instance(sample_config):
     """Provide a VCFArchitecture instance for testing."""
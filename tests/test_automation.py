@@ -0,0 +1,179 @@
+"""Test suite for batched automation task execution."""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.automation import BatchExecutor
+
+
+class TestBatchExecutor:
+    """Test cases for BatchExecutor."""
+
+    def test_from_config(self):
+        """Test that the pool and batch sizes come from the performance section."""
+        executor = BatchExecutor.from_config({'performance': {'max_workers': 3, 'batch_size': 7}})
+        assert (executor.max_workers, executor.batch_size, executor.max_pending) == (3, 7, 6)
+
+    def test_batches(self):
+        """Test that objects are grouped into batch_size lists."""
+        executor = BatchExecutor(batch_size=4)
+        assert [len(b) for b in executor.batches(range(10))] == [4, 4, 2]
+
+    def test_map_batches_in_order_and_parallel(self):
+        """Test that batches run concurrently and results keep submission order."""
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work(batch):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return sum(batch)
+
+        with BatchExecutor(max_workers=4, batch_size=10) as executor:
+            results = list(executor.map_batches(work, range(100)))
+        assert [r.value for r in results] == [sum(range(i, i + 10)) for i in range(0, 100, 10)]
+        assert peak[0] == 4
+
+    def test_backpressure_bounds_consumed_input(self):
+        """Test that submission blocks while the queue is full."""
+        release = threading.Event()
+        consumed = []
+
+        def items():
+            for i in range(1000):
+                consumed.append(i)
+                yield i
+
+        with BatchExecutor(max_workers=1, batch_size=1, max_pending=2) as executor:
+            results = executor.map_batches(lambda batch: release.wait(5), items())
+            thread = threading.Thread(target=lambda: list(results))
+            thread.start()
+            time.sleep(0.1)
+            # one running, two queued, one blocked in submit
+            assert len(consumed) <= 4
+            release.set()
+            thread.join(5)
+        assert len(consumed) == 1000
+
+    def test_submit_timeout_when_full(self):
+        """Test that a bounded wait for queue space raises queue.Full."""
+        import queue
+        release = threading.Event()
+        executor = BatchExecutor(max_workers=1, max_pending=1).start()
+        try:
+            executor.submit(lambda batch: release.wait(5), [1])
+            time.sleep(0.05)
+            executor.submit(lambda batch: None, [2])
+            with pytest.raises(queue.Full):
+                executor.submit(lambda batch: None, [3], timeout=0.05)
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_failed_item_does_not_stop_batch(self):
+        """Test that per-object errors are reported individually."""
+        def check(item):
+            if item == 3:
+                raise ValueError('bad host')
+            return item * 2
+
+        with BatchExecutor(max_workers=2, batch_size=4) as executor:
+            results = list(executor.map_items(check, range(8)))
+        assert [r.item for r in results] == list(range(8))
+        assert [r.ok for r in results].count(False) == 1
+        assert str(results[3].error) == 'bad host'
+        assert results[7].value == 14
+
+    def test_cancel(self):
+        """Test that cancellation drops queued batches and stops running ones."""
+        started = threading.Event()
+        processed = []
+        executor = BatchExecutor(max_workers=1, batch_size=5).start()
+
+        def work(item):
+            started.set()
+            processed.append(item)
+            time.sleep(0.02)
+
+        results = []
+        thread = threading.Thread(target=lambda: results.extend(executor.map_items(work, range(50))))
+        thread.start()
+        started.wait(5)
+        executor.cancel()
+        thread.join(5)
+        executor.shutdown()
+
+        assert len(results) == 50
+        assert len(processed) < 50
+        assert sum(isinstance(r.error, CancelledError) for r in results) == 50 - len(processed)
+        with pytest.raises(CancelledError):
+            executor.submit(work, [1])
+
+
+class TestAutomationTasks:
+    """Test cases for VCFArchitecture.run_task against the mock SDDC Manager."""
+
+    def test_infrastructure_scan(self, mock_sddc, mock_sddc_config):
+        """Test a deep scan re-reads every host in batches."""
+        mock_sddc_config['performance'].update({'batch_size': 5})
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        report = app.run_task('infrastructure_scan', {'deep_scan': True})
+        app.close()
+
+        assert report['status'] == 'completed', report
+        assert report['result'] == {'hosts': 18, 'status': {'ASSIGNED': 18}}
+        assert mock_sddc.request_count('/v1/hosts/') == 18
+
+    def test_host_commission_batches(self, mock_sddc, mock_sddc_config):
+        """Test that commissioning sends one request per batch of host specs."""
+        mock_sddc_config['performance'].update({'batch_size': 4})
+        specs = [{'fqdn': f"esx{i:03d}.example.com", 'networkPoolId': 'np-1'} for i in range(10)]
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        before = len(app.client.get_all('/v1/hosts'))
+        report = app.run_task('host_commission', {'hosts': specs})
+        after = app.client.get_all('/v1/hosts')
+        app.close()
+
+        assert report['status'] == 'completed', report
+        assert len(report['result']['tasks']) == 3
+        assert len(after) == before + 10
+        assert sum(1 for path in mock_sddc.requests if path == '/v1/hosts') == 3 + 2
+
+    def test_failed_batch_is_reported(self, mock_sddc_config):
+        """Test that rejected batches fail the task with their host names."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        report = app.run_task('host_commission', {'hosts': [{'networkPoolId': 'np-1'}]})
+        app.close()
+        assert report['status'] == 'failed'
+        assert 'HTTP 400' in report['errors'][0]
+
+    def test_unknown_task(self, mock_sddc_config):
+        """Test that unknown task names are rejected."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        with pytest.raises(ValueError):
+            app.run_task('reboot_everything')
+        app.close()
+
+    def test_main_task(self, mock_sddc_config, capsys):
+        """Test the --task command line mode."""
+        with patch('sys.argv', ['main.py', '--task', 'infrastructure_scan',
+                                '--task-params', '{"domain_id": "domain-1"}']), \
+                patch.object(main.VCFArchitecture, '_load_config',
+                             return_value=mock_sddc_config):
+            assert main.main() == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report['result']['hosts'] == 6
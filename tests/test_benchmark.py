@@ -0,0 +1,59 @@
+"""Test suite for the benchmark harness."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import suite
+
+
+class TestBenchmarkSuite:
+    """Test cases for benchmarks.suite."""
+
+    def test_estate_shape(self):
+        """Test that estate dimensions cover the requested host count."""
+        assert suite.estate_shape(500) == (9, 5, 10)
+        domains, clusters, hosts = suite.estate_shape(18)
+        assert (domains + 1) * clusters * hosts >= 18
+
+    def test_run_records_every_scenario(self):
+        """Test a small run produces timings and request counts."""
+        result = suite.run(hosts=12, latency=0, iterations=2)
+        assert result['estate']['hosts'] >= 12
+        assert set(result['results']) == set(suite.SCENARIOS)
+        inventory = result['results']['inventory']
+        assert inventory['iterations'] == 2
+        assert inventory['min'] <= inventory['median'] <= inventory['max']
+        assert inventory['requests'] > 0
+        assert result['results']['config_load']['requests'] == 0
+
+    def test_unknown_scenario(self):
+        """Test that unknown scenario names are rejected."""
+        with pytest.raises(ValueError):
+            suite.run(hosts=4, iterations=1, scenarios=['reboot'])
+
+    def test_compare_flags_regressions(self):
+        """Test that only medians slower than the tolerance are reported."""
+        baseline = {'results': {'inventory': {'median': 1.0}, 'validation': {'median': 1.0}}}
+        current = {'results': {'inventory': {'median': 1.2}, 'validation': {'median': 1.5},
+                               'health_check': {'median': 0.1}}}
+        regressions = suite.compare(current, baseline, tolerance=0.25)
+        assert [r['scenario'] for r in regressions] == ['validation']
+        assert regressions[0]['ratio'] == 1.5
+
+    def test_cli_writes_results(self, tmp_path, capsys):
+        """Test that the command line writes JSON and fails on a regression."""
+        output = tmp_path / 'results.json'
+        baseline = tmp_path / 'baseline.json'
+        baseline.write_text(json.dumps({'results': {'config_load': {'median': 1e-9}}}))
+        code = suite.cli(['--hosts', '4', '--latency', '0', '--iterations', '1',
+                          '--scenario', 'config_load', '--output', str(output),
+                          '--baseline', str(baseline)])
+        assert code == 1
+        result = json.loads(output.read_text())
+        assert result['regressions'][0]['scenario'] == 'config_load'
+        assert json.loads(capsys.readouterr().out) == result
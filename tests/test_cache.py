@@ -0,0 +1,140 @@
+"""Test suite for the TTL + LRU response cache."""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vmware_vcf_architecture.cache import ResponseCache
+from vmware_vcf_architecture.client import SDDCManagerClient
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    def test_put_and_get(self):
+        """Test that fresh entries are returned."""
+        cache = ResponseCache(default_ttl=60)
+        cache.put('/v1/hosts', {'elements': []}, size=10)
+        assert cache.get('/v1/hosts') == {'elements': []}
+        assert cache.hits == 1
+
+    def test_expired_entry_without_validator_is_dropped(self):
+        """Test that expired entries without validators are removed."""
+        cache = ResponseCache(default_ttl=0.01)
+        cache.put('/v1/hosts', 'value')
+        time.sleep(0.02)
+        assert cache.get('/v1/hosts') is None
+        assert len(cache) == 0
+
+    def test_expired_entry_with_validator_is_kept(self):
+        """Test that expired entries keep their ETag for revalidation."""
+        cache = ResponseCache(default_ttl=0.01)
+        cache.put('/v1/hosts', 'value', etag='"abc"')
+        time.sleep(0.02)
+        entry, fresh = cache.lookup('/v1/hosts')
+        assert entry is not None and not fresh
+        assert entry.etag == '"abc"'
+
+    def test_per_resource_ttl(self):
+        """Test that the longest matching path prefix sets the TTL."""
+        cache = ResponseCache(default_ttl=300, ttls={'/v1/tasks': 5, '/v1/tasks/long': 50})
+        assert cache.ttl_for('/v1/hosts') == 300
+        assert cache.ttl_for('/v1/tasks/123') == 5
+        assert cache.ttl_for('/v1/tasks/long/1') == 50
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.evictions == 1
+
+    def test_lru_eviction_by_bytes(self):
+        """Test that the byte budget is enforced."""
+        cache = ResponseCache(max_bytes=100)
+        cache.put('a', 1, size=60)
+        cache.put('b', 2, size=60)
+        assert len(cache) == 1
+        assert cache.size_bytes == 60
+
+    def test_invalidate_prefix(self):
+        """Test prefix invalidation."""
+        cache = ResponseCache()
+        cache.put('/v1/hosts/1', 1)
+        cache.put('/v1/hosts/2', 2)
+        cache.put('/v1/clusters/1', 3)
+        assert cache.invalidate('/v1/hosts') == 2
+        assert len(cache) == 1
+
+    def test_invalidate_path(self):
+        """Test that path invalidation does not match sibling IDs."""
+        cache = ResponseCache()
+        for key in ('/v1/clusters', '/v1/clusters?pageNumber=0', '/v1/clusters/c-1',
+                    '/v1/clusters/c-1/datastores', '/v1/clusters/c-10'):
+            cache.put(key, 1)
+        assert cache.invalidate_path('/v1/clusters/c-1') == 2
+        assert cache.invalidate_path('/v1/clusters', subpaths=False) == 2
+        assert [key for key in cache._entries] == ['/v1/clusters/c-10']
+
+    def test_make_key_sorts_params(self):
+        """Test that query parameter order does not change the key."""
+        assert (ResponseCache.make_key('/v1/hosts', {'b': 1, 'a': 2})
+                == ResponseCache.make_key('/v1/hosts', {'a': 2, 'b': 1}))
+
+    def test_from_config(self):
+        """Test building the cache from performance settings."""
+        cache = ResponseCache.from_config({'performance': {'cache_ttl': 42}})
+        assert cache.default_ttl == 42
+
+
+class TestClientCaching:
+    """Test cases for cached reads through SDDCManagerClient."""
+
+    def test_repeated_reads_hit_cache(self, mock_sddc):
+        """Test that repeated reads do not reach the server."""
+        cache = ResponseCache(default_ttl=60)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               cache=cache) as api:
+            for _ in range(10):
+                api.get('/v1/clusters')
+        assert mock_sddc.request_count('/v1/clusters') == 1
+        assert cache.hit_ratio == 0.9
+
+    def test_stale_read_is_revalidated(self, mock_sddc):
+        """Test that stale entries are revalidated with If-None-Match."""
+        cache = ResponseCache(default_ttl=0.01)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               cache=cache) as api:
+            first = api.get('/v1/hosts')
+            time.sleep(0.02)
+            second = api.get('/v1/hosts')
+        assert second is first
+        assert mock_sddc.not_modified == 1
+        assert cache.revalidations == 1
+
+    def test_changed_resource_is_refetched(self, mock_sddc):
+        """Test that a changed resource replaces the stale entry."""
+        cache = ResponseCache(default_ttl=0.01)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               cache=cache) as api:
+            api.get('/v1/domains/domain-1')
+            mock_sddc.resources['domains']['domain-1']['status'] = 'ERROR'
+            time.sleep(0.02)
+            domain = api.get('/v1/domains/domain-1')
+        assert domain['status'] == 'ERROR'
+        assert mock_sddc.not_modified == 0
+
+    def test_cache_bypass(self, mock_sddc):
+        """Test that use_cache=False always reaches the server."""
+        cache = ResponseCache(default_ttl=60)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               cache=cache) as api:
+            api.get('/v1/hosts')
+            api.get('/v1/hosts', use_cache=False)
+        assert mock_sddc.request_count('/v1/hosts') == 2
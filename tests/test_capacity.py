@@ -0,0 +1,129 @@
+"""Test suite for the vectorized capacity planner."""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.capacity import CapacityModel, parse_policy
+
+TEMPLATE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'config', 'vcf-config.template.yml',
+)
+
+
+def make_spec(domains=3, hosts=4, policy='RAID-1 FTT-1'):
+    """Build a spec with identical workload domains."""
+    return {'workload_domains': [
+        {
+            'name': f"wld{i:03d}",
+            'cluster': {'name': f"c{i}", 'hosts': hosts, 'cpu_cores': 32,
+                        'memory_gb': 512, 'storage_tb': 10},
+            'vsan': {'storage_policy': policy},
+        }
+        for i in range(domains)
+    ]}
+
+
+class TestPolicies:
+    """Test cases for vSAN policy parsing."""
+
+    @pytest.mark.parametrize('policy, expected', [
+        ('RAID-1 FTT-1', (2.0, 3)),
+        ('RAID-1 FTT-2', (3.0, 5)),
+        ('RAID-5 FTT-1', (4 / 3, 4)),
+        ('RAID-6 FTT-2', (1.5, 6)),
+    ])
+    def test_supported(self, policy, expected):
+        """Test overhead and minimum hosts of the supported policies."""
+        assert parse_policy(policy) == expected
+
+    def test_unsupported(self):
+        """Test that impossible combinations are rejected."""
+        with pytest.raises(ValueError):
+            parse_policy('RAID-5 FTT-2')
+
+
+class TestCapacityModel:
+    """Test cases for CapacityModel."""
+
+    def test_template(self):
+        """Test usable capacity of the shipped template."""
+        model = CapacityModel.from_spec_files([TEMPLATE])
+        usable = model.usable()
+        assert model.names == ['mgmt-cluster', 'prod-cluster']
+        # N+1: three of four management hosts carry load
+        assert usable['usable_cpu_cores'][0] == 3 * 28
+        assert usable['usable_memory_gb'][1] == 7 * 1024
+        # RAID-1 FTT-1 with dedup and compression, 25% slack
+        assert usable['usable_vsan_tb'][0] == pytest.approx(3 * 15.4 * 1.5 * 0.75 / 2)
+        assert usable['policy_compliant'].all()
+
+    def test_policy_compliance(self):
+        """Test that clusters too small for their policy are flagged."""
+        model = CapacityModel.from_specs([make_spec(domains=1, hosts=5, policy='RAID-6 FTT-2')])
+        assert not model.usable()['policy_compliant'][0]
+
+    def test_reserve_from_config(self):
+        """Test that the capacity section sets the failover reserve."""
+        model = CapacityModel.from_specs([make_spec(domains=1)],
+                                         config={'capacity': {'reserve_hosts': 2}})
+        assert model.usable()['usable_cpu_cores'][0] == 2 * 32
+
+    def test_what_if_grid(self):
+        """Test that scenarios broadcast over every cluster in one pass."""
+        model = CapacityModel.from_specs([make_spec(domains=1000)])
+        added = np.repeat(np.arange(8), 2)
+        policies = ['RAID-1 FTT-1', 'RAID-5 FTT-1'] * 8
+        result = model.what_if(add_hosts=added, policy=policies)
+
+        assert result['usable_vsan_tb'].shape == (16, 1000)
+        # 4 + 2 hosts, N+1, RAID-5: 5 * 10 * 0.75 / (4/3)
+        assert result['usable_vsan_tb'][5, 0] == pytest.approx(5 * 10 * 0.75 * 3 / 4)
+        assert result['usable_memory_gb'][0, 0] == 3 * 512
+        assert not result['policy_compliant'][1, 0]
+        assert result['policy_compliant'][3, 0]
+
+    def test_what_if_matches_usable(self):
+        """Test that the neutral scenario equals the current capacity."""
+        model = CapacityModel.from_spec_files([TEMPLATE])
+        result = model.what_if()
+        for key, values in model.usable().items():
+            np.testing.assert_array_equal(result[key][0], values)
+
+    def test_hosts_required(self):
+        """Test sizing hosts for a capacity target."""
+        model = CapacityModel.from_specs([make_spec(domains=2)])
+        # 200 cores / 32 -> 7 hosts, 30 TB / (10 * 0.75 / 2) -> 8 hosts, plus N+1
+        required = model.hosts_required(cpu_cores=200, vsan_tb=[1, 30])
+        assert required.tolist() == [7 + 1, 8 + 1]
+        assert model.hosts_required().tolist() == [3, 3]
+
+
+class TestCapacityCommand:
+    """Test cases for the --capacity command line mode."""
+
+    def test_main_capacity(self, sample_config, capsys):
+        """Test that the report is printed as JSON."""
+        with patch('sys.argv', ['main.py', '--capacity', TEMPLATE]), \
+                patch.object(main.VCFArchitecture, '_load_config', return_value=sample_config):
+            assert main.main() == 0
+        report = json.loads(capsys.readouterr().out)
+        assert [row['domain'] for row in report] == ['mgmt01', 'prod-wld01']
+
+    def test_missing_numpy(self, sample_config, caplog):
+        """Test that a missing numpy is reported instead of raising ImportError."""
+        modules = {'numpy': None, 'vmware_vcf_architecture.capacity': None}
+        with patch('sys.argv', ['main.py', '--capacity', TEMPLATE]), \
+                patch.dict(sys.modules, modules), \
+                patch.object(main.VCFArchitecture, '_load_config', return_value=sample_config):
+            assert main.main() == 1
+        assert 'Capacity planning requires numpy: pip install .[capacity]' in caplog.text
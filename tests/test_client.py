@@ -0,0 +1,111 @@
+"""Test suite for the pooled SDDC Manager API client."""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.client import (
+    SDDCManagerClient,
+    VCFAuthenticationError,
+    VCFClientError,
+)
+
+
+@pytest.fixture
+def client(mock_sddc):
+    """Provide a client bound to the mock SDDC Manager."""
+    with SDDCManagerClient(
+        mock_sddc.url, mock_sddc.username, mock_sddc.password,
+        timeout=5, pool_size=4,
+    ) as api:
+        yield api
+
+
+class TestSDDCManagerClient:
+    """Test cases for SDDCManagerClient."""
+
+    def test_requires_endpoint(self):
+        """Test that an empty endpoint is rejected."""
+        with pytest.raises(ValueError):
+            SDDCManagerClient('')
+
+    def test_token_reused_across_calls(self, client, mock_sddc):
+        """Test that one login serves many calls."""
+        for _ in range(5):
+            client.get('/v1/domains')
+        assert mock_sddc.logins == 1
+
+    def test_connections_are_pooled(self, client, mock_sddc):
+        """Test that sequential calls share a keep-alive connection."""
+        for _ in range(10):
+            client.get('/v1/clusters')
+        assert mock_sddc.connections == 1
+
+    def test_pool_bounded_under_concurrency(self, client, mock_sddc):
+        """Test that concurrent calls never open more than pool_size connections."""
+        client.authenticate()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(lambda _: client.get('/v1/hosts'), range(64)))
+        assert mock_sddc.connections <= client.pool_size
+        assert mock_sddc.logins == 1
+
+    def test_relogin_on_rejected_token(self, client, mock_sddc):
+        """Test that a revoked token is replaced transparently."""
+        client.get('/v1/domains')
+        mock_sddc.revoke_tokens()
+        body = client.get('/v1/domains')
+        assert len(body['elements']) == 3
+        assert mock_sddc.logins == 2
+
+    def test_concurrent_rejections_share_one_relogin(self, client, mock_sddc):
+        """Test that threads rejected with the same token trigger a single login."""
+        client.authenticate()
+        mock_sddc.revoke_tokens()
+        mock_sddc.latency = 0.05
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: client.get('/v1/domains'), range(8)))
+        assert mock_sddc.logins == 2
+
+    def test_get_all_returns_elements(self, client):
+        """Test collection retrieval."""
+        hosts = client.get_all('/v1/hosts')
+        assert len(hosts) == 3 * 2 * 3
+
+    def test_bad_credentials(self, mock_sddc):
+        """Test that rejected credentials raise VCFAuthenticationError."""
+        with SDDCManagerClient(mock_sddc.url, 'admin', 'wrong') as api:
+            with pytest.raises(VCFAuthenticationError):
+                api.get('/v1/domains')
+
+    def test_http_error_raises(self, client):
+        """Test that HTTP errors surface as VCFClientError."""
+        with pytest.raises(VCFClientError) as excinfo:
+            client.get('/v1/unknown')
+        assert excinfo.value.status_code == 404
+
+    def test_from_config(self, sample_config):
+        """Test building the client from application configuration."""
+        sample_config['vcf'].update({'timeout': 12, 'retry_attempts': 5})
+        sample_config['performance'] = {'max_workers': 8}
+        api = SDDCManagerClient.from_config(sample_config)
+        assert api.endpoint == 'https://test.vcf.com'
+        assert api.timeout == 12
+        assert api.retry_attempts == 5
+        assert api.pool_size == 8
+        api.close()
+
+
+class TestApplicationClient:
+    """Test cases for the client owned by VCFArchitecture."""
+
+    def test_client_is_shared(self, sample_config):
+        """Test that the application builds its client once."""
+        app = main.VCFArchitecture(config=sample_config)
+        assert app.client is app.client
+        app.close()
+        assert app._client is None
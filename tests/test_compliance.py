@@ -0,0 +1,205 @@
+"""Test suite for compliance rule evaluation."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.compliance import (
+    COMPLIANT, NON_COMPLIANT, ComplianceEngine, IncrementalCompliance, Rule, RuleIndex,
+    rules_from_spec,
+)
+from vmware_vcf_architecture.config import load_spec
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'config', 'vcf-config.template.yml')
+
+
+def estate(domains, clusters=10, hosts=4, dedup=True):
+    """Build collected inventory with NSX clusters and vSAN datastores."""
+    inventory = {'domains': [], 'clusters': [], 'vsan_datastores': [], 'nsx_clusters': []}
+    for d in range(domains):
+        domain_id = f"domain-{d}"
+        inventory['domains'].append({'id': domain_id, 'name': f"wld{d:02d}"})
+        inventory['nsx_clusters'].append({
+            'id': f"nsx-{d}", 'domains': [{'id': domain_id}],
+            'nodes': [{'id': n} for n in range(3)],
+            'transportZones': [{'name': 'tz-overlay', 'type': 'OVERLAY'}],
+        })
+        for c in range(clusters):
+            cluster_id = f"{domain_id}-cluster-{c}"
+            inventory['clusters'].append({
+                'id': cluster_id, 'name': f"wld{d:02d}-cluster-{c}",
+                'domain': {'id': domain_id}, 'hosts': [{'id': h} for h in range(hosts + c % 2)],
+            })
+            inventory['vsan_datastores'].append({
+                'id': f"{cluster_id}-vsan", 'cluster': {'id': cluster_id},
+                'deduplication': dedup, 'compression': True,
+            })
+    return inventory
+
+
+def domain_rules(name, hosts=4):
+    """Build one rule of every kind for a domain."""
+    return [
+        Rule('cluster_min_hosts', name, (hosts,)),
+        Rule('vsan_data_services', name, (True, True)),
+        Rule('nsx_manager_cluster_size', name, (3,)),
+        Rule('nsx_transport_zones', name, (('tz-overlay', 'OVERLAY'), ('tz-vlan', 'VLAN'))),
+    ]
+
+
+class TestRules:
+    """Test cases for deriving rules from specs."""
+
+    def test_rules_from_template(self):
+        """Test the rules of the shipped domain spec template."""
+        rules = {rule.id: rule.params for rule in rules_from_spec(load_spec(TEMPLATE))}
+        assert rules == {
+            'cluster_min_hosts:mgmt01': (4,),
+            'vsan_data_services:mgmt01': (True, True),
+            'nsx_manager_cluster_size:mgmt01': (3,),
+            'nsx_transport_zones:mgmt01': (('tz-overlay', 'OVERLAY'), ('tz-vlan', 'VLAN')),
+            'cluster_min_hosts:prod-wld01': (8,),
+        }
+
+
+class TestEngine:
+    """Test cases for ComplianceEngine."""
+
+    def test_findings(self):
+        """Test each rule kind and a domain missing from the inventory."""
+        inventory = estate(1, clusters=2, hosts=3, dedup=False)
+        engine = ComplianceEngine(domain_rules('wld00') + domain_rules('wld99'), processes=1)
+        findings = {(f.rule, f.target): f for f in engine.evaluate(inventory)}
+
+        hosts = findings[('cluster_min_hosts:wld00', 'wld00-cluster-0')]
+        assert (hosts.status, hosts.message) == (NON_COMPLIANT, '3 hosts, minimum 4')
+        assert findings[('cluster_min_hosts:wld00', 'wld00-cluster-1')].status == COMPLIANT
+        assert findings[('vsan_data_services:wld00', 'wld00-cluster-1')].message == \
+            'deduplication not as specified'
+        assert findings[('nsx_manager_cluster_size:wld00', 'nsx-0')].status == COMPLIANT
+        assert 'tz-vlan (VLAN)' in findings[('nsx_transport_zones:wld00', 'nsx-0')].message
+        assert findings[('cluster_min_hosts:wld99', 'wld99')].message == 'Domain not deployed'
+
+    def test_shards_carry_only_their_domains(self):
+        """Test that each shard ships only the rules indexed for its subjects."""
+        engine = ComplianceEngine(domain_rules('a') + domain_rules('b'), shard_size=2)
+        shards = engine.shards([('cluster', 'a', 'c1', 4, True, True),
+                                ('cluster', 'a', 'c2', 4, True, True),
+                                ('cluster', 'b', 'c3', 4, True, True)])
+        assert [sorted(rules) for rules, _ in shards] == [[('cluster', 'a')], [('cluster', 'b')]]
+        assert len(shards[1][1]) == 1
+
+    def test_process_pool_matches_in_process(self):
+        """Test that sharded evaluation on worker processes gives the same findings."""
+        inventory = estate(20, clusters=50)
+        rules = [rule for d in range(20) for rule in domain_rules(f"wld{d:02d}", hosts=5)]
+        serial = ComplianceEngine(rules, processes=1).evaluate(inventory)
+        sharded = ComplianceEngine(rules, processes=2, shard_size=100).evaluate(inventory)
+        assert [f.to_dict() for f in sharded] == [f.to_dict() for f in serial]
+        assert sum(not f.compliant for f in serial) == 20 * 25 + 20
+
+
+class TestIncremental:
+    """Test cases for the rule index and incremental compliance."""
+
+    def test_index_selects_rules_by_changed_field(self):
+        """Test that only rules reading a changed field are affected."""
+        index = RuleIndex(domain_rules('a'))
+        old = ('cluster', 'a', 'c1', 4, True, True)
+        assert [r[1] for r in index.affected(old, ('cluster', 'a', 'c1', 5, True, True))] == [
+            'cluster_min_hosts']
+        assert [r[1] for r in index.affected(old, ('cluster', 'a', 'c1', 4, False, True))] == [
+            'vsan_data_services']
+        assert index.affected(old, old) == []
+        assert len(index.rules_for(('nsx', 'a', 'n1', 3, ()))) == 2
+        assert index.rules_for(('nsx', 'b', 'n1', 3, ())) == ()
+
+    def test_refresh_evaluates_only_changes(self):
+        """Test that refreshes cost the changed objects and match a full evaluation."""
+        rules = [rule for d in range(3) for rule in domain_rules(f"wld{d:02d}")]
+        rules += domain_rules('wld03')
+        state = IncrementalCompliance(ComplianceEngine(rules, processes=1))
+        inventory = estate(3, clusters=100)
+        assert state.refresh(inventory)['evaluated'] == 3 * (100 * 2 + 2)
+        assert state.refresh(inventory)['evaluated'] == 0
+
+        inventory['clusters'][0]['hosts'] = inventory['clusters'][0]['hosts'][:2]
+        inventory['vsan_datastores'][1]['compression'] = False
+        del inventory['clusters'][5]
+        refresh = state.refresh(inventory)
+        assert refresh['evaluated'] == 2
+        assert [(f.target, f.status) for f in refresh['changed']] == [
+            ('wld00-cluster-0', NON_COMPLIANT), ('wld00-cluster-1', NON_COMPLIANT)]
+        assert refresh['removed'] == 2
+
+        full = ComplianceEngine(rules, processes=1).evaluate(inventory)
+        assert sorted(f.to_dict().items() for f in state.findings) == \
+            sorted(f.to_dict().items() for f in full)
+
+    def test_deployed_domain_clears_finding(self):
+        """Test that a domain appearing in the inventory replaces its placeholder finding."""
+        state = IncrementalCompliance(ComplianceEngine(domain_rules('wld01'), processes=1))
+        inventory = estate(1)
+        state.refresh(inventory)
+        assert {f.message for f in state.findings} == {'Domain not deployed'}
+        refresh = state.refresh(estate(2))
+        assert refresh['removed'] == 4
+        assert refresh['evaluated'] == 10 * 2 + 2
+        assert 'Domain not deployed' not in {f.message for f in state.findings}
+
+
+class TestComplianceCommand:
+    """Test cases for compliance checks against the mock SDDC Manager."""
+
+    def write_spec(self, path, hosts):
+        """Write a spec for the mock management domain."""
+        spec = {'management_domain': {
+            'name': 'mgmt01',
+            'cluster': {'name': 'mgmt01-cluster-0', 'hosts': hosts, 'cpu_cores': 28,
+                        'memory_gb': 512},
+            'vsan': {'deduplication': True, 'compression': True},
+            'nsx': {'manager_cluster_size': 3,
+                    'transport_zones': [{'name': 'tz-overlay', 'type': 'OVERLAY'}]},
+        }}
+        path.write_text(yaml.dump(spec))
+        return str(path)
+
+    def test_mock_estate(self, mock_sddc_config, tmp_path):
+        """Test that the mock management domain satisfies a matching spec."""
+        spec = self.write_spec(tmp_path / 'spec.yml', hosts=3)
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            report = app.check_compliance([spec])
+        finally:
+            app.close()
+        assert report['status'] == COMPLIANT
+        assert report['counts'] == {COMPLIANT: 2 + 2 + 1 + 1}
+
+    def test_repeated_check_is_incremental(self, mock_sddc_config, mock_sddc, tmp_path):
+        """Test that a second check only re-evaluates what changed on the estate."""
+        spec = self.write_spec(tmp_path / 'spec.yml', hosts=3)
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            assert app.check_compliance([spec])['evaluated'] == 6
+            assert app.check_compliance([spec])['evaluated'] == 0
+            mock_sddc.resources['clusters']['domain-0-cluster-1']['hosts'].pop()
+            app.client.cache.invalidate()
+            report = app.check_compliance([spec])
+        finally:
+            app.close()
+        assert report['evaluated'] == 1
+        assert report['status'] == NON_COMPLIANT
+
+    def test_main_compliance(self, mock_sddc_config, tmp_path):
+        """Test that --compliance exits non-zero for a violated host minimum."""
+        spec = self.write_spec(tmp_path / 'spec.yml', hosts=4)
+        with patch('sys.argv', ['main.py', '--compliance', spec]), \
+                patch.object(main.VCFArchitecture, '_load_config',
+                             return_value=mock_sddc_config):
+            assert main.main() == 1
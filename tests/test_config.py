@@ -0,0 +1,221 @@
+"""Test suite for layered configuration loading and validation."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vmware_vcf_architecture import config as vcf_config
+
+TEMPLATE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'config', 'vcf-config.template.yml',
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty YAML cache."""
+    vcf_config.clear_cache()
+    yield
+    vcf_config.clear_cache()
+
+
+def write_yaml(path, data):
+    """Dump a document to a YAML file."""
+    with open(path, 'w') as f:
+        yaml.safe_dump(data, f)
+    return str(path)
+
+
+class TestLayering:
+    """Test cases for merging defaults, file, environment and overrides."""
+
+    def test_deep_merge_keeps_unset_keys(self):
+        """Test that nested sections are merged key by key."""
+        merged = vcf_config.deep_merge(
+            {'vcf': {'endpoint': 'a', 'username': 'u'}},
+            {'vcf': {'endpoint': 'b'}},
+        )
+        assert merged == {'vcf': {'endpoint': 'b', 'username': 'u'}}
+
+    def test_file_does_not_wipe_environment_credentials(self, tmp_path):
+        """Test that a file's vcf section keeps env-derived credentials."""
+        path = write_yaml(tmp_path / 'config.yml', {'vcf': {'timeout': 60}})
+        config = vcf_config.load_config(path, environ={
+            'VCF_USERNAME': 'admin@local', 'VCF_PASSWORD': 'secret',
+        })
+        assert config['vcf']['username'] == 'admin@local'
+        assert config['vcf']['password'] == 'secret'
+        assert config['vcf']['timeout'] == 60
+        assert config['vcf']['verify_ssl'] is True
+
+    def test_precedence(self, tmp_path):
+        """Test defaults < file < environment < overrides."""
+        path = write_yaml(tmp_path / 'config.yml', {
+            'app': {'debug': False}, 'logging': {'level': 'WARNING', 'format': 'json'},
+        })
+        config = vcf_config.load_config(
+            path,
+            overrides={'logging': {'level': 'DEBUG'}},
+            environ={'DEBUG': 'true', 'LOG_LEVEL': 'ERROR'},
+        )
+        assert config['app']['debug'] is True
+        assert config['logging'] == {'level': 'DEBUG', 'format': 'json'}
+
+    def test_missing_file_uses_defaults(self, tmp_path):
+        """Test that a missing file falls back to the defaults."""
+        config = vcf_config.load_config(str(tmp_path / 'missing.yml'), environ={})
+        assert config == vcf_config.DEFAULTS
+        assert config is not vcf_config.DEFAULTS
+
+    def test_log_format_falls_back_to_text(self, tmp_path):
+        """Test that LOG_FORMAT is case-insensitive and anything but json means text."""
+        path = str(tmp_path / 'missing.yml')
+        for raw, expected in (('JSON', 'json'), ('plain', 'text'), ('text', 'text')):
+            config = vcf_config.load_config(path, environ={'LOG_FORMAT': raw})
+            assert config['logging']['format'] == expected
+            assert vcf_config.validate(config) == []
+
+    def test_variables_are_expanded(self, tmp_path):
+        """Test that ${VAR} references are resolved from the environment."""
+        path = write_yaml(tmp_path / 'config.yml', {'vcf': {'password': '${TEST_VCF_SECRET}'}})
+        with patch.dict(os.environ, {'TEST_VCF_SECRET': 's3cret'}):
+            assert vcf_config.load_config(path, environ={})['vcf']['password'] == 's3cret'
+
+
+class TestCache:
+    """Test cases for the parsed YAML cache."""
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        """Test that repeated loads reuse the parsed document."""
+        path = write_yaml(tmp_path / 'config.yml', {'app': {'name': 'x'}})
+        with patch.object(vcf_config, '_parse_yaml', wraps=vcf_config._parse_yaml) as parse:
+            first = vcf_config.load_yaml(path)
+            second = vcf_config.load_yaml(path)
+        assert first is second
+        assert parse.call_count == 1
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """Test that content changes invalidate the cache."""
+        path = write_yaml(tmp_path / 'config.yml', {'app': {'name': 'x'}})
+        vcf_config.load_yaml(path)
+        write_yaml(path, {'app': {'name': 'longer-name'}})
+        assert vcf_config.load_yaml(path) == {'app': {'name': 'longer-name'}}
+
+    def test_touched_file_with_same_content_is_not_reparsed(self, tmp_path):
+        """Test that an mtime change alone falls back to the content hash."""
+        path = write_yaml(tmp_path / 'config.yml', {'app': {'name': 'x'}})
+        first = vcf_config.load_yaml(path)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with patch.object(vcf_config, '_parse_yaml') as parse:
+            assert vcf_config.load_yaml(path) is first
+        parse.assert_not_called()
+
+    def test_loaded_config_is_owned_by_caller(self, tmp_path):
+        """Test that changing a loaded config does not leak into later loads."""
+        path = write_yaml(tmp_path / 'config.yml', {'performance': {'max_workers': 4},
+                                                    'vcf': {'instances': [{'name': 'a'}]}})
+        config = vcf_config.load_config(path, environ={})
+        config['performance']['max_workers'] = 99
+        config['vcf']['instances'].append({'name': 'b'})
+        again = vcf_config.load_config(path, environ={})
+        assert again['performance']['max_workers'] == 4
+        assert again['vcf']['instances'] == [{'name': 'a'}]
+        assert vcf_config.load_yaml(path)['performance']['max_workers'] == 4
+
+    def test_compiled_config_is_validated_once(self, tmp_path):
+        """Test that merge and validation are reused until an input changes."""
+        path = write_yaml(tmp_path / 'config.yml', {'vcf': {'timeout': 'slow'}})
+        with patch.object(vcf_config, 'validate', wraps=vcf_config.validate) as validate:
+            first = vcf_config.load_validated_config(path, environ={})
+            second = vcf_config.load_validated_config(path, environ={})
+            assert validate.call_count == 1
+            vcf_config.load_validated_config(path, environ={'LOG_LEVEL': 'DEBUG'})
+            assert validate.call_count == 2
+        assert first == second
+        assert 'vcf.timeout: expected int or float, got str' in first[1]
+
+
+class TestValidation:
+    """Test cases for schema validation."""
+
+    def test_repository_config_is_valid(self):
+        """Test that the shipped config.yml passes validation."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config = vcf_config.load_config(os.path.join(root, 'config.yml'), environ={})
+        assert vcf_config.validate(config) == []
+
+    def test_missing_sections(self):
+        """Test that required sections are reported."""
+        errors = vcf_config.validate({'invalid': 'config'})
+        assert 'Missing required configuration key: app' in errors
+        assert 'Missing required configuration key: logging' in errors
+
+    def test_type_and_range_errors(self):
+        """Test that wrong types, choices and minimums are reported."""
+        errors = vcf_config.validate({
+            'app': {'debug': 'yes'},
+            'logging': {'level': 'LOUD'},
+            'performance': {'max_workers': 0},
+            'vcf': {'timeout': True},
+        })
+        assert 'app.debug: expected bool, got str' in errors
+        assert any(e.startswith('logging.level: must be one of') for e in errors)
+        assert 'performance.max_workers: must be at least 1' in errors
+        assert 'vcf.timeout: expected int or float, got bool' in errors
+
+
+class TestSpec:
+    """Test cases for VCF domain spec loading."""
+
+    def test_template_spec_is_valid(self):
+        """Test that the shipped template passes validation."""
+        spec = vcf_config.load_spec(TEMPLATE)
+        assert spec['management_domain']['name'] == 'mgmt01'
+
+    def test_spec_is_validated_once(self, tmp_path):
+        """Test that an unchanged spec is not revalidated."""
+        path = write_yaml(tmp_path / 'spec.yml', {'workload_domains': [
+            {'name': f'wld{i:03d}', 'cluster': {
+                'name': f'c{i}', 'hosts': 4, 'cpu_cores': 32, 'memory_gb': 512,
+            }} for i in range(500)
+        ]})
+        with patch.object(vcf_config, 'validate_spec', wraps=vcf_config.validate_spec) as check:
+            vcf_config.load_spec(path)
+            vcf_config.load_spec(path)
+        assert check.call_count == 1
+
+    def test_cluster_list(self, tmp_path):
+        """Test that a domain may list several clusters."""
+        cluster = {'hosts': 4, 'cpu_cores': 32, 'memory_gb': 512}
+        path = write_yaml(tmp_path / 'spec.yml', {'workload_domains': [
+            {'name': 'wld01', 'clusters': [dict(cluster, name='c1'), dict(cluster, name='c2')]},
+            {'name': 'wld02', 'clusters': [dict(cluster, name='c1'), dict(cluster, name='c1'),
+                                           {'name': 'c3'}]},
+        ]})
+        with pytest.raises(ValueError) as excinfo:
+            vcf_config.load_spec(path)
+        message = str(excinfo.value)
+        assert 'wld01' not in message and 'workload_domains[0]' not in message
+        assert 'workload_domains[1].clusters[1].name: duplicate cluster name c1' in message
+        assert 'workload_domains[1].clusters[2].hosts: required' in message
+
+    def test_invalid_spec(self, tmp_path):
+        """Test that spec errors are raised with their paths."""
+        path = write_yaml(tmp_path / 'spec.yml', {'workload_domains': [
+            {'name': 'wld01', 'cluster': {'name': 'c', 'hosts': 0, 'cpu_cores': 8}},
+            {'name': 'wld01', 'cluster': {'name': 'c', 'hosts': 4, 'cpu_cores': 8,
+                                          'memory_gb': 64}},
+        ]})
+        with pytest.raises(ValueError) as excinfo:
+            vcf_config.load_spec(path)
+        message = str(excinfo.value)
+        assert 'workload_domains[0].cluster.hosts: must be at least 1' in message
+        assert 'workload_domains[0].cluster.memory_gb: required' in message
+        assert 'workload_domains[1].name: duplicate domain name wld01' in message
@@ -0,0 +1,130 @@
+"""Test suite for the health daemon."""
+
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.daemon import HealthDaemon
+
+
+def _get(daemon, path):
+    host, port = daemon.address
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestHealthDaemon:
+    """Test cases for HealthDaemon."""
+
+    def test_serves_cached_result(self):
+        """Test that probes never trigger a health recomputation."""
+        calls = []
+
+        def check():
+            calls.append(1)
+            return {'status': 'healthy', 'n': len(calls)}
+
+        with HealthDaemon(check, interval=60, host='127.0.0.1', port=0) as daemon:
+            assert _wait_for(lambda: daemon.last_result is not None)
+            for _ in range(20):
+                status, body = _get(daemon, '/health')
+                assert status == 200
+                assert body['status'] == 'healthy'
+        assert len(calls) == 1
+
+    def test_unhealthy_returns_503(self):
+        """Test that an unhealthy result maps to HTTP 503."""
+        with HealthDaemon(lambda: {'status': 'unhealthy'}, interval=60,
+                          host='127.0.0.1', port=0) as daemon:
+            assert _wait_for(lambda: daemon.last_result is not None)
+            assert _get(daemon, '/health')[0] == 503
+
+    def test_starting_before_first_result(self):
+        """Test that a slow first check reports starting instead of blocking."""
+        release = threading.Event()
+
+        def check():
+            release.wait(5)
+            return {'status': 'healthy'}
+
+        with HealthDaemon(check, interval=60, host='127.0.0.1', port=0) as daemon:
+            status, body = _get(daemon, '/health')
+            assert status == 503
+            assert body['status'] == 'starting'
+            assert _get(daemon, '/health/live')[0] == 200
+            release.set()
+
+    def test_background_refresh(self):
+        """Test that results are refreshed on the configured interval."""
+        counter = {'n': 0}
+
+        def check():
+            counter['n'] += 1
+            return {'status': 'healthy', 'n': counter['n']}
+
+        with HealthDaemon(check, interval=0.05, host='127.0.0.1', port=0) as daemon:
+            assert _wait_for(lambda: counter['n'] >= 3)
+            assert _get(daemon, '/health')[1]['n'] >= 2
+
+    def test_check_exception_is_unhealthy(self):
+        """Test that a failing check is reported as unhealthy."""
+        def check():
+            raise RuntimeError('boom')
+
+        daemon = HealthDaemon(check, interval=60)
+        assert daemon.refresh()['status'] == 'unhealthy'
+
+    def test_unknown_path(self):
+        """Test that unknown paths return 404."""
+        with HealthDaemon(lambda: {'status': 'healthy'}, interval=60,
+                          host='127.0.0.1', port=0) as daemon:
+            assert _get(daemon, '/nope')[0] == 404
+
+
+class TestApplicationDaemon:
+    """Test cases for the daemon created by VCFArchitecture."""
+
+    def test_create_health_daemon(self, sample_config):
+        """Test that the daemon uses the monitoring settings."""
+        sample_config['monitoring'] = {'health_check_interval': 7, 'health_port': 18080}
+        daemon = main.VCFArchitecture(config=sample_config).create_health_daemon()
+        assert daemon.interval == 7
+        assert daemon.port == 18080
+
+    def test_liveness_allows_slow_federated_refresh(self, sample_config):
+        """Test that a refresh waiting on the federation timeout keeps the pod live."""
+        sample_config['monitoring'] = {'health_check_interval': 30}
+        sample_config['performance'] = {'federation_timeout': 120}
+        daemon = main.VCFArchitecture(config=sample_config).create_health_daemon()
+        assert daemon.stale_after == 95
+        sample_config['vcf']['instances'] = [{'name': 'a', 'endpoint': 'https://a'}]
+        daemon = main.VCFArchitecture(config=sample_config).create_health_daemon()
+        assert daemon.stale_after == 155
+
+        daemon._cached = (200, b'{}', time.monotonic() - 140)
+        assert daemon.is_live()
+        daemon._cached = (200, b'{}', time.monotonic() - 160)
+        assert not daemon.is_live()
+
+    def test_parser_daemon(self):
+        """Test daemon argument."""
+        assert main.create_parser().parse_args(['--daemon']).daemon is True
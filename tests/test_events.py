@@ -0,0 +1,164 @@
+"""Test suite for the task-based change feed."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.client import SDDCManagerClient
+from vmware_vcf_architecture.daemon import HealthDaemon
+from vmware_vcf_architecture.events import ChangeFeed
+
+CLUSTER = 'domain-0-cluster-0'
+
+
+@pytest.fixture
+def client(mock_sddc_config):
+    """Provide a caching client for the mock SDDC Manager."""
+    mock_sddc_config['vcf']['retry_attempts'] = 0
+    client = SDDCManagerClient.from_config(mock_sddc_config)
+    yield client
+    client.close()
+
+
+def warm(client):
+    """Cache the listings and datastores of every cluster."""
+    for cluster in client.get_all('/v1/clusters'):
+        client.get(f"/v1/clusters/{cluster['id']}/datastores")
+    client.get_all('/v1/hosts')
+
+
+def cached(client, prefix):
+    """Cache keys starting with a prefix."""
+    return [key for key in client.cache._entries if key.startswith(prefix)]
+
+
+class TestChangeFeed:
+    """Test cases for ChangeFeed against the mock SDDC Manager."""
+
+    def test_first_round_positions_cursor(self, client, mock_sddc):
+        """Test that tasks finished before the feed started are not delivered."""
+        mock_sddc.add_task('Old task', [{'type': 'CLUSTER', 'resourceId': CLUSTER}])
+        feed = ChangeFeed(client)
+        assert feed.cursor is None
+        assert feed.poll() == []
+        assert feed.cursor.startswith(
+            mock_sddc.resources['tasks']['task-0']['completionTimestamp'][:23])
+        assert feed.poll() == []
+
+    def test_finished_task_invalidates_its_resources(self, client, mock_sddc):
+        """Test that only the touched cluster and the listings are dropped."""
+        feed = ChangeFeed(client)
+        feed.poll()
+        warm(client)
+        requests = mock_sddc.request_count('/v1/clusters/')
+        mock_sddc.resources['clusters'][CLUSTER]['hosts'].pop()
+        mock_sddc.add_task('Remove host', [{'type': 'CLUSTER', 'resourceId': CLUSTER}])
+
+        changes = feed.poll()
+        assert [(c.name, c.status, c.resources) for c in changes] == [
+            ('Remove host', 'SUCCESSFUL', [('CLUSTER', CLUSTER)])]
+        assert cached(client, f"/v1/clusters/{CLUSTER}/") == []
+        assert len(cached(client, '/v1/clusters/domain-')) == 5
+        assert cached(client, '/v1/clusters?') == []
+        assert cached(client, '/v1/hosts?') == []
+
+        warm(client)
+        assert mock_sddc.request_count('/v1/clusters/') == requests + 1
+        assert feed.poll() == []
+
+    def test_running_task_is_delivered_once_finished(self, client, mock_sddc):
+        """Test that a task is picked up when it finishes, not when it starts."""
+        feed = ChangeFeed(client)
+        feed.poll()
+        mock_sddc.add_task('Expand cluster', duration=0.2)
+        assert feed.poll() == []
+        time.sleep(0.25)
+        assert [change.name for change in feed.poll()] == ['Expand cluster']
+
+    def test_outage_keeps_cursor(self, client, mock_sddc):
+        """Test that tasks finishing while the API is down are delivered afterwards."""
+        feed = ChangeFeed(client)
+        feed.poll()
+        cursor = feed.cursor
+        mock_sddc.fail_status = 503
+        mock_sddc.add_task('Commission hosts')
+        assert feed.poll() == []
+        assert feed.cursor == cursor
+        mock_sddc.fail_status = None
+        assert [change.name for change in feed.poll()] == ['Commission hosts']
+
+    def test_paging_stops_at_horizon(self, client, mock_sddc):
+        """Test that later rounds read only the pages with recent tasks."""
+        for i in range(250):
+            mock_sddc.add_task(f"Old task {i}", duration=0)
+        time.sleep(0.01)
+        mock_sddc.add_task('Recent task', duration=0)
+        feed = ChangeFeed(client)
+        feed.poll()
+        assert mock_sddc.request_count('/v1/tasks') == 3
+
+        mock_sddc.add_task('Rename cluster', [{'type': 'CLUSTER', 'resourceId': CLUSTER}])
+        assert [change.name for change in feed.poll()] == ['Rename cluster']
+        assert feed.poll() == []
+        assert mock_sddc.request_count('/v1/tasks') == 5
+
+    def test_long_running_task_keeps_its_pages(self, client, mock_sddc):
+        """Test that a task still running on an old page is delivered when it finishes."""
+        mock_sddc.add_task('Deploy domain', duration=0.3)
+        time.sleep(0.01)
+        for i in range(150):
+            mock_sddc.add_task(f"Task {i}", duration=0)
+        time.sleep(0.01)
+        mock_sddc.add_task('Recent task', duration=0)
+        feed = ChangeFeed(client)
+        feed.poll()
+        time.sleep(0.3)
+        assert [change.name for change in feed.poll()] == ['Deploy domain']
+        requests = mock_sddc.request_count('/v1/tasks')
+        assert feed.poll() == []
+        assert mock_sddc.request_count('/v1/tasks') == requests + 1
+
+    def test_subscribers_refresh_health(self, client, mock_sddc):
+        """Test that a delivered change refreshes the health daemon immediately."""
+        calls = []
+        with HealthDaemon(lambda: calls.append(1) or {'status': 'healthy'}, interval=60,
+                          host='127.0.0.1', port=0) as daemon:
+            feed = ChangeFeed(client, interval=0.05)
+            feed.subscribe(daemon.request_refresh)
+            feed.poll()
+            with feed:
+                mock_sddc.add_task('Deploy domain',
+                                   [{'type': 'DOMAIN', 'resourceId': 'domain-1'}])
+                deadline = time.monotonic() + 5
+                while len(calls) < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+        assert len(calls) == 2
+
+
+class TestApplicationFeeds:
+    """Test cases for starting change feeds from the application."""
+
+    def test_disabled_by_default(self, mock_sddc_config):
+        """Test that no feed runs unless monitoring.change_feed is set."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            assert app.start_change_feeds() == []
+        finally:
+            app.close()
+
+    def test_feed_per_client(self, mock_sddc_config):
+        """Test that the feed follows the shared client and stops on close."""
+        mock_sddc_config['monitoring'] = {'change_feed': True, 'change_feed_interval': 60}
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            feeds = app.start_change_feeds()
+            assert [feed.client for feed in feeds] == [app.client]
+            assert app.start_change_feeds() is feeds
+        finally:
+            app.close()
+        assert feeds[0]._thread is None
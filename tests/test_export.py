@@ -0,0 +1,154 @@
+"""Test suite for streaming export."""
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture import export as vcf_export
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(REPO_ROOT, 'config', 'vcf-config.template.yml')
+
+
+def records(count):
+    """Generate host-like records."""
+    for i in range(count):
+        yield {'id': f"host-{i}", 'fqdn': f"esx{i:06d}.example.com", 'status': 'ASSIGNED',
+               'domain': {'id': 'domain-1'}, 'cluster': {'id': 'domain-1-cluster-0'},
+               'tags': ['a', 'b']}
+
+
+class TestWriters:
+    """Test cases for the record writers."""
+
+    def test_flatten(self):
+        """Test that nested objects become dotted keys and lists JSON."""
+        assert vcf_export.flatten({'a': {'b': {'c': 1}}, 'd': [1, 2], 'e': None}) == {
+            'a.b.c': 1, 'd': '[1, 2]', 'e': None,
+        }
+
+    def test_ndjson(self):
+        """Test one complete JSON document per line."""
+        stream = io.StringIO()
+        assert vcf_export.write_ndjson(records(3), stream) == 3
+        lines = stream.getvalue().splitlines()
+        assert json.loads(lines[2])['domain'] == {'id': 'domain-1'}
+
+    def test_csv_columns(self):
+        """Test that CSV has the dataset header and flattened columns."""
+        stream = io.StringIO()
+        fields = vcf_export.FIELDS['inventory']
+        vcf_export.export(records(2), 'csv', '-', fields, stdout=stream)
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        assert list(rows[0]) == [name for name, _ in fields]
+        assert rows[1]['domain.id'] == 'domain-1'
+        assert rows[1]['fqdn'] == 'esx000001.example.com'
+
+    def test_streaming_memory_is_flat(self, tmp_path):
+        """Test that exporting many records does not hold them in memory."""
+        tracemalloc.start()
+        try:
+            count = vcf_export.export(records(20000), 'ndjson', str(tmp_path / 'out.ndjson'),
+                                      vcf_export.FIELDS['inventory'])
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert count == 20000
+        assert peak < 1024 * 1024
+
+    def test_parquet(self, tmp_path):
+        """Test that Parquet is written in row groups with the dataset schema."""
+        pq = pytest.importorskip('pyarrow.parquet')
+        path = str(tmp_path / 'out.parquet')
+        with patch.object(vcf_export, 'PARQUET_BATCH_SIZE', 100):
+            count = vcf_export.export(records(250), 'parquet', path,
+                                      vcf_export.FIELDS['inventory'])
+        parquet = pq.ParquetFile(path)
+        assert count == 250
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.read().column('domain.id')[0].as_py() == 'domain-1'
+
+    def test_parquet_needs_a_file(self):
+        """Test that Parquet cannot be streamed to standard output."""
+        with pytest.raises(ValueError):
+            vcf_export.export(records(1), 'parquet', '-', vcf_export.FIELDS['inventory'])
+
+
+class TestExportCommand:
+    """Test cases for VCFArchitecture.export against the mock SDDC Manager."""
+
+    def test_inventory_matches_collection(self, mock_sddc_config, tmp_path):
+        """Test that streamed inventory has the same objects as collect_inventory()."""
+        path = tmp_path / 'inventory.ndjson'
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            summary = app.export('inventory', 'ndjson', str(path))
+            inventory = app.collect_inventory()
+        finally:
+            app.close()
+
+        sections = Counter(json.loads(line)['section'] for line in path.read_text().splitlines())
+        expected = {name: len(value) for name, value in inventory.items()
+                    if isinstance(value, list)}
+        assert sections == expected
+        assert summary['records'] == sum(expected.values())
+        assert summary['errors'] == {}
+
+    def test_unknown_dataset(self, mock_sddc_config):
+        """Test that unknown datasets are rejected."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        with pytest.raises(ValueError):
+            app.export('everything')
+
+    def test_main_export_validation_csv(self, mock_sddc_config, tmp_path):
+        """Test the --export command line mode."""
+        path = tmp_path / 'validation.csv'
+        with patch('sys.argv', ['main.py', '--export', 'validation', '--export-format', 'csv',
+                                '--output', str(path)]), \
+                patch.object(main.VCFArchitecture, '_load_config',
+                             return_value=mock_sddc_config):
+            assert main.main() == 0
+        rows = list(csv.DictReader(path.open()))
+        assert {row['name'] for row in rows} >= {'sddc_manager', 'vcenter', 'nsx', 'vsan'}
+        assert all(row['status'] == 'passed' for row in rows)
+
+    def test_compliance_csv(self, mock_sddc_config, tmp_path):
+        """Test that compliance findings of a domain spec can be exported."""
+        path = tmp_path / 'compliance.csv'
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            summary = app.export('compliance', 'csv', str(path), [TEMPLATE])
+        finally:
+            app.close()
+        rows = list(csv.DictReader(path.open()))
+        assert list(rows[0]) == [name for name, _ in vcf_export.FIELDS['compliance']]
+        assert summary['records'] == len(rows)
+        assert {row['rule'] for row in rows} >= {'cluster_min_hosts:mgmt01',
+                                                  'cluster_min_hosts:prod-wld01'}
+
+    def test_stdout_carries_only_records(self, mock_sddc_config, tmp_path):
+        """Test that log output never mixes into an export on standard output."""
+        config = tmp_path / 'config.yml'
+        config.write_text(yaml.safe_dump(mock_sddc_config))
+        result = subprocess.run(
+            [sys.executable, os.path.join(REPO_ROOT, 'main.py'), '--config', str(config),
+             '--export', 'inventory'],
+            cwd=tmp_path, env=dict(os.environ, PYTHONPATH=REPO_ROOT),
+            capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        lines = result.stdout.splitlines()
+        assert len(lines) == 18 + 6 + 3 + 3 + 3 + 6
+        assert all('section' in json.loads(line) for line in lines)
+        assert 'Exported 39 inventory records' in result.stderr
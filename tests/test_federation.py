@@ -0,0 +1,146 @@
+"""Test suite for multi-instance federation."""
+
+import os
+import socket
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.config import validate
+from vmware_vcf_architecture.federation import Federation, instance_configs
+from vmware_vcf_architecture.mock_server import MockSDDCManager
+
+
+def site(server, name):
+    """Build a vcf.instances entry for a mock SDDC Manager."""
+    return {'name': name, 'endpoint': server.url, 'username': server.username,
+            'password': server.password}
+
+
+def unused_url():
+    """Return a local URL nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture
+def fleet_config(sample_config, mock_sddc):
+    """Provide a configuration with the mock SDDC Manager and a smaller second site."""
+    with MockSDDCManager(domains=1, clusters_per_domain=1, hosts_per_cluster=2) as second:
+        sample_config['vcf'] = {'timeout': 5, 'retry_attempts': 0,
+                                'instances': [site(mock_sddc, 'site-a'), site(second, 'site-b')]}
+        sample_config['performance'] = {'max_workers': 4}
+        yield sample_config
+
+
+class TestInstanceConfigs:
+    """Test cases for expanding vcf.instances."""
+
+    def test_entries_inherit_shared_settings(self):
+        """Test that each site is merged over the shared vcf settings."""
+        config = {'vcf': {'verify_ssl': False, 'timeout': 10, 'instances': [
+            {'name': 'a', 'endpoint': 'https://a.example.com', 'timeout': 60},
+            {'endpoint': 'https://b.example.com:8443'},
+        ]}}
+        sites = dict(instance_configs(config))
+        assert list(sites) == ['a', 'b.example.com:8443']
+        assert sites['a']['vcf'] == {'verify_ssl': False, 'timeout': 60,
+                                     'endpoint': 'https://a.example.com'}
+        assert sites['b.example.com:8443']['vcf']['timeout'] == 10
+
+    def test_duplicate_names(self):
+        """Test that duplicate site names are rejected."""
+        config = {'vcf': {'instances': [{'name': 'a', 'endpoint': 'https://a'},
+                                        {'name': 'a', 'endpoint': 'https://b'}]}}
+        with pytest.raises(ValueError):
+            instance_configs(config)
+        assert any('duplicate' in error for error in validate(config, required=()))
+
+    def test_validation(self):
+        """Test that instance entries are checked against the vcf schema."""
+        errors = validate({'vcf': {'instances': [{'timeout': 'slow'}, 'x']}}, required=())
+        assert 'vcf.instances[0].endpoint: required' in errors
+        assert 'vcf.instances[0].timeout: expected int or float, got str' in errors
+        assert 'vcf.instances[1]: expected mapping, got str' in errors
+
+
+class TestFederation:
+    """Test cases for fleet-wide operations against mock SDDC Managers."""
+
+    def test_health_takes_the_slowest_site(self, sample_config):
+        """Test that sites are probed in parallel rather than one after another."""
+        with MockSDDCManager(latency=0.3) as a, MockSDDCManager(latency=0.3) as b, \
+                MockSDDCManager(latency=0.3) as c:
+            sample_config['vcf'] = {'instances': [site(a, 'a'), site(b, 'b'), site(c, 'c')]}
+            federation = Federation.from_config(sample_config)
+            try:
+                start = time.perf_counter()
+                health = federation.health()
+                elapsed = time.perf_counter() - start
+            finally:
+                federation.close()
+        assert health['status'] == 'healthy'
+        # Login and probe cost two requests per site: 0.6s in parallel, 1.8s in sequence
+        assert elapsed < 1.2
+        assert all(entry['latency_ms'] >= 600 for entry in health['instances'].values())
+
+    def test_unreachable_site(self, fleet_config):
+        """Test that a down site is reported without affecting the others."""
+        fleet_config['vcf']['instances'].append({'name': 'site-c', 'endpoint': unused_url()})
+        app = main.VCFArchitecture(config=fleet_config)
+        try:
+            health = app.health_check()
+            inventory = app.collect_inventory()
+        finally:
+            app.close()
+        assert health['status'] == 'unhealthy'
+        assert health['checks']['instances'] is False
+        assert health['instances']['site-a']['status'] == 'healthy'
+        assert health['instances']['site-c']['status'] == 'unhealthy'
+        assert inventory['instances']['site-c']['hosts'] == 0
+        assert len(inventory['hosts']) == 22
+        assert 'site-c:hosts' in inventory['errors']
+
+    def test_slow_site_times_out(self, sample_config, mock_sddc):
+        """Test that the federation timeout bounds the wait for a slow site."""
+        with MockSDDCManager(latency=2) as slow:
+            sample_config['vcf'] = {'instances': [site(mock_sddc, 'fast'), site(slow, 'slow')]}
+            sample_config['performance'] = {'federation_timeout': 0.5}
+            federation = Federation.from_config(sample_config)
+            try:
+                start = time.perf_counter()
+                health = federation.health()
+                assert time.perf_counter() - start < 1.5
+            finally:
+                federation.close()
+        assert health['instances']['fast']['status'] == 'healthy'
+        assert 'No response within 0.5s' in health['instances']['slow']['error']
+
+    def test_merged_inventory(self, fleet_config):
+        """Test that inventories are merged and tagged with their site."""
+        app = main.VCFArchitecture(config=fleet_config)
+        try:
+            inventory = app.collect_inventory()
+        finally:
+            app.close()
+        assert inventory['errors'] == {}
+        assert inventory['instances']['site-a']['hosts'] == 18
+        assert inventory['instances']['site-b']['hosts'] == 4
+        assert len(inventory['hosts']) == 22
+        assert {host['instance'] for host in inventory['hosts']} == {'site-a', 'site-b'}
+
+    def test_validation_per_site(self, fleet_config):
+        """Test that every site is validated and results carry the site name."""
+        app = main.VCFArchitecture(config=fleet_config)
+        try:
+            report = app.validate_deployment()
+        finally:
+            app.close()
+        names = {result['name'] for result in report['results']}
+        assert {'site-a/vcenter', 'site-b/vcenter', 'site-a/nsx'} <= names
+        assert report['status'] == 'passed'
@@ -0,0 +1,80 @@
+"""Test suite for asynchronous inventory collection."""
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.client import SDDCManagerClient
+from vmware_vcf_architecture.inventory import InventoryCollector, summarize
+
+
+class TestInventoryCollector:
+    """Test cases for InventoryCollector."""
+
+    def test_collects_all_sections(self, mock_sddc):
+        """Test that every inventory section is populated."""
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password) as api:
+            inventory = asyncio.run(InventoryCollector(api, max_concurrency=4).collect())
+
+        assert summarize(inventory) == {
+            'domains': 3,
+            'clusters': 6,
+            'hosts': 18,
+            'vcenters': 3,
+            'nsx_clusters': 3,
+            'vsan_datastores': 6,
+        }
+        assert inventory['errors'] == {}
+        assert inventory['collected_at']
+
+    def test_fan_out_is_concurrent(self, mock_sddc):
+        """Test that collection time tracks the slowest stage, not the sum."""
+        mock_sddc.latency = 0.1
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               pool_size=8) as api:
+            api.authenticate()
+            start = time.perf_counter()
+            asyncio.run(InventoryCollector(api, max_concurrency=8).collect())
+            elapsed = time.perf_counter() - start
+
+        # 5 collections + 6 vSAN lookups would take 1.1s serially
+        assert elapsed < 0.6
+
+    def test_failed_section_is_reported(self, mock_sddc):
+        """Test that one failing collection does not abort the walk."""
+        del mock_sddc.resources['nsxt-clusters']
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password) as api:
+            inventory = asyncio.run(InventoryCollector(api).collect())
+
+        assert inventory['nsx_clusters'] == []
+        assert 'nsx_clusters' in inventory['errors']
+        assert len(inventory['hosts']) == 18
+
+
+class TestApplicationInventory:
+    """Test cases for inventory collection through VCFArchitecture."""
+
+    def test_collect_inventory(self, mock_sddc_config):
+        """Test the synchronous application entry point."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        inventory = app.collect_inventory()
+        app.close()
+        assert len(inventory['domains']) == 3
+
+    def test_parser_inventory(self):
+        """Test inventory argument."""
+        args = main.create_parser().parse_args(['--inventory'])
+        assert args.inventory is True
+
+    def test_main_inventory(self, mock_sddc_config, capsys):
+        """Test the --inventory command line mode."""
+        with patch('sys.argv', ['main.py', '--inventory']), \
+                patch.object(main.VCFArchitecture, '_load_config',
+                             return_value=mock_sddc_config):
+            assert main.main() == 0
+        assert '"domains"' in capsys.readouterr().out
@@ -0,0 +1,146 @@
+"""Test suite for the queued logging pipeline."""
+
+import json
+import logging
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vmware_vcf_architecture import log
+
+
+@pytest.fixture
+def isolated_root():
+    """Give the test a root logger without handlers and restore it afterwards."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers = []
+    yield root
+    log.shutdown_logging()
+    root.handlers = saved_handlers
+    root.setLevel(saved_level)
+
+
+def make_record(msg='hello %s', args=('world',), **extra):
+    """Build a log record with optional extra attributes."""
+    record = logging.LogRecord('vcf.test', logging.WARNING, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestJSONFormatter:
+    """Test cases for JSONFormatter."""
+
+    def test_fields(self):
+        """Test that the standard fields are emitted."""
+        entry = json.loads(log.JSONFormatter().format(make_record()))
+        assert entry['message'] == 'hello world'
+        assert entry['level'] == 'WARNING'
+        assert entry['logger'] == 'vcf.test'
+        assert entry['timestamp'].endswith('+00:00')
+        assert 'args' not in entry
+
+    def test_extra_fields(self):
+        """Test that attributes passed via extra are included."""
+        entry = json.loads(log.JSONFormatter().format(make_record(domain='wld01')))
+        assert entry['domain'] == 'wld01'
+
+    def test_exception(self):
+        """Test that tracebacks are kept in their own field."""
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError:
+            record = make_record()
+            record.exc_info = sys.exc_info()
+        entry = json.loads(log.JSONFormatter().format(record))
+        assert 'RuntimeError: boom' in entry['exception']
+        assert entry['message'] == 'hello world'
+
+
+class TestParseSize:
+    """Test cases for parse_size."""
+
+    @pytest.mark.parametrize('value, expected', [
+        ('10MB', 10 * 1024 ** 2), ('512K', 512 * 1024), ('1 GiB', 1024 ** 3),
+        ('100', 100), (2048, 2048),
+    ])
+    def test_sizes(self, value, expected):
+        """Test the supported size notations."""
+        assert log.parse_size(value) == expected
+
+    def test_invalid(self):
+        """Test that unparseable sizes are rejected."""
+        with pytest.raises(ValueError):
+            log.parse_size('ten megabytes')
+
+
+class TestPipeline:
+    """Test cases for setup_logging."""
+
+    def test_root_only_has_queue_handler(self, isolated_root, tmp_path):
+        """Test that callers only enqueue records."""
+        assert log.setup_logging({'file': str(tmp_path / 'app.log')}, force=True)
+        assert len(isolated_root.handlers) == 1
+        assert isinstance(isolated_root.handlers[0], logging.handlers.QueueHandler)
+
+    def test_json_lines_written_off_thread(self, isolated_root, tmp_path):
+        """Test that records from worker threads reach the file as JSON lines."""
+        path = tmp_path / 'app.log'
+        log.setup_logging({'format': 'json', 'file': str(path), 'level': 'DEBUG'}, force=True)
+        logger = logging.getLogger('vcf.worker')
+        threads = [
+            threading.Thread(target=logger.debug, args=('call %d', i)) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        try:
+            raise ValueError('bad')
+        except ValueError:
+            logger.exception('failed')
+        log.shutdown_logging()
+
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        assert sorted(e['message'] for e in entries[:-1]) == sorted(f'call {i}' for i in range(8))
+        assert entries[-1]['message'] == 'failed'
+        assert 'ValueError: bad' in entries[-1]['exception']
+
+    def test_size_based_rotation(self, isolated_root, tmp_path):
+        """Test that the log file rotates at max_size keeping backup_count files."""
+        path = tmp_path / 'app.log'
+        log.setup_logging({'file': str(path), 'max_size': 200, 'backup_count': 2}, force=True)
+        for i in range(50):
+            logging.getLogger('vcf.rotate').info('line %03d', i)
+        log.shutdown_logging()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['app.log', 'app.log.1', 'app.log.2']
+
+    def test_default_call_keeps_existing_handlers(self, isolated_root):
+        """Test that setup without settings leaves foreign handlers alone."""
+        handler = logging.NullHandler()
+        isolated_root.addHandler(handler)
+        assert log.setup_logging() is False
+        assert handler in isolated_root.handlers
+        assert not any(isinstance(h, logging.handlers.QueueHandler)
+                       for h in isolated_root.handlers)
+
+    def test_unknown_level_falls_back_to_info(self, isolated_root, tmp_path):
+        """Test that an invalid level is reported instead of raising."""
+        path = tmp_path / 'app.log'
+        assert log.setup_logging({'file': str(path), 'level': 'verbose'}, force=True)
+        assert isolated_root.level == logging.INFO
+        log.shutdown_logging()
+        assert "Unknown log level 'VERBOSE', using INFO" in path.read_text()
+
+    def test_reconfigure_replaces_pipeline(self, isolated_root, tmp_path):
+        """Test that settings rebuild a pipeline installed earlier."""
+        log.setup_logging({'file': str(tmp_path / 'a.log')}, force=True)
+        assert log.setup_logging() is False
+        assert log.setup_logging({'file': str(tmp_path / 'b.log'), 'level': 'WARNING'})
+        assert len(isolated_root.handlers) == 1
+        assert isolated_root.level == logging.WARNING
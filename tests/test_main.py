@@ -61,10 +61,9 @@ class TestVCFArchitecture:
         health = app.health_check()
         assert health['status'] == 'unhealthy'
     
-    @patch('main.yaml.safe_load')
-    @patch('builtins.open')
+    @patch('vmware_vcf_architecture.config.load_yaml')
     @patch('os.path.exists')
-    def test_load_config_from_file(self, mock_exists, mock_open, mock_yaml):
+    def test_load_config_from_file(self, mock_exists, mock_yaml):
         """Test loading configuration from file."""
         mock_exists.return_value = True
         mock_yaml.return_value = {'test': 'config'}
@@ -228,3 +227,4 @@ class TestIntegration:
 
 
 if __name__ == '__main__':
+    pytest.main([__file__])
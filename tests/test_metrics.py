@@ -0,0 +1,129 @@
+"""Test suite for the Prometheus metrics exporter."""
+
+import os
+import sys
+import threading
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.cache import ResponseCache
+from vmware_vcf_architecture.client import SDDCManagerClient
+from vmware_vcf_architecture.metrics import (
+    API_REQUEST_DURATION,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsServer,
+    Registry,
+    endpoint_template,
+)
+
+
+class TestMetricTypes:
+    """Test cases for counters, gauges and histograms."""
+
+    def test_counter_merges_thread_shards(self):
+        """Test that increments from many threads are all counted."""
+        counter = Counter('test_events_total', 'Events', ('kind',))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(1, 'a')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counter.value('a') == 8000
+
+    def test_dead_thread_shards_are_retired(self):
+        """Test that exited threads do not leak shards but keep their counts."""
+        counter = Counter('test_retired_total', 'Events')
+        for _ in range(20):
+            thread = threading.Thread(target=counter.inc)
+            thread.start()
+            thread.join()
+        counter.inc()
+        assert len(counter._shards) <= 2
+        assert counter.value() == 21
+
+    def test_gauge_function(self):
+        """Test scrape-time gauge callbacks."""
+        gauge = Gauge('test_depth', 'Depth', ('queue',))
+        gauge.set_function(lambda: 7, 'q')
+        gauge.inc(2, 'other')
+        assert 'test_depth{queue="q"} 7' in gauge.render()
+        assert gauge.value('other') == 2
+
+    def test_histogram_exposition(self):
+        """Test cumulative buckets, sum and count."""
+        histogram = Histogram('test_seconds', 'Latency', ('op',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, 'get')
+        text = histogram.render()
+        assert 'test_seconds_bucket{op="get",le="0.1"} 1' in text
+        assert 'test_seconds_bucket{op="get",le="1.0"} 2' in text
+        assert 'test_seconds_bucket{op="get",le="+Inf"} 3' in text
+        assert 'test_seconds_count{op="get"} 3' in text
+        assert histogram.count('get') == 3
+
+    def test_registry_reuses_names(self):
+        """Test that registering a name twice returns the first metric."""
+        registry = Registry()
+        first = registry.counter('test_once_total', 'Once')
+        assert registry.counter('test_once_total', 'Once') is first
+
+    def test_endpoint_template(self):
+        """Test that object IDs are collapsed in endpoint labels."""
+        assert endpoint_template('/v1/hosts') == '/v1/hosts'
+        assert endpoint_template('/v1/clusters/abc/datastores') == '/v1/clusters/{id}/datastores'
+        assert endpoint_template('/v1/tasks/123?x=1') == '/v1/tasks/{id}'
+
+
+class TestInstrumentation:
+    """Test cases for hot-path instrumentation."""
+
+    def test_api_calls_are_recorded(self, mock_sddc):
+        """Test that every outbound call lands in the latency histogram."""
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               cache=ResponseCache()) as api:
+            instance = api.instance
+            api.get('/v1/clusters/domain-1-cluster-0')
+            api.get('/v1/clusters/domain-1-cluster-0')
+            assert API_REQUEST_DURATION.count(
+                instance, '/v1/clusters/{id}', 'GET', '200') == 1
+            assert API_REQUEST_DURATION.count(instance, '/v1/tokens', 'POST', '200') == 1
+            text = REGISTRY.render()
+            assert f'vcf_cache_hit_ratio{{instance="{instance}"}} 0.5' in text
+            assert f'vcf_api_pool_saturation{{instance="{instance}"}} 0' in text
+
+    def test_health_check_is_timed(self, sample_config):
+        """Test that health checks record their duration."""
+        from vmware_vcf_architecture.metrics import HEALTH_CHECK_DURATION
+        before = HEALTH_CHECK_DURATION.count()
+        main.VCFArchitecture(config=sample_config).health_check()
+        assert HEALTH_CHECK_DURATION.count() == before + 1
+
+
+class TestMetricsServer:
+    """Test cases for the /metrics endpoint."""
+
+    def test_serves_registry(self):
+        """Test that /metrics renders the registry."""
+        registry = Registry()
+        registry.counter('test_served_total', 'Served').inc(3)
+        with MetricsServer(registry, host='127.0.0.1', port=0) as server:
+            host, port = server.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+                assert response.headers['Content-Type'].startswith('text/plain')
+        assert 'test_served_total 3' in body
+
+    def test_disabled_by_config(self, sample_config):
+        """Test that no server is created when metrics are disabled."""
+        sample_config['monitoring'] = {'enable_metrics': False}
+        assert main.VCFArchitecture(config=sample_config).create_metrics_server() is None
@@ -0,0 +1,114 @@
+"""Test suite for the compact inventory model."""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.model import Cluster, Domain, Host, InventoryModel, Segment
+
+
+def host_body(i, clusters=100):
+    """Build an SDDC Manager host element."""
+    cluster = i % clusters
+    return {
+        'id': f"host-{i:06d}", 'fqdn': f"esx{i:06d}.example.com", 'status': 'ASSIGNED',
+        'domain': {'id': f"domain-{cluster // 10}"}, 'cluster': {'id': f"cluster-{cluster}"},
+        'cpu': {'cores': 28}, 'memory': {'totalCapacityMB': 524288},
+        'tags': [{'name': 'gpu'}] if i % 50 == 0 else [],
+    }
+
+
+class TestEntities:
+    """Test cases for the entity classes."""
+
+    def test_host_from_api(self):
+        """Test that host fields are read from the API shape."""
+        host = Host.from_api(host_body(0))
+        assert (host.cluster_id, host.domain_id, host.cpu_cores) == ('cluster-0', 'domain-0', 28)
+        assert host.tags == ('gpu',)
+        assert not hasattr(host, '__dict__')
+        assert host.to_dict()['memory_mb'] == 524288
+
+    def test_segment_from_api(self):
+        """Test that NSX segments keep their VLAN and first subnet."""
+        segment = Segment.from_api({'id': 'seg-1', 'display_name': 'vm-net', 'vlan_ids': ['120'],
+                                    'subnets': [{'network': '10.0.120.0/24'}],
+                                    'domain': {'id': 'domain-1'}, 'tags': ['prod']})
+        assert (segment.name, segment.vlan_id, segment.subnet) == ('vm-net', 120,
+                                                                   '10.0.120.0/24')
+
+    def test_ids_are_interned(self):
+        """Test that references share the string object of the referenced ID."""
+        first, second = Host.from_api(host_body(0)), Host.from_api(host_body(100))
+        assert first.cluster_id is second.cluster_id
+
+
+class TestInventoryModel:
+    """Test cases for InventoryModel indexes."""
+
+    def test_indexes(self):
+        """Test lookups by ID, domain, cluster and tag."""
+        model = InventoryModel()
+        model.add(Domain('domain-0', 'mgmt01', 'MANAGEMENT'))
+        model.add(Cluster('cluster-0', 'mgmt01-cluster-0', 'domain-0'))
+        model.extend(Host.from_api(host_body(i)) for i in range(1000))
+
+        assert len(model.hosts_in_cluster('cluster-3')) == 10
+        assert len(model.hosts_in_domain('domain-0')) == 100
+        assert [c.id for c in model.clusters_in_domain('domain-0')] == ['cluster-0']
+        assert len(model.tagged('gpu', 'host')) == 20
+        assert model.get('host-000042').fqdn == 'esx000042.example.com'
+        assert model.hosts_in_cluster('missing') == []
+
+    def test_replace_and_remove(self):
+        """Test that re-adding an entity moves it between index entries."""
+        model = InventoryModel()
+        model.add(Host('h1', cluster_id='c1', tags=('old',)))
+        model.add(Host('h1', cluster_id='c2', tags=('new',)))
+        assert model.hosts_in_cluster('c1') == [] and len(model.hosts_in_cluster('c2')) == 1
+        assert model.tagged('old') == []
+        assert model.remove('h1', 'host').id == 'h1'
+        assert model.hosts_in_cluster('c2') == [] and len(model) == 0
+
+    def test_host_inherits_cluster_domain(self):
+        """Test that hosts without a domain reference use their cluster's domain."""
+        model = InventoryModel()
+        model.add(Cluster('c1', domain_id='domain-1'))
+        model.add(Host('h1', cluster_id='c1'))
+        assert model.hosts_in_domain('domain-1')[0].id == 'h1'
+
+    def test_smaller_than_dicts(self):
+        """Test that the model holds hosts in a fraction of the dictionaries' memory."""
+        def traced(build):
+            tracemalloc.start()
+            try:
+                value = build()
+                return tracemalloc.get_traced_memory()[0], value
+            finally:
+                tracemalloc.stop()
+
+        def build_model():
+            model = InventoryModel()
+            model.extend(Host.from_api(host_body(i)) for i in range(10000))
+            return model
+
+        dict_size, hosts = traced(lambda: [host_body(i) for i in range(10000)])
+        model_size, model = traced(build_model)
+        assert len(model.hosts) == len(hosts)
+        assert model_size * 2 < dict_size
+
+    def test_from_collected_inventory(self, mock_sddc_config):
+        """Test building the model from inventory collected from the mock SDDC Manager."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            model = app.inventory_model()
+        finally:
+            app.close()
+        assert model.counts() == {'domains': 3, 'clusters': 6, 'hosts': 18,
+                                  'datastores': 6, 'segments': 0}
+        assert len(model.hosts_in_cluster('domain-1-cluster-0')) == 3
+        assert [d.id for d in model.datastores_in_cluster('domain-2-cluster-1')] == [
+            'domain-2-cluster-1-vsan']
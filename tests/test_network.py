@@ -0,0 +1,140 @@
+"""Test suite for network plan validation."""
+
+import ipaddress
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.network import (
+    ADDRESS_CONFLICT,
+    CONTAINMENT,
+    DUPLICATE,
+    INVALID,
+    RESERVED_ADDRESS,
+    NetworkEntry,
+    check_plan,
+    find_conflicts,
+)
+
+TEMPLATE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'config', 'vcf-config.template.yml',
+)
+
+
+def domain(name, **networks):
+    """Build a workload domain with the given networks."""
+    return {'name': name, 'networks': networks}
+
+
+def kinds(conflicts):
+    """Return the sorted conflict kinds."""
+    return sorted(c.kind for c in conflicts)
+
+
+class TestFindConflicts:
+    """Test cases for the interval sweep."""
+
+    def test_template_is_clean(self):
+        """Test that the shipped template has no conflicts."""
+        with open(TEMPLATE) as f:
+            assert check_plan([('template', yaml.safe_load(f))]) == []
+
+    def test_duplicate_subnet_across_domains(self):
+        """Test that the same CIDR in two domains is reported."""
+        conflicts = check_plan([('plan', {'workload_domains': [
+            domain('wld01', vsan='10.0.1.0/24'),
+            domain('wld02', vmotion='10.0.1.0/24'),
+        ]})])
+        assert kinds(conflicts) == [DUPLICATE]
+        assert {conflicts[0].first, conflicts[0].second} == {'wld01.vsan', 'wld02.vmotion'}
+
+    def test_containment(self):
+        """Test that a subnet inside another is reported against its nearest parent."""
+        conflicts = check_plan([('plan', {'workload_domains': [
+            domain('wld01', management='10.0.0.0/16', tep='10.0.4.0/22'),
+            domain('wld02', vsan='10.0.5.0/24', vmotion='10.1.0.0/24'),
+        ]})])
+        assert kinds(conflicts) == [CONTAINMENT, CONTAINMENT]
+        assert (conflicts[1].first, conflicts[1].second) == ('wld01.tep', 'wld02.vsan')
+
+    def test_addresses(self):
+        """Test duplicate addresses and network/broadcast address use."""
+        conflicts = check_plan([('plan', {
+            'workload_domains': [domain('wld01', management='192.168.10.0/24')],
+            'sddc_manager': {'ip_address': '192.168.10.10'},
+            'vcenter': {'ip_address': '192.168.10.10'},
+            'nsx': {'ip_address': '192.168.10.255'},
+            'dns': {'ip_address': '192.168.20.1'},
+        })])
+        assert kinds(conflicts) == [ADDRESS_CONFLICT, RESERVED_ADDRESS]
+
+    def test_invalid_values(self):
+        """Test that malformed CIDRs and addresses are reported."""
+        conflicts = check_plan([('plan', {
+            'workload_domains': [domain('wld01', vsan='10.0.1.5/24', tep='not-a-network')],
+            'vcenter': {'ip_address': '300.1.1.1'},
+        })])
+        assert kinds(conflicts) == [INVALID, INVALID, INVALID]
+
+    def test_ipv6_and_ipv4_do_not_mix(self):
+        """Test that address families are checked separately."""
+        conflicts = check_plan([('plan', {'workload_domains': [
+            domain('wld01', management='::/96', vsan='0.0.0.0/8'),
+        ]})])
+        assert conflicts == []
+
+    def test_multiple_specs_prefix_owners(self):
+        """Test that plans spanning several files name the file in owners."""
+        conflicts = check_plan([
+            ('site-a', {'workload_domains': [domain('wld01', vsan='10.0.1.0/24')]}),
+            ('site-b', {'workload_domains': [domain('wld01', vsan='10.0.1.0/24')]}),
+        ])
+        assert {conflicts[0].first, conflicts[0].second} == {'site-a:wld01.vsan',
+                                                             'site-b:wld01.vsan'}
+
+    def test_scales_to_many_subnets(self):
+        """Test that a large disjoint plan is checked quickly."""
+        base = int(ipaddress.ip_address('10.0.0.0'))
+        entries = [
+            NetworkEntry(f"wld{i}", ipaddress.ip_network((base + i * 256, 24)))
+            for i in range(50000)
+        ]
+        entries.append(NetworkEntry('overlap', ipaddress.ip_network('10.0.100.0/24')))
+        start = time.perf_counter()
+        conflicts = find_conflicts(entries)
+        assert time.perf_counter() - start < 2
+        assert kinds(conflicts) == [DUPLICATE]
+
+
+class TestNetworkPlanCommand:
+    """Test cases for --network-plan and the network_plan validation check."""
+
+    def test_main_network_plan(self, sample_config, tmp_path, capsys):
+        """Test that conflicts are printed and fail the command."""
+        spec = tmp_path / 'plan.yml'
+        spec.write_text(yaml.safe_dump({'workload_domains': [
+            {'name': 'wld01', 'cluster': {'name': 'c', 'hosts': 4, 'cpu_cores': 8,
+                                          'memory_gb': 64},
+             'networks': {'vsan': '10.0.1.0/24', 'tep': '10.0.1.0/24'}},
+        ]}))
+        with patch('sys.argv', ['main.py', '--network-plan', str(spec)]), \
+                patch.object(main.VCFArchitecture, '_load_config', return_value=sample_config):
+            assert main.main() == 1
+        assert json.loads(capsys.readouterr().out)[0]['kind'] == DUPLICATE
+
+    def test_validation_check(self, mock_sddc_config):
+        """Test that configured spec files add a network_plan check."""
+        mock_sddc_config['validation'] = {'spec_files': [TEMPLATE]}
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        report = app.validate_deployment()
+        app.close()
+        statuses = {r['name']: r['status'] for r in report['results']}
+        assert statuses['network_plan'] == 'passed'
@@ -0,0 +1,172 @@
+"""Test suite for desired-state planning."""
+
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture import plan as vcf_plan
+from vmware_vcf_architecture.plan import StateTree
+
+
+def spec_for(domains=2, clusters=2, hosts=3):
+    """Build a spec describing the mock SDDC Manager estate."""
+    def domain(name, count=clusters):
+        return {'name': name, 'clusters': [
+            {'name': f"{name}-cluster-{c}", 'hosts': hosts} for c in range(count)
+        ]}
+    return {
+        'management_domain': domain('mgmt01'),
+        'workload_domains': [domain(f"wld{d:02d}") for d in range(1, domains + 1)],
+    }
+
+
+def inventory_for(spec):
+    """Build inventory matching a spec."""
+    domains, clusters = [], []
+    entries = [spec['management_domain']] + spec['workload_domains']
+    for i, domain in enumerate(entries):
+        domains.append({'id': f"domain-{i}", 'name': domain['name']})
+        for cluster in domain['clusters']:
+            clusters.append({
+                'id': cluster['name'], 'name': cluster['name'],
+                'domain': {'id': f"domain-{i}"},
+                'hosts': [{'id': f"h{h}"} for h in range(cluster['hosts'])],
+            })
+    return {'domains': domains, 'clusters': clusters}
+
+
+def actions(changes):
+    """Return (action, domain, cluster) tuples."""
+    return [(c.action, c.domain, c.cluster) for c in changes]
+
+
+class TestPlan:
+    """Test cases for plan()."""
+
+    def test_unchanged_estate(self):
+        """Test that a matching estate yields no changes from the root fingerprint."""
+        spec = spec_for()
+        desired = StateTree.from_spec(spec)
+        actual = StateTree.from_inventory(inventory_for(spec))
+        assert desired.fingerprint == actual.fingerprint
+        assert vcf_plan.plan(desired, actual) == []
+
+    def test_ordered_change_set(self):
+        """Test that changes are minimal and ordered create -> change -> destroy."""
+        live = spec_for()
+        spec = spec_for()
+        spec['workload_domains'][0]['clusters'][0]['hosts'] = 5
+        spec['workload_domains'][0]['clusters'][1]['hosts'] = 2
+        spec['workload_domains'][1]['clusters'].append({'name': 'wld02-cluster-9', 'hosts': 4})
+        spec['workload_domains'].append({'name': 'wld03', 'cluster': {'name': 'c', 'hosts': 4}})
+        live['workload_domains'].append({'name': 'legacy', 'clusters': []})
+        live['workload_domains'][1]['clusters'].append({'name': 'old', 'hosts': 3})
+
+        changes = vcf_plan.plan(StateTree.from_spec(spec),
+                                StateTree.from_inventory(inventory_for(live)),
+                                remove_domains=True)
+        assert actions(changes) == [
+            ('create_workload_domain', 'wld03', None),
+            ('add_cluster', 'wld02', 'wld02-cluster-9'),
+            ('expand_cluster', 'wld01', 'wld01-cluster-0'),
+            ('shrink_cluster', 'wld01', 'wld01-cluster-1'),
+            ('remove_cluster', 'wld02', 'old'),
+            ('remove_domain', 'legacy', None),
+        ]
+        assert changes[2].details == {'hosts': 2, 'from': 3, 'to': 5}
+        assert [c.destructive for c in changes] == [False, False, False, True, True, True]
+        assert vcf_plan.summarize(changes) == {'add': 2, 'change': 2, 'destroy': 2}
+
+    def test_unlisted_domains_are_kept(self):
+        """Test that domains missing from the spec are only removed on request."""
+        live = spec_for()
+        inventory = inventory_for(live)
+        inventory['domains'][0]['type'] = 'MANAGEMENT'
+        spec = {'workload_domains': live['workload_domains'][:1]}
+        actual = StateTree.from_inventory(inventory)
+        assert vcf_plan.plan(StateTree.from_spec(spec), actual) == []
+        changes = vcf_plan.plan(StateTree.from_spec(spec), actual, remove_domains=True)
+        assert actions(changes) == [('remove_domain', 'wld02', None)]
+
+    def test_management_domain_bring_up(self):
+        """Test that a missing management domain plans a bring-up first."""
+        spec = spec_for(domains=1)
+        changes = vcf_plan.plan(StateTree.from_spec(spec), StateTree.from_inventory({}))
+        assert actions(changes)[0] == ('deploy_management_domain', 'mgmt01', None)
+        assert changes[0].details == {'clusters': 2, 'hosts': 6}
+
+    def test_unchanged_domains_are_skipped(self):
+        """Test that only domains with differing fingerprints are walked."""
+        spec = spec_for(domains=50)
+        live = spec_for(domains=50)
+        live['workload_domains'][10]['clusters'][0]['hosts'] = 4
+        with patch.object(vcf_plan, '_plan_clusters', wraps=vcf_plan._plan_clusters) as walk:
+            changes = vcf_plan.plan(StateTree.from_spec(spec),
+                                    StateTree.from_inventory(inventory_for(live)))
+        assert walk.call_count == 1
+        assert actions(changes) == [('shrink_cluster', 'wld11', 'wld11-cluster-0')]
+
+    def test_spec_tree_is_cached(self):
+        """Test that re-planning the same spec document reuses its tree."""
+        spec = spec_for()
+        assert StateTree.from_spec(spec) is StateTree.from_spec(spec)
+
+    def test_large_estate_replans_quickly(self):
+        """Test that planning a large, unchanged estate is fast."""
+        spec = spec_for(domains=2000, clusters=4)
+        inventory = inventory_for(spec)
+        StateTree.from_spec(spec)
+        start = time.perf_counter()
+        assert vcf_plan.plan(StateTree.from_spec(spec), StateTree.from_inventory(inventory)) == []
+        assert time.perf_counter() - start < 1
+
+
+class TestPlanCommand:
+    """Test cases for --plan against the mock SDDC Manager."""
+
+    def test_main_plan(self, mock_sddc_config, tmp_path, capsys):
+        """Test planning a spec against live inventory."""
+        spec = spec_for()
+        for domain in [spec['management_domain']] + spec['workload_domains']:
+            for cluster in domain['clusters']:
+                cluster.update(cpu_cores=28, memory_gb=512)
+        spec['workload_domains'][1]['clusters'][1]['hosts'] = 6
+        path = tmp_path / 'spec.yml'
+        path.write_text(yaml.safe_dump(spec))
+
+        with patch('sys.argv', ['main.py', '--plan', str(path)]), \
+                patch.object(main.VCFArchitecture, '_load_config',
+                             return_value=mock_sddc_config):
+            assert main.main() == 0
+        result = json.loads(capsys.readouterr().out)
+        assert [c['action'] for c in result['changes']] == ['expand_cluster']
+        assert result['changes'][0]['cluster'] == 'wld02-cluster-1'
+        assert result['summary'] == {'add': 0, 'change': 1, 'destroy': 0}
+
+    def test_multi_cluster_spec_file(self, mock_sddc_config, tmp_path):
+        """Test that a spec file listing several clusters per domain plans cleanly."""
+        def domain(name):
+            return {'name': name, 'clusters': [
+                {'name': f"{name}-cluster-{c}", 'hosts': 3, 'cpu_cores': 28, 'memory_gb': 512}
+                for c in range(2)
+            ]}
+        spec = {'management_domain': domain('mgmt01'),
+                'workload_domains': [domain('wld01'), domain('wld02')]}
+        spec['workload_domains'][0]['clusters'][1]['hosts'] = 4
+        path = tmp_path / 'spec.yml'
+        path.write_text(yaml.safe_dump(spec))
+
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            result = app.plan(str(path))
+        finally:
+            app.close()
+        assert [(c['action'], c['cluster']) for c in result['changes']] == [
+            ('expand_cluster', 'wld01-cluster-1')]
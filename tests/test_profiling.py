@@ -0,0 +1,118 @@
+"""Test suite for profiling and phase timers."""
+
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture import profiling
+from vmware_vcf_architecture.profiling import PhaseTimer, in_context, record_call
+
+
+class TestPhaseTimer:
+    """Test cases for PhaseTimer."""
+
+    def test_phases_accumulate(self):
+        """Test that repeated phases add up and are reported in milliseconds."""
+        timer = PhaseTimer('test')
+        with timer.phase('sleep'):
+            time.sleep(0.01)
+        timer.add('sleep', 0.5)
+        timings = timer.to_dict()
+        assert 510 <= timings['phases']['sleep'] < 600
+        assert timings['total_ms'] >= 10
+        assert 'api_calls' not in timings
+
+    def test_calls_only_while_collecting(self):
+        """Test that API calls are aggregated only inside collecting()."""
+        timer = PhaseTimer('test')
+        record_call('GET /v1/hosts', 1.0)
+        with timer.collecting():
+            record_call('GET /v1/hosts', 0.002)
+            record_call('GET /v1/hosts', 0.004)
+        record_call('GET /v1/hosts', 1.0)
+        assert timer.to_dict()['api_calls'] == {
+            'GET /v1/hosts': {'count': 2, 'total_ms': 6.0, 'max_ms': 4.0},
+        }
+        assert profiling._collecting.get() == ()
+
+    def test_concurrent_timers_are_isolated(self):
+        """Test that each timer sees only its operation's calls, including its workers'."""
+        barrier = threading.Barrier(2)
+        timers = {}
+
+        def operation(name):
+            timer = timers[name] = PhaseTimer(name)
+            with timer.collecting(), ThreadPoolExecutor(max_workers=2) as pool:
+                barrier.wait()
+                record_call(f"GET /v1/{name}", 0.001)
+                list(pool.map(in_context(lambda _: record_call(f"GET /v1/{name}/x", 0.001)),
+                              range(3)))
+                pool.submit(record_call, 'GET /v1/untracked', 0.001).result()
+                barrier.wait()
+
+        threads = [threading.Thread(target=operation, args=(name,))
+                   for name in ('hosts', 'clusters')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name, timer in timers.items():
+            calls = timer.to_dict()['api_calls']
+            assert {call: stats['count'] for call, stats in calls.items()} == {
+                f"GET /v1/{name}": 1, f"GET /v1/{name}/x": 3}
+
+    def test_summary_is_logged(self, caplog):
+        """Test that the summary log record carries the timings."""
+        timer = PhaseTimer('test')
+        timer.add('step', 0.001)
+        with caplog.at_level(logging.INFO, logger='vmware_vcf_architecture.profiling'):
+            timings = timer.log_summary()
+        assert caplog.records[-1].timings == timings
+        assert 'step=1.0ms' in caplog.records[-1].getMessage()
+
+
+class TestInstrumentation:
+    """Test cases for timings reported by the application."""
+
+    def test_health_check_timings(self, sample_config):
+        """Test that the health check reports a timestamp and its sub-check timings."""
+        app = main.VCFArchitecture(config=sample_config)
+        health = app.health_check()
+        assert health['timestamp'].endswith('+00:00')
+        assert set(health['timings']['phases']) == {'config', 'dependencies'}
+
+    def test_health_check_includes_config_load(self, sample_config):
+        """Test that the configuration load time is reported once it happened."""
+        with patch('main.load_environment'), \
+                patch('vmware_vcf_architecture.config.load_config', return_value=sample_config):
+            app = main.VCFArchitecture()
+            health = app.health_check()
+        assert 'config_load' in health['timings']['phases']
+
+    def test_validation_timings(self, mock_sddc_config):
+        """Test that validation reports each check and the API calls it made."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            report = app.validate_deployment()
+        finally:
+            app.close()
+        timings = report['timings']
+        assert set(timings['phases']) == {r['name'] for r in report['results']}
+        assert timings['api_calls']['GET /v1/domains']['count'] >= 1
+
+    def test_profile_flag(self, sample_config, tmp_path):
+        """Test that --profile writes pstats data and a text summary."""
+        path = str(tmp_path / 'health.prof')
+        with patch('sys.argv', ['main.py', '--health-check', '--profile', path]), \
+                patch.object(main.VCFArchitecture, '_load_config', return_value=sample_config):
+            assert main.main() == 0
+        assert os.path.getsize(path) > 0
+        with open(f"{path}.txt") as f:
+            assert 'cumulative' in f.read()
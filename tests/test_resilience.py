@@ -0,0 +1,205 @@
+"""Test suite for per-target rate limiting and circuit breaking."""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.client import CircuitOpenError, SDDCManagerClient, VCFClientError
+from vmware_vcf_architecture.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    TargetGuards,
+    TokenBucket,
+)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_rate(self):
+        """Test that a full bucket allows a burst and then paces calls."""
+        bucket = TokenBucket(rate=50, burst=5)
+        start = time.monotonic()
+        for _ in range(15):
+            assert bucket.acquire()
+        # 5 from the burst, 10 more at 50/s
+        assert time.monotonic() - start >= 0.18
+
+    def test_timeout(self):
+        """Test that acquire gives up instead of waiting past the timeout."""
+        bucket = TokenBucket(rate=1, burst=1)
+        assert bucket.acquire(timeout=0)
+        assert not bucket.acquire(timeout=0.1)
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_at_threshold_and_half_opens(self):
+        """Test the closed -> open -> half-open -> closed cycle."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.failures == 0
+
+    def test_failed_trial_reopens(self):
+        """Test that a failing half-open trial opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.opened == 2
+
+    def test_success_resets_count(self):
+        """Test that only consecutive failures count."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+
+class TestTargetGuards:
+    """Test cases for TargetGuards."""
+
+    def test_from_config(self):
+        """Test per-target settings from the performance section."""
+        guards = TargetGuards.from_config({'performance': {
+            'rate_limit': 10, 'rate_limits': {'nsx01.example.com': 2},
+            'circuit_failure_threshold': 0,
+        }})
+        assert guards.get('sddc.example.com').limiter.rate == 10
+        assert guards.get('nsx01.example.com').limiter.rate == 2
+        assert guards.get('sddc.example.com').breaker is None
+        assert guards.get('nsx01.example.com') is guards.get('nsx01.example.com')
+
+    def test_disabled_by_default(self):
+        """Test that throttling is off unless a rate is configured."""
+        assert TargetGuards().get('sddc.example.com').limiter is None
+
+
+class TestClientGuards:
+    """Test cases for guarded SDDC Manager calls."""
+
+    def test_circuit_opens_on_outage(self, mock_sddc):
+        """Test that repeated server errors stop further calls from being sent."""
+        guards = TargetGuards(failure_threshold=3, reset_timeout=0.2)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               timeout=5, retry_attempts=0, guards=guards) as client:
+            client.get('/v1/domains')
+            mock_sddc.fail_status = 500
+            for _ in range(3):
+                with pytest.raises(VCFClientError):
+                    client.get('/v1/hosts', use_cache=False)
+            sent = mock_sddc.request_count('/v1/hosts')
+            for _ in range(10):
+                with pytest.raises(CircuitOpenError):
+                    client.get('/v1/hosts', use_cache=False)
+            assert mock_sddc.request_count('/v1/hosts') == sent
+            assert guards.state()[client.instance]['rejected'] == 10
+
+            mock_sddc.fail_status = None
+            time.sleep(0.25)
+            assert client.get('/v1/hosts', use_cache=False)
+            assert guards.get(client.instance).breaker.state == CLOSED
+
+    def test_retries_pass_the_guards(self, mock_sddc):
+        """Test that every retry takes a token and counts as a breaker failure."""
+        guards = TargetGuards(rate_limit=0.001, burst=100, failure_threshold=10)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               timeout=5, retry_attempts=3, backoff_factor=0,
+                               guards=guards) as client:
+            client.authenticate()
+            guard = guards.get(client.instance)
+            tokens = guard.limiter.tokens
+            mock_sddc.fail_status = 503
+            with pytest.raises(VCFClientError):
+                client.get('/v1/hosts', use_cache=False)
+            assert mock_sddc.request_count('/v1/hosts') == 4
+            assert round(tokens - guard.limiter.tokens) == 4
+            assert guard.breaker.failures == 4
+
+    def test_open_circuit_stops_retries(self, mock_sddc):
+        """Test that retries end once the circuit opens."""
+        guards = TargetGuards(failure_threshold=2)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               timeout=5, retry_attempts=5, backoff_factor=0,
+                               guards=guards) as client:
+            client.authenticate()
+            mock_sddc.fail_status = 503
+            with pytest.raises(CircuitOpenError):
+                client.get('/v1/hosts', use_cache=False)
+            assert mock_sddc.request_count('/v1/hosts') == 2
+
+    def test_throttled_trial_is_released(self, mock_sddc):
+        """Test that a half-open trial rejected by the rate limiter can be retried."""
+        guards = TargetGuards(rate_limit=20, burst=1, failure_threshold=1, reset_timeout=0.05)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               timeout=5, retry_attempts=0, guards=guards) as client:
+            client.authenticate()
+            mock_sddc.fail_status = 500
+            with pytest.raises(VCFClientError):
+                client.get('/v1/hosts', use_cache=False)
+            guard = guards.get(client.instance)
+            time.sleep(0.06)
+            guard.limiter.acquire()
+            with pytest.raises(VCFClientError) as excinfo:
+                client.get('/v1/hosts', use_cache=False, timeout=0.001)
+            assert excinfo.value.status_code == 429
+            assert guard.breaker.state == HALF_OPEN
+            assert guard.breaker.allow()
+
+    def test_rate_limit_paces_workers(self, mock_sddc):
+        """Test that concurrent callers share the target's request rate."""
+        guards = TargetGuards(rate_limit=100, burst=1)
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                               timeout=5, pool_size=8, guards=guards) as client:
+            client.authenticate()
+            start = time.monotonic()
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda _: client.get('/v1/domains', use_cache=False),
+                              range(30)))
+            assert time.monotonic() - start >= 0.25
+            assert guards.state()[client.instance]['throttled'] > 0
+
+    def test_health_check_reports_targets(self, mock_sddc, mock_sddc_config):
+        """Test that health_check reports target state and open circuits."""
+        mock_sddc_config['vcf']['retry_attempts'] = 0
+        mock_sddc_config['performance'].update({'circuit_failure_threshold': 1})
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        try:
+            app.client.get('/v1/domains')
+            health = app.health_check()
+            assert health['status'] == 'healthy'
+            assert health['targets'][app.client.instance]['circuit'] == CLOSED
+
+            mock_sddc.fail_status = 500
+            with pytest.raises(VCFClientError):
+                app.client.get('/v1/hosts')
+            health = app.health_check()
+            assert health['status'] == 'unhealthy'
+            assert health['checks']['circuits'] is False
+            assert health['targets'][app.client.instance]['circuit'] == OPEN
+        finally:
+            app.close()
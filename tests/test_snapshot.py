@@ -0,0 +1,181 @@
+"""Test suite for incremental inventory sync."""
+
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.client import SDDCManagerClient, VCFClientError
+from vmware_vcf_architecture.snapshot import DeltaSync, InventorySnapshot, object_stamp
+
+
+def _sync(mock_sddc, snapshot):
+    with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password) as api:
+        return DeltaSync(api, snapshot).sync()
+
+
+class TestInventorySnapshot:
+    """Test cases for InventorySnapshot."""
+
+    def test_apply_and_load(self):
+        """Test storing and loading objects."""
+        snapshot = InventorySnapshot()
+        snapshot.apply('hosts', [{'id': 'h1'}, {'id': 'h2'}], [])
+        snapshot.apply('hosts', [], ['h1'])
+        assert snapshot.load()['hosts'] == [{'id': 'h2'}]
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that the snapshot survives reopening."""
+        path = str(tmp_path / 'inventory.db')
+        snapshot = InventorySnapshot(path)
+        snapshot.apply('domains', [{'id': 'd1'}], [])
+        snapshot.set_state('last_sync', 'now')
+        snapshot.close()
+
+        reopened = InventorySnapshot(path)
+        assert reopened.objects('domains') == [{'id': 'd1'}]
+        assert reopened.get_state('last_sync') == 'now'
+
+    def test_object_stamp_prefers_modified_time(self):
+        """Test that reported modification time is used as the stamp."""
+        modified, digest = object_stamp({'id': 'x', 'modifiedTime': '2024-01-01T00:00:00Z'})
+        assert modified == '2024-01-01T00:00:00Z'
+        assert digest
+
+
+class TestDeltaSync:
+    """Test cases for DeltaSync."""
+
+    def test_initial_sync_adds_everything(self, mock_sddc):
+        """Test that the first sync loads the full estate."""
+        snapshot = InventorySnapshot()
+        result = _sync(mock_sddc, snapshot)
+        assert result.to_dict()['added'] == {
+            'domains': 3, 'clusters': 6, 'hosts': 18, 'vcenters': 3,
+            'nsx_clusters': 3, 'vsan_datastores': 6,
+        }
+        assert len(snapshot.load()['hosts']) == 18
+
+    def test_unchanged_estate_costs_no_bodies(self, mock_sddc):
+        """Test that a steady-state sync only revalidates collections."""
+        snapshot = InventorySnapshot()
+        _sync(mock_sddc, snapshot)
+        before = mock_sddc.not_modified
+        result = _sync(mock_sddc, snapshot)
+
+        assert not result.changed
+        assert len(result.unchanged_sections) == 5
+        assert mock_sddc.not_modified - before == 5
+        assert mock_sddc.request_count('/v1/clusters/') == 6
+
+    def test_changes_are_applied_as_deltas(self, mock_sddc):
+        """Test that only changed objects are reported and stored."""
+        snapshot = InventorySnapshot()
+        _sync(mock_sddc, snapshot)
+
+        mock_sddc.resources['hosts']['domain-1-cluster-0-host-0']['status'] = 'UNASSIGNED'
+        del mock_sddc.resources['hosts']['domain-2-cluster-1-host-2']
+        result = _sync(mock_sddc, snapshot)
+
+        assert result.updated['hosts'] == ['domain-1-cluster-0-host-0']
+        assert result.removed['hosts'] == ['domain-2-cluster-1-host-2']
+        assert 'hosts' not in result.unchanged_sections
+        assert 'clusters' in result.unchanged_sections
+        hosts = {h['id']: h for h in snapshot.load()['hosts']}
+        assert hosts['domain-1-cluster-0-host-0']['status'] == 'UNASSIGNED'
+        assert len(hosts) == 17
+
+
+    def test_failed_datastore_read_is_retried(self, mock_sddc):
+        """Test that a cluster is stored only together with its datastores."""
+        snapshot = InventorySnapshot()
+        _sync(mock_sddc, snapshot)
+        cluster = 'domain-1-cluster-0'
+        mock_sddc.resources['clusters'][cluster]['name'] = 'renamed'
+        mock_sddc.resources['datastores'][f"{cluster}-vsan"]['compression'] = False
+
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password) as api:
+            get = api.get
+
+            def flaky_get(path, **kwargs):
+                if path == f"/v1/clusters/{cluster}/datastores":
+                    raise VCFClientError('connection reset')
+                return get(path, **kwargs)
+
+            with patch.object(api, 'get', side_effect=flaky_get):
+                result = DeltaSync(api, snapshot).sync()
+        assert f"vsan:{cluster}" in result.errors
+        assert result.updated['clusters'] == []
+        clusters = {c['id']: c for c in snapshot.load()['clusters']}
+        assert clusters[cluster]['name'] != 'renamed'
+
+        result = _sync(mock_sddc, snapshot)
+        assert result.updated['clusters'] == [cluster]
+        assert result.updated['vsan_datastores'] == [f"{cluster}-vsan"]
+        stored = {d['id']: d for d in snapshot.load()['vsan_datastores']}
+        assert stored[f"{cluster}-vsan"]['compression'] is False
+
+    def test_datastore_removed_from_cluster_is_pruned(self, mock_sddc):
+        """Test that a refetched cluster's missing datastores are deleted."""
+        snapshot = InventorySnapshot()
+        _sync(mock_sddc, snapshot)
+        cluster = 'domain-0-cluster-1'
+        mock_sddc.resources['clusters'][cluster]['name'] = 'renamed'
+        del mock_sddc.resources['datastores'][f"{cluster}-vsan"]
+
+        result = _sync(mock_sddc, snapshot)
+        assert result.removed['vsan_datastores'] == [f"{cluster}-vsan"]
+        assert len(snapshot.load()['vsan_datastores']) == 5
+
+    def test_paged_collection_revalidates_per_page(self, mock_sddc):
+        """Test that an unchanged paged collection costs one 304 per page."""
+        snapshot = InventorySnapshot()
+        with SDDCManagerClient(mock_sddc.url, mock_sddc.username, mock_sddc.password) as api:
+            sync = DeltaSync(api, snapshot, page_size=5)
+            sync.sync()
+            requests = mock_sddc.request_count('/v1/hosts')
+            assert requests == 4
+
+            before = mock_sddc.not_modified
+            result = sync.sync()
+            assert 'hosts' in result.unchanged_sections
+            assert mock_sddc.request_count('/v1/hosts') == requests + 4
+            # 4 host pages, 2 cluster pages and one page each for the rest
+            assert mock_sddc.not_modified - before == 9
+
+            mock_sddc.resources['hosts']['domain-1-cluster-1-host-2']['status'] = 'UNASSIGNED'
+            result = sync.sync()
+            assert result.updated['hosts'] == ['domain-1-cluster-1-host-2']
+            assert result.removed['hosts'] == []
+            assert len(snapshot.load()['hosts']) == 18
+
+            del mock_sddc.resources['hosts']['domain-0-cluster-0-host-0']
+            result = sync.sync()
+            assert result.removed['hosts'] == ['domain-0-cluster-0-host-0']
+            assert result.updated['hosts'] == []
+            assert len(snapshot.load()['hosts']) == 17
+            assert 'hosts' in sync.sync().unchanged_sections
+
+class TestApplicationSync:
+    """Test cases for inventory sync through VCFArchitecture."""
+
+    def test_sync_inventory(self, mock_sddc_config, tmp_path):
+        """Test the application entry point with a file snapshot."""
+        mock_sddc_config['inventory'] = {'snapshot_file': str(tmp_path / 'snap.db')}
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        first = app.sync_inventory()
+        second = app.sync_inventory()
+        app.close()
+        assert first.changed
+        assert not second.changed
+
+    def test_main_sync(self, mock_sddc_config, tmp_path, capsys):
+        """Test the --sync command line mode."""
+        mock_sddc_config['inventory'] = {'snapshot_file': str(tmp_path / 'snap.db')}
+        with patch('sys.argv', ['main.py', '--sync']), \
+                patch.object(main.VCFArchitecture, '_load_config',
+                             return_value=mock_sddc_config):
+            assert main.main() == 0
+        assert '"added"' in capsys.readouterr().out
@@ -0,0 +1,75 @@
+"""Import-time and startup regression tests for the command line entry point."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported when a command actually needs them
+HEAVY_MODULES = ['yaml', 'requests', 'urllib3', 'dotenv', 'asyncio', 'sqlite3',
+                 'http.server', 'vmware_vcf_architecture.client']
+
+# Cumulative import time budget for ``import main`` in microseconds
+IMPORT_BUDGET_US = 50000
+
+
+def _run_python(code, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    return subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+
+class TestStartup:
+    """Test cases for lazy imports and deferred side effects."""
+
+    def test_import_skips_heavy_modules(self, tmp_path):
+        """Test that importing main loads none of the heavy dependencies."""
+        code = ("import json, sys, main; "
+                f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+        result = _run_python(code, tmp_path)
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout) == []
+
+    def test_import_has_no_side_effects(self, tmp_path):
+        """Test that importing main neither configures logging nor opens files."""
+        code = "import logging, main; print(len(logging.getLogger().handlers))"
+        result = _run_python(code, tmp_path)
+        assert result.stdout.strip() == '0'
+        assert not (tmp_path / 'vmware-vcf-architecture.log').exists()
+
+    def test_version_skips_config_and_dependencies(self, tmp_path):
+        """Test that --version exits before loading config or dependencies."""
+        code = (
+            "import json, sys, main\n"
+            "sys.argv = ['main.py', '--version']\n"
+            "try:\n"
+            "    main.main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+        )
+        result = _run_python(code, tmp_path)
+        assert json.loads(result.stdout.splitlines()[-1]) == []
+        assert not (tmp_path / 'vmware-vcf-architecture.log').exists()
+
+    def test_module_yaml_attribute_is_lazy(self):
+        """Test that main.yaml still resolves for callers and patches."""
+        import main
+        assert main.yaml.safe_load('a: 1') == {'a': 1}
+
+    @pytest.mark.slow
+    def test_import_time_budget(self, tmp_path):
+        """Benchmark: cumulative import time of main stays within budget."""
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+        samples = []
+        for _ in range(3):
+            result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                                    cwd=tmp_path, env=env, capture_output=True, text=True,
+                                    timeout=60)
+            line = [l for l in result.stderr.splitlines() if l.rstrip().endswith('| main')][-1]
+            samples.append(int(line.split('|')[1]))
+        assert min(samples) < IMPORT_BUDGET_US, f"import main took {min(samples)}us"
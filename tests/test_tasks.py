@@ -0,0 +1,107 @@
+"""Test suite for multiplexed task tracking."""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.client import VCFClientError
+from vmware_vcf_architecture.tasks import TaskFailedError, TaskTracker
+
+
+@pytest.fixture
+def app(mock_sddc_config):
+    """Provide an application bound to the mock SDDC Manager."""
+    mock_sddc_config['performance'].update({'task_poll_interval': 0.05,
+                                            'task_poll_max_interval': 0.2})
+    instance = main.VCFArchitecture(config=mock_sddc_config)
+    yield instance
+    instance.close()
+
+
+class TestTaskTracker:
+    """Test cases for TaskTracker."""
+
+    def test_from_config(self, app):
+        """Test that poll intervals come from the performance section."""
+        assert (app.tasks.min_interval, app.tasks.max_interval) == (0.05, 0.2)
+
+    def test_many_tasks_few_requests(self, app, mock_sddc):
+        """Test that hundreds of tasks are polled with a handful of requests."""
+        tasks = [mock_sddc.add_task(f"deploy-{i}", duration=0.3) for i in range(200)]
+        futures = [app.track_task(task['id']) for task in tasks]
+
+        assert app.tasks.wait(futures, timeout=10)
+        assert all(f.result()['status'] == 'SUCCESSFUL' for f in futures)
+        assert app.tasks.outstanding == 0
+        assert not any(app.tasks.status(task['id']) for task in tasks)
+        # Bulk listings only: no per-task reads
+        assert mock_sddc.request_count('/v1/tasks/') == 0
+        assert mock_sddc.request_count('/v1/tasks') < 40
+
+    def test_failed_task(self, app, mock_sddc):
+        """Test that a failed task raises through its future."""
+        task = mock_sddc.add_task('deploy', duration=0.1, result='FAILED')
+        with pytest.raises(TaskFailedError) as exc_info:
+            app.track_task(task['id']).result(timeout=5)
+        assert exc_info.value.task['status'] == 'FAILED'
+
+    def test_callback_and_dedup(self, app, mock_sddc):
+        """Test that callbacks run on completion and repeat tracking shares a future."""
+        task = mock_sddc.add_task('deploy', duration=0.1)
+        done = threading.Event()
+        first = app.track_task(task['id'], lambda future: done.set())
+        assert app.track_task(task['id']) is first
+        assert app.tasks.outstanding == 1
+        assert done.wait(5)
+        assert first.result()['status'] == 'SUCCESSFUL'
+        assert app.tasks.status(task['id']) is None
+
+    def test_status_of_running_task(self, app, mock_sddc):
+        """Test that a running task's last body is kept until it finishes."""
+        task = mock_sddc.add_task('deploy', duration=60)
+        app.track_task(task['id'])
+        deadline = time.monotonic() + 5
+        while app.tasks.status(task['id']) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert app.tasks.status(task['id'])['status'] == 'IN_PROGRESS'
+
+    def test_unknown_task_fails(self, app, mock_sddc):
+        """Test that a task SDDC Manager does not know fails instead of polling forever."""
+        future = app.track_task('task-missing')
+        with pytest.raises(VCFClientError) as exc_info:
+            future.result(timeout=5)
+        assert exc_info.value.status_code == 404
+        assert app.tasks.outstanding == 0
+        assert app.tasks.status('task-missing') is None
+
+    def test_falls_back_to_individual_polling(self, app, mock_sddc):
+        """Test that an unsupported bulk query falls back to per-task reads."""
+        tasks = [mock_sddc.add_task(f"deploy-{i}", duration=0.1) for i in range(3)]
+        with patch.object(app.client, 'iter_elements',
+                          side_effect=VCFClientError('HTTP 404', status_code=404)) as bulk:
+            futures = [app.track_task(task['id']) for task in tasks]
+            assert app.tasks.wait(futures, timeout=5)
+        assert bulk.call_count == 1
+        assert mock_sddc.request_count('/v1/tasks/') >= 3
+
+    def test_interval_backs_off_while_idle(self, mock_sddc_config, mock_sddc):
+        """Test that the interval grows while nothing finishes and resets on track."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        tracker = TaskTracker(app.client, min_interval=0.01, max_interval=0.05, backoff=2)
+        try:
+            tracker.track(mock_sddc.add_task('deploy', duration=60)['id'])
+            time.sleep(0.3)
+            assert tracker.interval == tracker.max_interval
+            assert tracker.outstanding == 1
+            tracker.track(mock_sddc.add_task('other', duration=60)['id'])
+            assert tracker.interval < tracker.max_interval
+        finally:
+            tracker.stop()
+            app.close()
@@ -0,0 +1,133 @@
+"""Test suite for the on-disk token cache."""
+
+import json
+import logging
+import os
+import stat
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vmware_vcf_architecture.client import SDDCManagerClient
+from vmware_vcf_architecture.config import load_config
+from vmware_vcf_architecture.tokens import TokenCache
+
+
+@pytest.fixture
+def cached_config(mock_sddc_config, tmp_path):
+    """Provide a mock SDDC Manager configuration with an encrypted token cache."""
+    pytest.importorskip('cryptography')
+    mock_sddc_config['security'] = {'enable_encryption': True, 'token_expiry': 3600,
+                                    'token_cache_file': str(tmp_path / 'cache' / 'tokens.json')}
+    return mock_sddc_config
+
+
+def fetch_domains(config):
+    """Query the mock SDDC Manager with a fresh client, as a new process would."""
+    client = SDDCManagerClient.from_config(config)
+    try:
+        client.get('/v1/domains', use_cache=False)
+        return client
+    finally:
+        client.close()
+
+
+class TestTokenCache:
+    """Test cases for TokenCache storage."""
+
+    def test_from_config(self, tmp_path):
+        """Test that the cache is only built when a file is configured."""
+        assert TokenCache.from_config({}) is None
+        cache = TokenCache.from_config({'security': {
+            'enable_encryption': False, 'token_cache_file': str(tmp_path / 'tokens.json')}})
+        assert cache.path == str(tmp_path / 'tokens.json')
+        assert cache.encrypt is False
+
+    def test_plaintext_round_trip(self, tmp_path):
+        """Test storage without encryption and the file permissions."""
+        cache = TokenCache(str(tmp_path / 'tokens.json'), encrypt=False)
+        cache.store('https://sddc', 'admin', 'secret', 'access', 'refresh', 60)
+        access, refresh, remaining = cache.load('https://sddc', 'admin', 'secret')
+        assert (access, refresh) == ('access', 'refresh')
+        assert 55 < remaining <= 60
+        assert cache.load('https://sddc', 'other', 'secret') is None
+        assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+
+    def test_expired_access_keeps_refresh(self, tmp_path):
+        """Test that an expired entry still offers its refresh token."""
+        cache = TokenCache(str(tmp_path / 'tokens.json'), encrypt=False)
+        cache.store('https://sddc', 'admin', 'secret', 'access', 'refresh', -10)
+        assert cache.load('https://sddc', 'admin', 'secret') == (None, 'refresh', 0.0)
+        cache.discard('https://sddc', 'admin')
+        assert cache.load('https://sddc', 'admin', 'secret') is None
+
+    def test_encrypted_entries(self, tmp_path):
+        """Test that tokens are unreadable without the account password."""
+        pytest.importorskip('cryptography')
+        cache = TokenCache(str(tmp_path / 'tokens.json'))
+        cache.store('https://sddc', 'admin', 'secret', 'access-token', 'refresh-token', 60)
+        with open(cache.path) as f:
+            content = f.read()
+        assert 'access-token' not in content and 'admin' not in content
+        assert cache.load('https://sddc', 'admin', 'secret')[0] == 'access-token'
+        assert cache.load('https://sddc', 'admin', 'changed') is None
+
+    def test_damaged_file(self, tmp_path):
+        """Test that a damaged file is ignored and replaced on the next write."""
+        cache = TokenCache(str(tmp_path / 'tokens.json'), encrypt=False)
+        with open(cache.path, 'w') as f:
+            f.write('{not json')
+        assert cache.load('https://sddc', 'admin', 'secret') is None
+        cache.store('https://sddc', 'admin', 'secret', 'access', 'refresh', 60)
+        with open(cache.path) as f:
+            assert len(json.load(f)) == 1
+
+
+class TestClientTokenCache:
+    """Test cases for clients sharing tokens through the cache."""
+
+    def test_second_process_skips_login(self, cached_config, mock_sddc):
+        """Test that a new client reuses the token of a previous one."""
+        first = fetch_domains(cached_config)
+        second = fetch_domains(cached_config)
+        assert mock_sddc.logins == 1
+        assert second._access_token == first._access_token
+
+    def test_expired_token_is_refreshed(self, cached_config, mock_sddc):
+        """Test that an expired cached token is renewed with the cached refresh token."""
+        first = fetch_domains(cached_config)
+        cache = TokenCache.from_config(cached_config)
+        cache.store(mock_sddc.url, mock_sddc.username, mock_sddc.password,
+                    first._access_token, first._refresh_token, -1)
+        second = fetch_domains(cached_config)
+        assert second._refresh_token == first._refresh_token
+        assert second._access_token != first._access_token
+        assert cache.load(mock_sddc.url, mock_sddc.username,
+                          mock_sddc.password)[0] == second._access_token
+
+    def test_rejected_token_is_replaced(self, cached_config, mock_sddc):
+        """Test that a cached token the server no longer accepts triggers a login."""
+        fetch_domains(cached_config)
+        mock_sddc.revoke_tokens()
+        fetch_domains(cached_config)
+        third = fetch_domains(cached_config)
+        assert mock_sddc.logins == 2
+        assert third._access_token in mock_sddc.tokens
+
+    def test_logins_are_reported_per_run(self, cached_config, mock_sddc, caplog):
+        """Test that closing a client logs the logins it made."""
+        with caplog.at_level(logging.INFO, logger='vmware_vcf_architecture.client'):
+            fetch_domains(cached_config)
+            fetch_domains(cached_config)
+        reports = [r.getMessage() for r in caplog.records if 'password logins' in r.getMessage()]
+        assert reports == [f"SDDC Manager {mock_sddc.url}: 1 password logins, "
+                           f"0 token refreshes"]
+
+    def test_cache_enabled_in_shipped_config(self):
+        """Test that the repository config.yml turns the token cache on."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config = load_config(os.path.join(root, 'config.yml'), environ={})
+        assert config['security']['token_cache_file']
+        assert config['security']['enable_encryption'] is True
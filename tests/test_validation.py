@@ -0,0 +1,203 @@
+"""Test suite for the deployment validation engine."""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from vmware_vcf_architecture.validation import (
+    FAILED,
+    PASSED,
+    SKIPPED,
+    TIMEOUT,
+    ValidationEngine,
+)
+
+
+def _ok(message='ok'):
+    return lambda: (True, message)
+
+
+class TestValidationEngine:
+    """Test cases for ValidationEngine."""
+
+    def test_dependencies_run_first(self):
+        """Test that checks start only after their dependencies pass."""
+        order = []
+        lock = threading.Lock()
+
+        def record(name):
+            def check():
+                with lock:
+                    order.append(name)
+                return True, name
+            return check
+
+        engine = ValidationEngine(max_workers=4)
+        engine.add('c', record('c'), depends_on=['b'])
+        engine.add('b', record('b'), depends_on=['a'])
+        engine.add('a', record('a'))
+        results = list(engine.run())
+        assert order == ['a', 'b', 'c']
+        assert all(r.status == PASSED for r in results)
+
+    def test_failed_dependency_skips_dependents(self):
+        """Test that dependents of a failed check are skipped."""
+        engine = ValidationEngine()
+        engine.add('root', lambda: (False, 'down'))
+        engine.add('child', _ok(), depends_on=['root'])
+        engine.add('grandchild', _ok(), depends_on=['child'])
+        engine.add('independent', _ok())
+        statuses = {r.name: r.status for r in engine.run()}
+        assert statuses == {
+            'root': FAILED, 'child': SKIPPED, 'grandchild': SKIPPED, 'independent': PASSED,
+        }
+
+    def test_hung_check_times_out_without_blocking(self):
+        """Test that a hung check is abandoned and others still complete."""
+        release = threading.Event()
+        engine = ValidationEngine(max_workers=2)
+        engine.add('hung', lambda: (release.wait(5), 'late'), timeout=0.2)
+        for i in range(6):
+            engine.add(f"fast{i}", _ok(), timeout=1)
+
+        start = time.monotonic()
+        results = {r.name: r for r in engine.run()}
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert results['hung'].status == TIMEOUT
+        assert all(results[f"fast{i}"].passed for i in range(6))
+        assert elapsed < 1
+
+    def test_results_stream_in_completion_order(self):
+        """Test that fast checks are reported before slow ones."""
+        engine = ValidationEngine(max_workers=2)
+        engine.add('slow', lambda: (time.sleep(0.2) or True, 'slow'))
+        engine.add('fast', _ok())
+        assert [r.name for r in engine.run()] == ['fast', 'slow']
+
+    def test_exception_is_reported(self):
+        """Test that exceptions become error results."""
+        engine = ValidationEngine()
+        engine.add('broken', lambda: 1 / 0)
+        result = next(engine.run())
+        assert result.status == 'error'
+        assert 'ZeroDivisionError' in result.message
+
+    def test_discovery_adds_checks(self):
+        """Test that checks registered by a running check are run after it."""
+        engine = ValidationEngine()
+
+        def discover():
+            for i in range(3):
+                engine.add(f"item{i}", _ok(), depends_on=['discover'])
+            return True, 'found 3'
+
+        engine.add('discover', discover)
+        results = [r.name for r in engine.run()]
+        assert results[0] == 'discover'
+        assert sorted(results[1:]) == ['item0', 'item1', 'item2']
+
+    def test_discovered_checks_run_despite_abandoned_threads(self):
+        """Test that hung discovered checks do not starve later ones of threads."""
+        release = threading.Event()
+        engine = ValidationEngine(max_workers=1)
+
+        def discover():
+            for i in range(3):
+                engine.add(f"hung{i}", lambda: (release.wait(5), 'late'), timeout=0.1)
+            engine.add('fast', _ok(), timeout=1)
+            return True, 'found 4'
+
+        engine.add('discover', discover)
+        results = {r.name: r for r in engine.run()}
+        release.set()
+
+        assert [results[f"hung{i}"].status for i in range(3)] == [TIMEOUT] * 3
+        assert results['fast'].passed
+
+    def test_cycle_rejected(self):
+        """Test that dependency cycles are rejected."""
+        engine = ValidationEngine()
+        engine.add('a', _ok(), depends_on=['b'])
+        engine.add('b', _ok(), depends_on=['a'])
+        with pytest.raises(ValueError):
+            list(engine.run())
+
+    def test_unknown_dependency_rejected(self):
+        """Test that unknown dependencies are rejected."""
+        engine = ValidationEngine()
+        engine.add('a', _ok(), depends_on=['missing'])
+        with pytest.raises(ValueError):
+            list(engine.run())
+
+
+class TestDeploymentValidation:
+    """Test cases for VCFArchitecture.validate_deployment."""
+
+    def test_healthy_deployment_passes(self, mock_sddc_config):
+        """Test validation against a healthy mock deployment."""
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        streamed = []
+        report = app.validate_deployment(on_result=streamed.append)
+        app.close()
+
+        assert report['status'] == 'passed', report
+        names = {r['name'] for r in report['results']}
+        assert {'network', 'certificates', 'sddc_manager', 'vcenter', 'nsx', 'vsan',
+                'domain:mgmt01', 'domain:wld01', 'domain:wld02'} <= names
+        assert len(streamed) == len(report['results'])
+
+    def test_unhealthy_domain_fails(self, mock_sddc, mock_sddc_config):
+        """Test that a failed domain is reported without affecting others."""
+        mock_sddc.resources['domains']['domain-2']['status'] = 'ERROR'
+        mock_sddc.resources['nsxt-clusters']['domain-1-nsx']['nodes'].pop()
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        report = app.validate_deployment()
+        app.close()
+
+        statuses = {r['name']: r['status'] for r in report['results']}
+        assert report['status'] == 'failed'
+        assert statuses['nsx'] == FAILED
+        assert statuses['domain:wld02'] == SKIPPED
+        assert statuses['vsan'] == PASSED
+
+    def test_hung_domain_listing_is_bounded(self, mock_sddc_config):
+        """Test that a hung domain listing times out as a check instead of blocking."""
+        mock_sddc_config['validation'] = {'check_timeout': 0.3}
+        app = main.VCFArchitecture(config=mock_sddc_config)
+        get = app.client.get
+        release = threading.Event()
+
+        def hanging_get(path, *args, **kwargs):
+            if path == '/v1/domains':
+                release.wait(5)
+            return get(path, *args, **kwargs)
+
+        try:
+            with patch.object(app.client, 'get', side_effect=hanging_get):
+                start = time.monotonic()
+                report = app.validate_deployment()
+                elapsed = time.monotonic() - start
+        finally:
+            release.set()
+            app.close()
+        statuses = {r['name']: r['status'] for r in report['results']}
+        assert statuses['domains'] == TIMEOUT
+        assert statuses['vsan'] == PASSED
+        assert elapsed < 2
+
+    def test_main_validate(self, mock_sddc_config, capsys):
+        """Test the --validate command line mode."""
+        with patch('sys.argv', ['main.py', '--validate']), \
+                patch.object(main.VCFArchitecture, '_load_config',
+                             return_value=mock_sddc_config):
+            assert main.main() == 0
+        assert '[PASSED] sddc_manager' in capsys.readouterr().out
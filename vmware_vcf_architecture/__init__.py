@@ -0,0 +1,30 @@
+"""
+VMware VCF Architecture support package.
+
+Subsystems used by the ``main.VCFArchitecture`` application: the SDDC
+Manager API client and the components built on top of it.
+
+Public names are resolved on first access so that importing the package
+does not pull in ``requests`` and friends until they are actually used.
+"""
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    'CircuitOpenError': 'client',
+    'SDDCManagerClient': 'client',
+    'VCFAuthenticationError': 'client',
+    'VCFClientError': 'client',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
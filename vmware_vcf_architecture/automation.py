@@ -0,0 +1,401 @@
+"""
+Batched automation task execution.
+
+Per-object operations such as host commissioning or per-host scans are
+grouped into batches of ``performance.batch_size`` and run by a pool of
+``performance.max_workers`` threads. Batches wait in a bounded queue: when
+the workers fall behind, submission blocks instead of buffering the whole
+estate in memory. A run can be cancelled at any time; queued batches are
+dropped and running batches stop before their next object.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import CancelledError, Future
+from typing import (
+    TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple,
+)
+
+from .client import SDDCManagerClient
+from .metrics import QUEUE_DEPTH
+from .profiling import in_context
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .tasks import TaskTracker
+
+logger = logging.getLogger(__name__)
+
+BatchFunc = Callable[[List[Any]], Any]
+
+# Task statuses
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class BatchResult:
+    """Outcome of one batch."""
+
+    __slots__ = ('index', 'items', 'value', 'error')
+
+    def __init__(self, index: int, items: List[Any], value: Any = None,
+                 error: Optional[BaseException] = None):
+        self.index = index
+        self.items = items
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """True if the batch ran to completion."""
+        return self.error is None
+
+    @property
+    def cancelled(self) -> bool:
+        """True if the batch was cancelled before or while running."""
+        return isinstance(self.error, CancelledError)
+
+
+class ItemResult:
+    """Outcome of one object processed by ``BatchExecutor.map_items``."""
+
+    __slots__ = ('item', 'value', 'error')
+
+    def __init__(self, item: Any, value: Any = None, error: Optional[BaseException] = None):
+        self.item = item
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """True if the object was processed without error."""
+        return self.error is None
+
+
+class BatchExecutor:
+    """Worker pool fed from a bounded queue of batches."""
+
+    def __init__(self, max_workers: int = 4, batch_size: int = 100,
+                 max_pending: Optional[int] = None):
+        """Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads
+            batch_size: Number of objects per batch
+            max_pending: Batches allowed to wait in the queue before
+                submission blocks, defaults to twice the worker count
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.batch_size = max(1, int(batch_size))
+        self.max_pending = max(1, int(max_pending or 2 * self.max_workers))
+        self._queue: 'queue.Queue[Optional[Tuple[Future, BatchFunc, List[Any]]]]' = \
+            queue.Queue(maxsize=self.max_pending)
+        self._cancelled = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'BatchExecutor':
+        """Create an executor from the ``performance`` configuration section."""
+        performance = config.get('performance') or {}
+        return cls(
+            max_workers=performance.get('max_workers', 4),
+            batch_size=performance.get('batch_size', 100),
+        )
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() has been called."""
+        return self._cancelled.is_set()
+
+    def start(self) -> 'BatchExecutor':
+        """Start the worker threads."""
+        with self._lock:
+            if not self._threads:
+                self._threads = [
+                    threading.Thread(target=self._work, name=f"vcf-batch-{i}", daemon=True)
+                    for i in range(self.max_workers)
+                ]
+                for thread in self._threads:
+                    thread.start()
+        return self
+
+    def _work(self) -> None:
+        """Run batches from the queue until a stop sentinel arrives."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            QUEUE_DEPTH.dec(1, 'automation')
+            future, func, batch = job
+            if self._cancelled.is_set():
+                future.cancel()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(batch))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, func: BatchFunc, batch: List[Any],
+               timeout: Optional[float] = None) -> 'Future[Any]':
+        """Queue a batch, blocking while the queue is full.
+
+        Args:
+            func: Callable receiving the batch
+            batch: Objects to process together
+            timeout: Seconds to wait for queue space, None waits indefinitely
+
+        Returns:
+            Future resolving to the callable's return value
+
+        Raises:
+            CancelledError: If the executor has been cancelled
+            queue.Full: If no queue space became available within the timeout
+        """
+        if self._cancelled.is_set():
+            raise CancelledError()
+        self.start()
+        future: 'Future[Any]' = Future()
+        self._queue.put((future, in_context(func), batch), timeout=timeout)
+        QUEUE_DEPTH.inc(1, 'automation')
+        return future
+
+    def batches(self, items: Iterable[Any]) -> Iterator[List[Any]]:
+        """Split objects into lists of at most ``batch_size``."""
+        batch: List[Any] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def map_batches(self, func: BatchFunc, items: Iterable[Any]) -> Iterator[BatchResult]:
+        """Run a batch callable over every batch of objects.
+
+        Objects are consumed lazily, so at most the queued and running
+        batches are held in memory. Results are yielded in submission order.
+        After cancel(), remaining batches are reported as cancelled.
+
+        Args:
+            func: Callable receiving one batch at a time
+            items: Objects to process
+
+        Yields:
+            One result per batch
+        """
+        inflight: Deque[Tuple[int, List[Any], Future]] = deque()
+        limit = self.max_pending + self.max_workers
+
+        def collect(entry: Tuple[int, List[Any], Future]) -> BatchResult:
+            index, batch, future = entry
+            try:
+                return BatchResult(index, batch, value=future.result())
+            except BaseException as e:
+                return BatchResult(index, batch, error=e)
+
+        for index, batch in enumerate(self.batches(items)):
+            if self._cancelled.is_set():
+                yield BatchResult(index, batch, error=CancelledError())
+                continue
+            try:
+                inflight.append((index, batch, self.submit(func, batch)))
+            except CancelledError as e:
+                yield BatchResult(index, batch, error=e)
+                continue
+            while inflight and (inflight[0][2].done() or len(inflight) >= limit):
+                yield collect(inflight.popleft())
+        while inflight:
+            yield collect(inflight.popleft())
+
+    def map_items(self, func: Callable[[Any], Any],
+                  items: Iterable[Any]) -> Iterator[ItemResult]:
+        """Run a per-object callable over batches of objects.
+
+        Each worker processes one batch sequentially and checks for
+        cancellation between objects. A failing object does not stop the
+        rest of its batch.
+
+        Args:
+            func: Callable receiving one object
+            items: Objects to process
+
+        Yields:
+            One result per object, in input order
+        """
+        def run_batch(batch: List[Any]) -> List[ItemResult]:
+            results = []
+            for item in batch:
+                if self._cancelled.is_set():
+                    results.append(ItemResult(item, error=CancelledError()))
+                    continue
+                try:
+                    results.append(ItemResult(item, value=func(item)))
+                except Exception as e:
+                    results.append(ItemResult(item, error=e))
+            return results
+
+        for batch_result in self.map_batches(run_batch, items):
+            if batch_result.ok:
+                yield from batch_result.value
+            else:
+                for item in batch_result.items:
+                    yield ItemResult(item, error=batch_result.error)
+
+    def cancel(self) -> int:
+        """Cancel queued batches and stop running ones before their next object.
+
+        Returns:
+            Number of queued batches that were dropped
+        """
+        self._cancelled.set()
+        dropped = 0
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                # Keep stop sentinels for the workers
+                self._queue.put(job)
+                break
+            QUEUE_DEPTH.dec(1, 'automation')
+            job[0].cancel()
+            dropped += 1
+        if dropped:
+            logger.info(f"Cancelled {dropped} queued batches")
+        return dropped
+
+    def shutdown(self, wait: bool = True, cancel: bool = False) -> None:
+        """Stop the workers.
+
+        Args:
+            wait: Wait for queued and running batches to finish
+            cancel: Cancel queued batches first
+        """
+        if cancel:
+            self.cancel()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def __enter__(self) -> 'BatchExecutor':
+        return self.start()
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        self.shutdown(cancel=exc_type is not None)
+
+
+class AutomationEngine:
+    """Runs named automation tasks on a batch executor."""
+
+    def __init__(self, client: SDDCManagerClient, executor: BatchExecutor,
+                 tracker: Optional['TaskTracker'] = None):
+        """Initialize the engine.
+
+        Args:
+            client: Pooled SDDC Manager client
+            executor: Executor the task's batches run on
+            tracker: Optional tracker used to wait for SDDC Manager tasks
+        """
+        self.client = client
+        self.executor = executor
+        self.tracker = tracker
+        self.tasks: Dict[str, Callable[[Dict[str, Any]], Tuple[Any, List[str]]]] = {
+            'infrastructure_scan': self.infrastructure_scan,
+            'host_commission': self.host_commission,
+        }
+
+    def run(self, task: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a task and report its outcome.
+
+        Args:
+            task: Task name, e.g. ``infrastructure_scan``
+            parameters: Task parameters
+
+        Returns:
+            Task report dictionary
+
+        Raises:
+            ValueError: If the task is unknown
+        """
+        if task not in self.tasks:
+            raise ValueError(f"Unknown automation task: {task}")
+        start = time.monotonic()
+        logger.info(f"Running automation task {task}")
+        result, errors = self.tasks[task](dict(parameters or {}))
+        if self.executor.cancelled:
+            status = CANCELLED
+        else:
+            status = FAILED if errors else COMPLETED
+        report = {
+            'task': task,
+            'status': status,
+            'duration': round(time.monotonic() - start, 3),
+            'result': result,
+            'errors': errors,
+        }
+        logger.info(f"Automation task {task} {status} in {report['duration']}s")
+        return report
+
+    def infrastructure_scan(self, parameters: Dict[str, Any]) -> Tuple[Any, List[str]]:
+        """Count hosts by status, optionally re-reading every host.
+
+        Parameters:
+            domain_id: Limit the scan to one workload domain
+            deep_scan: Fetch each host individually instead of trusting the listing
+        """
+        params = {'domainId': parameters['domain_id']} if parameters.get('domain_id') else None
+        hosts = self.client.get_all('/v1/hosts', params=params)
+        errors: List[str] = []
+        if parameters.get('deep_scan'):
+            details = []
+            for item in self.executor.map_items(
+                lambda host: self.client.get(f"/v1/hosts/{host['id']}", use_cache=False),
+                hosts,
+            ):
+                if item.ok:
+                    details.append(item.value)
+                elif not isinstance(item.error, CancelledError):
+                    errors.append(f"{item.item['id']}: {item.error}")
+            hosts = details
+        statuses = Counter(host.get('status', 'UNKNOWN') for host in hosts)
+        return {'hosts': len(hosts), 'status': dict(statuses)}, errors
+
+    def host_commission(self, parameters: Dict[str, Any]) -> Tuple[Any, List[str]]:
+        """Commission hosts, one SDDC Manager request per batch of host specs.
+
+        Parameters:
+            hosts: List of host commission specs, each with at least ``fqdn``
+            wait: Wait for the SDDC Manager commissioning tasks to finish
+        """
+        specs = parameters.get('hosts') or []
+        tasks: List[str] = []
+        errors: List[str] = []
+        for batch in self.executor.map_batches(
+            lambda batch: self.client.post('/v1/hosts', batch), specs
+        ):
+            if batch.ok:
+                tasks.append((batch.value or {}).get('id'))
+            elif not batch.cancelled:
+                fqdns = ', '.join(spec.get('fqdn', '?') for spec in batch.items)
+                errors.append(f"batch {batch.index} ({fqdns}): {batch.error}")
+
+        if parameters.get('wait') and self.tracker is not None:
+            futures = {task_id: self.tracker.track(task_id) for task_id in tasks if task_id}
+            self.tracker.wait(futures.values(), timeout=parameters.get('timeout'))
+            for task_id, future in futures.items():
+                if not future.done():
+                    errors.append(f"task {task_id}: still running")
+                elif future.exception() is not None:
+                    errors.append(f"task {task_id}: {future.exception()}")
+        return {'hosts': len(specs), 'tasks': tasks}, errors
@@ -0,0 +1,246 @@
+"""
+TTL + LRU response cache for SDDC Manager reads.
+
+Entries expire after a per-resource TTL and the least recently used entries
+are evicted once either the entry or the byte budget is exceeded. Expired
+entries keep their ``ETag``/``Last-Modified`` validators so the client can
+revalidate them with a conditional request instead of downloading the
+object again.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class CacheEntry:
+    """Cached response body and its validators."""
+
+    __slots__ = ('value', 'etag', 'last_modified', 'expires', 'size')
+
+    def __init__(self, value: Any, expires: float, size: int,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.size = size
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Return True if the entry has not reached its TTL."""
+        return (time.monotonic() if now is None else now) < self.expires
+
+    @property
+    def revalidatable(self) -> bool:
+        """Return True if the entry carries a validator for conditional requests."""
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-resource TTLs."""
+
+    def __init__(
+        self,
+        default_ttl: float = 300,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            default_ttl: TTL in seconds for resources without a specific TTL
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached response bodies
+            ttls: Per-resource TTLs keyed by API path prefix, e.g. {'/v1/tasks': 5}
+        """
+        self.default_ttl = default_ttl
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        # Longest prefix first so the most specific TTL wins
+        self.ttls = sorted((ttls or {}).items(), key=lambda item: -len(item[0]))
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ResponseCache':
+        """Build a cache from the ``performance`` configuration section.
+
+        Args:
+            config: Full application configuration dictionary
+
+        Returns:
+            Configured cache
+        """
+        performance = config.get('performance') or {}
+        return cls(
+            default_ttl=performance.get('cache_ttl', 300),
+            max_entries=performance.get('cache_max_entries', 10000),
+            max_bytes=performance.get('cache_max_bytes', 64 * 1024 * 1024),
+            ttls=performance.get('cache_ttls'),
+        )
+
+    @staticmethod
+    def make_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build the cache key for a resource path and query parameters."""
+        if not params:
+            return path
+        query = '&'.join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{path}?{query}"
+
+    def ttl_for(self, path: str) -> float:
+        """Return the TTL that applies to a resource path."""
+        for prefix, ttl in self.ttls:
+            if path.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """Look up an entry without discarding stale validators.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (entry or None, True if the entry is fresh)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.is_fresh():
+                self.hits += 1
+                return entry, True
+            if not entry.revalidatable:
+                self._remove(key)
+                self.misses += 1
+                return None, False
+            # Stale but revalidatable: still costs a (conditional) request
+            self.misses += 1
+            return entry, False
+
+    def get(self, key: str) -> Any:
+        """Return a fresh cached value, or None."""
+        entry, fresh = self.lookup(key)
+        return entry.value if entry is not None and fresh else None
+
+    def put(self, key: str, value: Any, size: int = 0, ttl: Optional[float] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a value.
+
+        Args:
+            key: Cache key
+            value: Decoded response body
+            size: Size of the response body in bytes, used for the byte budget
+            ttl: TTL in seconds, defaults to the TTL for the key's path
+            etag: ETag validator returned by the server
+            last_modified: Last-Modified validator returned by the server
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key.split('?', 1)[0])
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        entry = CacheEntry(value, time.monotonic() + ttl, size, etag, last_modified)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def refresh(self, key: str, ttl: Optional[float] = None) -> Optional[CacheEntry]:
+        """Extend the lifetime of an entry after a successful revalidation.
+
+        Args:
+            key: Cache key
+            ttl: TTL in seconds, defaults to the TTL for the key's path
+
+        Returns:
+            Refreshed entry, or None if it was evicted meanwhile
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key.split('?', 1)[0])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = time.monotonic() + ttl
+                self.revalidations += 1
+            return entry
+
+    def invalidate(self, prefix: str = '') -> int:
+        """Drop every entry whose key starts with a prefix.
+
+        Args:
+            prefix: Key prefix, an empty prefix clears the cache
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def invalidate_path(self, path: str, subpaths: bool = True) -> int:
+        """Drop the entries of one resource path.
+
+        Unlike ``invalidate``, ``/v1/hosts/host-1`` does not match
+        ``/v1/hosts/host-10``.
+
+        Args:
+            path: Resource path without query string
+            subpaths: Also drop nested paths such as ``<path>/datastores``
+
+        Returns:
+            Number of entries removed
+        """
+        prefixes = (f"{path}?", f"{path}/") if subpaths else (f"{path}?",)
+        with self._lock:
+            keys = [key for key in self._entries if key == path or key.startswith(prefixes)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the caller must hold the lock."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of cached response bodies."""
+        return self._bytes
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served without contacting the server."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hit_ratio, 4),
+        }
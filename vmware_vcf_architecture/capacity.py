@@ -0,0 +1,268 @@
+"""
+Vectorized capacity planning over VCF domain specs.
+
+Clusters from any number of domain specs (``config/vcf-config.template.yml``
+format) are loaded once into columnar NumPy arrays. Usable CPU, memory and
+vSAN capacity under N+k host reserve and vSAN FTT policies, the hosts needed
+for a target capacity, and what-if scenarios (added hosts, a different
+storage policy, a different reserve) are all computed as whole-array
+operations, so thousands of scenarios evaluate in a single pass.
+
+Requires the optional ``numpy`` dependency (``pip install .[capacity]``).
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLICY = 'RAID-1 FTT-1'
+DEFAULT_RESERVE_HOSTS = 1
+# Free space vSAN needs for rebuilds, rebalancing and snapshots
+DEFAULT_SLACK_SPACE = 0.25
+# Expected capacity savings of deduplication and compression
+DEDUP_COMPRESSION_RATIO = 1.5
+COMPRESSION_RATIO = 1.25
+
+_POLICY = re.compile(r'RAID-?(\d)\s*/?\s*FTT-?(\d)', re.IGNORECASE)
+
+ArrayLike = Union[int, float, Sequence[float], np.ndarray]
+
+
+def parse_policy(policy: str) -> Tuple[float, int]:
+    """Return the capacity overhead and minimum host count of a vSAN policy.
+
+    Args:
+        policy: Storage policy such as ``RAID-1 FTT-1`` or ``RAID-5 FTT-1``
+
+    Returns:
+        Tuple of (raw-to-usable overhead factor, minimum hosts)
+
+    Raises:
+        ValueError: If the policy is not a supported RAID/FTT combination
+    """
+    match = _POLICY.search(policy or '')
+    if not match:
+        raise ValueError(f"Unsupported vSAN storage policy: {policy!r}")
+    raid, ftt = int(match.group(1)), int(match.group(2))
+    if raid == 1 and 0 <= ftt <= 3:
+        return float(ftt + 1), 2 * ftt + 1
+    if raid == 5 and ftt == 1:
+        return 4 / 3, 4
+    if raid == 6 and ftt == 2:
+        return 1.5, 6
+    raise ValueError(f"Unsupported vSAN storage policy: {policy!r}")
+
+
+def _policy_columns(policies: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Map policy names to overhead and minimum host arrays, parsing each name once."""
+    unique, inverse = np.unique(np.asarray(policies, dtype=object).astype(str),
+                                return_inverse=True)
+    parsed = [parse_policy(name) for name in unique]
+    overhead = np.array([p[0] for p in parsed], dtype=float)[inverse]
+    min_hosts = np.array([p[1] for p in parsed], dtype=np.int64)[inverse]
+    return overhead, min_hosts
+
+
+def _reduction(vsan: Mapping[str, Any]) -> float:
+    """Return the data reduction ratio of a domain's vSAN settings."""
+    if vsan.get('deduplication') and vsan.get('compression', True):
+        return DEDUP_COMPRESSION_RATIO
+    if vsan.get('compression'):
+        return COMPRESSION_RATIO
+    return 1.0
+
+
+class CapacityModel:
+    """Columnar cluster capacity model."""
+
+    def __init__(self, names: Sequence[str], domains: Sequence[str],
+                 hosts: ArrayLike, cpu_cores: ArrayLike, memory_gb: ArrayLike,
+                 storage_tb: ArrayLike, policies: Sequence[str],
+                 reduction: ArrayLike = 1.0,
+                 reserve_hosts: int = DEFAULT_RESERVE_HOSTS,
+                 slack_space: float = DEFAULT_SLACK_SPACE):
+        """Initialize the model from per-cluster columns.
+
+        Args:
+            names: Cluster names
+            domains: Name of the domain owning each cluster
+            hosts: Hosts per cluster
+            cpu_cores: CPU cores per host
+            memory_gb: Memory per host in GB
+            storage_tb: Raw vSAN capacity per host in TB
+            policies: vSAN storage policy of each cluster
+            reduction: Deduplication/compression ratio of each cluster
+            reserve_hosts: Hosts held back for failover (N+1 by default)
+            slack_space: Fraction of vSAN capacity kept free
+        """
+        self.names = list(names)
+        self.domains = list(domains)
+        size = len(self.names)
+        self.hosts = np.broadcast_to(np.asarray(hosts, dtype=np.int64), (size,)).copy()
+        self.cpu_cores = np.broadcast_to(np.asarray(cpu_cores, dtype=float), (size,)).copy()
+        self.memory_gb = np.broadcast_to(np.asarray(memory_gb, dtype=float), (size,)).copy()
+        self.storage_tb = np.broadcast_to(np.asarray(storage_tb, dtype=float), (size,)).copy()
+        self.reduction = np.broadcast_to(np.asarray(reduction, dtype=float), (size,)).copy()
+        self.policies = list(policies)
+        if size:
+            self.overhead, self.min_hosts = _policy_columns(self.policies)
+        else:
+            self.overhead, self.min_hosts = np.zeros(0), np.zeros(0, dtype=np.int64)
+        self.reserve_hosts = int(reserve_hosts)
+        self.slack_space = float(slack_space)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[Mapping[str, Any]],
+                   config: Optional[Dict[str, Any]] = None) -> 'CapacityModel':
+        """Build the model from parsed domain specs.
+
+        Args:
+            specs: Spec documents with ``management_domain`` and/or ``workload_domains``
+            config: Optional application configuration with a ``capacity`` section
+
+        Returns:
+            Capacity model with one row per cluster
+        """
+        from .config import spec_clusters
+        columns: Dict[str, List[Any]] = {
+            key: [] for key in ('names', 'domains', 'hosts', 'cpu_cores', 'memory_gb',
+                                'storage_tb', 'policies', 'reduction')
+        }
+        for spec in specs:
+            domains = list(spec.get('workload_domains') or [])
+            if spec.get('management_domain'):
+                domains.insert(0, spec['management_domain'])
+            for domain in domains:
+                vsan = domain.get('vsan') or {}
+                for cluster in spec_clusters(domain):
+                    columns['names'].append(cluster.get('name', domain['name']))
+                    columns['domains'].append(domain['name'])
+                    columns['hosts'].append(cluster['hosts'])
+                    columns['cpu_cores'].append(cluster['cpu_cores'])
+                    columns['memory_gb'].append(cluster['memory_gb'])
+                    columns['storage_tb'].append(cluster.get('storage_tb', 0))
+                    columns['policies'].append(vsan.get('storage_policy', DEFAULT_POLICY))
+                    columns['reduction'].append(_reduction(vsan))
+
+        settings = (config or {}).get('capacity') or {}
+        return cls(
+            reserve_hosts=settings.get('reserve_hosts', DEFAULT_RESERVE_HOSTS),
+            slack_space=settings.get('slack_space', DEFAULT_SLACK_SPACE),
+            **columns,
+        )
+
+    @classmethod
+    def from_spec_files(cls, paths: Iterable[str],
+                        config: Optional[Dict[str, Any]] = None) -> 'CapacityModel':
+        """Build the model from spec files, using the cached spec loader."""
+        from .config import load_spec
+        return cls.from_specs((load_spec(path) for path in paths), config)
+
+    def _capacity(self, hosts: np.ndarray, overhead: np.ndarray,
+                  reserve: np.ndarray) -> Dict[str, np.ndarray]:
+        """Compute usable capacity for broadcastable host/policy/reserve arrays."""
+        active = np.maximum(hosts - reserve, 0)
+        storage = (active * self.storage_tb * self.reduction
+                   * (1.0 - self.slack_space) / overhead)
+        return {
+            'usable_cpu_cores': active * self.cpu_cores,
+            'usable_memory_gb': active * self.memory_gb,
+            'usable_vsan_tb': storage,
+        }
+
+    def usable(self) -> Dict[str, np.ndarray]:
+        """Usable capacity of every cluster with N+reserve hosts.
+
+        Returns:
+            Per-cluster arrays ``usable_cpu_cores``, ``usable_memory_gb``,
+            ``usable_vsan_tb`` and the boolean ``policy_compliant``
+        """
+        result = self._capacity(self.hosts, self.overhead, np.int64(self.reserve_hosts))
+        result['policy_compliant'] = self.hosts >= self.min_hosts + self.reserve_hosts
+        return result
+
+    def what_if(self, add_hosts: ArrayLike = 0, policy: Optional[Sequence[str]] = None,
+                reserve_hosts: Optional[ArrayLike] = None) -> Dict[str, np.ndarray]:
+        """Evaluate scenarios for every cluster in one vectorized pass.
+
+        Each argument is a scalar or a sequence with one value per scenario;
+        sequences must have the same length.
+
+        Args:
+            add_hosts: Hosts added to every cluster in each scenario
+            policy: vSAN storage policy applied to every cluster in each
+                scenario, None keeps each cluster's own policy
+            reserve_hosts: Failover reserve in each scenario, defaults to the model's
+
+        Returns:
+            Arrays of shape (scenarios, clusters) named like ``usable()``
+        """
+        added = np.atleast_1d(np.asarray(add_hosts, dtype=np.int64))
+        reserve = np.atleast_1d(np.asarray(
+            self.reserve_hosts if reserve_hosts is None else reserve_hosts, dtype=np.int64))
+        if policy is None:
+            overhead = self.overhead[np.newaxis, :]
+            min_hosts = self.min_hosts[np.newaxis, :]
+        else:
+            overhead, min_hosts = _policy_columns(
+                [policy] if isinstance(policy, str) else list(policy))
+            overhead, min_hosts = overhead[:, np.newaxis], min_hosts[:, np.newaxis]
+
+        hosts = self.hosts[np.newaxis, :] + added[:, np.newaxis]
+        reserve = reserve[:, np.newaxis]
+        hosts, overhead, reserve, min_hosts = np.broadcast_arrays(
+            hosts, overhead, reserve, min_hosts)
+        result = self._capacity(hosts, overhead, reserve)
+        result['policy_compliant'] = hosts >= min_hosts + reserve
+        return result
+
+    def hosts_required(self, cpu_cores: ArrayLike = 0, memory_gb: ArrayLike = 0,
+                       vsan_tb: ArrayLike = 0) -> np.ndarray:
+        """Hosts each cluster needs to provide a usable capacity target.
+
+        Targets are scalars or per-cluster arrays. The result includes the
+        failover reserve and the policy's minimum host count.
+
+        Returns:
+            Integer array with one host count per cluster
+        """
+        def needed(target: ArrayLike, per_host: np.ndarray) -> np.ndarray:
+            target = np.asarray(target, dtype=float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                count = np.ceil(target / per_host)
+            return np.where(target > 0, count, 0)
+
+        storage_per_host = (self.storage_tb * self.reduction
+                            * (1.0 - self.slack_space) / self.overhead)
+        active = np.maximum.reduce([
+            needed(cpu_cores, self.cpu_cores),
+            needed(memory_gb, self.memory_gb),
+            needed(vsan_tb, storage_per_host),
+        ])
+        if not np.all(np.isfinite(active)):
+            raise ValueError("Capacity target cannot be met by hosts without that resource")
+        return np.maximum(active.astype(np.int64) + self.reserve_hosts, self.min_hosts)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-cluster usable capacity as JSON-serializable rows."""
+        usable = self.usable()
+        return [
+            {
+                'domain': self.domains[i],
+                'cluster': self.names[i],
+                'hosts': int(self.hosts[i]),
+                'policy': self.policies[i],
+                'usable_cpu_cores': float(usable['usable_cpu_cores'][i]),
+                'usable_memory_gb': float(usable['usable_memory_gb'][i]),
+                'usable_vsan_tb': round(float(usable['usable_vsan_tb'][i]), 2),
+                'policy_compliant': bool(usable['policy_compliant'][i]),
+            }
+            for i in range(len(self))
+        ]
@@ -0,0 +1,571 @@
+"""
+SDDC Manager API client.
+
+Wraps a single pooled, keep-alive ``requests.Session`` per SDDC Manager
+endpoint. The access token is obtained once and reused by every call until
+it expires or the server rejects it, transient failures are retried with
+exponential backoff, and every call carries a timeout. Calls are throttled
+and circuit-broken per target host (see ``resilience``). With a token cache
+(see ``tokens``), token pairs survive the process, so short-lived runs reuse
+the last login instead of authenticating again.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .metrics import (
+    API_IN_FLIGHT,
+    API_POOL_SATURATION,
+    API_REQUEST_DURATION,
+    CACHE_ENTRIES,
+    CACHE_HIT_RATIO,
+    endpoint_template,
+)
+from .profiling import record_call
+from .resilience import TargetGuards
+from .tokens import TokenCache
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: throttling and transient gateway failures
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Methods that are safe to resend after a transport error or retry status
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+# SDDC Manager access tokens are valid for one hour
+DEFAULT_TOKEN_TTL = 3600
+
+
+class VCFClientError(Exception):
+    """Raised when an SDDC Manager API call cannot be completed."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class VCFAuthenticationError(VCFClientError):
+    """Raised when SDDC Manager rejects the configured credentials."""
+
+
+class CircuitOpenError(VCFClientError):
+    """Raised without contacting a target whose circuit breaker is open."""
+
+
+class SDDCManagerClient:
+    """Pooled client for the SDDC Manager public API."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        username: str = '',
+        password: str = '',
+        verify_ssl: bool = True,
+        timeout: float = 30,
+        retry_attempts: int = 3,
+        pool_size: int = 4,
+        backoff_factor: float = 0.5,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        cache: Optional[ResponseCache] = None,
+        guards: Optional[TargetGuards] = None,
+        token_cache: Optional[TokenCache] = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            endpoint: Base URL of the SDDC Manager, e.g. https://sddc.example.com
+            username: SSO username used to request access tokens
+            password: SSO password used to request access tokens
+            verify_ssl: Whether to verify the server certificate
+            timeout: Default per-call timeout in seconds
+            retry_attempts: Number of retries for transient failures
+            pool_size: Maximum number of pooled keep-alive connections
+            backoff_factor: Base delay for exponential retry backoff
+            token_ttl: Seconds an access token is reused before renewal
+            cache: Optional response cache shared by GET calls
+            guards: Per-target rate limiters and circuit breakers, defaults
+                to a circuit breaker without throttling
+            token_cache: Optional on-disk cache sharing tokens between processes
+        """
+        if not endpoint:
+            raise ValueError("SDDC Manager endpoint is not configured")
+
+        self.endpoint = endpoint.rstrip('/')
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.retry_attempts = retry_attempts
+        self.backoff_factor = backoff_factor
+        self.pool_size = max(1, int(pool_size))
+        self.token_ttl = token_ttl
+        self.cache = cache
+        self.guards = guards if guards is not None else TargetGuards()
+        self.token_cache = token_cache
+
+        self._access_token: Optional[str] = None
+        self._refresh_token: Optional[str] = None
+        self._token_expires = 0.0
+        self._token_lock = threading.Lock()
+        self._token_cache_checked = False
+        # Authentications made by this process, reported on close
+        self.logins = 0
+        self.token_refreshes = 0
+
+        self.session = self._build_session(verify_ssl)
+        self._register_metrics()
+
+    def _register_metrics(self) -> None:
+        """Publish pool and cache gauges for this endpoint."""
+        instance = self.instance
+        pool_size = self.pool_size
+        API_POOL_SATURATION.set_function(
+            lambda: API_IN_FLIGHT.value(instance) / pool_size, instance
+        )
+        cache = self.cache
+        if cache is not None:
+            CACHE_HIT_RATIO.set_function(lambda: cache.hit_ratio, instance)
+            CACHE_ENTRIES.set_function(lambda: len(cache), instance)
+
+    @property
+    def instance(self) -> str:
+        """Host and port of the endpoint, used as the metrics instance label."""
+        return urlparse(self.endpoint).netloc or self.endpoint
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'SDDCManagerClient':
+        """Build a client from the application configuration.
+
+        Args:
+            config: Full application configuration dictionary
+
+        Returns:
+            Configured client
+        """
+        vcf = config.get('vcf') or {}
+        performance = config.get('performance') or {}
+        security = config.get('security') or {}
+        return cls(
+            endpoint=vcf.get('endpoint', ''),
+            username=vcf.get('username', ''),
+            password=vcf.get('password', ''),
+            verify_ssl=vcf.get('verify_ssl', True),
+            timeout=vcf.get('timeout', 30),
+            retry_attempts=vcf.get('retry_attempts', 3),
+            pool_size=performance.get('max_workers', 4),
+            token_ttl=security.get('token_expiry', DEFAULT_TOKEN_TTL),
+            cache=ResponseCache.from_config(config),
+            guards=TargetGuards.from_config(config),
+            token_cache=TokenCache.from_config(config),
+        )
+
+    def _build_session(self, verify_ssl: bool) -> requests.Session:
+        """Create the pooled session shared by every call to this endpoint.
+
+        The adapter never resends a request itself; retries happen in
+        ``_send`` so that every attempt passes the rate limiter and circuit
+        breaker.
+
+        Args:
+            verify_ssl: Whether to verify the server certificate
+
+        Returns:
+            Configured session
+        """
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+            max_retries=0,
+        )
+
+        session = requests.Session()
+        session.verify = verify_ssl
+        session.headers.update({
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+        })
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _url(self, path: str) -> str:
+        """Return the absolute URL for an API path."""
+        if path.startswith(('http://', 'https://')):
+            return path
+        return f"{self.endpoint}/{path.lstrip('/')}"
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request, retrying transport errors and retry statuses.
+
+        Idempotent methods are resent up to ``retry_attempts`` times with
+        exponential backoff, honoring ``Retry-After``. Every attempt goes
+        through ``_attempt``, so retries take rate limiter tokens and count
+        towards the circuit breaker, which stops them once it opens.
+        """
+        retries = self.retry_attempts if method.upper() in IDEMPOTENT_METHODS else 0
+        for attempt in range(retries):
+            try:
+                response = self._attempt(method, url, **kwargs)
+            except requests.RequestException as e:
+                delay = self.backoff_factor * 2 ** attempt
+                logger.debug(f"{method} {url} failed ({e}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                delay = _retry_after(response) or self.backoff_factor * 2 ** attempt
+                logger.debug(f"{method} {url} returned HTTP {response.status_code}, "
+                             f"retrying in {delay:.2f}s")
+                response.close()
+            time.sleep(delay)
+        return self._attempt(method, url, **kwargs)
+
+    def _attempt(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send one request over the pooled session and record its latency.
+
+        The request waits for a token from the target's rate limiter and is
+        rejected without being sent while the target's circuit is open.
+        Transport errors, 5xx and 429 responses count as circuit failures.
+        """
+        instance = self.instance
+        target = urlparse(url).netloc or instance
+        guard = self.guards.get(target)
+        breaker = guard.breaker
+        if breaker is not None and not breaker.allow():
+            guard.rejected += 1
+            raise CircuitOpenError(
+                f"Circuit for {target} is open, retry in {breaker.retry_after():.0f}s", 503
+            )
+        if guard.limiter is not None and not guard.limiter.acquire(timeout=0):
+            guard.throttled += 1
+            if not guard.limiter.acquire(timeout=kwargs.get('timeout')):
+                if breaker is not None:
+                    # Nothing was sent, so a half-open trial is handed back
+                    breaker.release()
+                raise VCFClientError(f"{method} {url} throttled: rate limit for {target}", 429)
+
+        endpoint = endpoint_template(urlparse(url).path)
+        status = 'error'
+        failed = True
+        API_IN_FLIGHT.inc(1, instance)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+            status = str(response.status_code)
+            failed = response.status_code >= 500 or response.status_code == 429
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            API_IN_FLIGHT.dec(1, instance)
+            API_REQUEST_DURATION.observe(elapsed, instance, endpoint, method, status)
+            record_call(f"{method} {endpoint}", elapsed)
+            if breaker is not None:
+                if failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+    def authenticate(self, force: bool = False, stale: Optional[str] = None) -> str:
+        """Return a valid access token, logging in only when required.
+
+        Args:
+            force: Discard the cached token and obtain a new one
+            stale: Token the server rejected; a forced call returns the current
+                token without logging in when another thread already replaced it
+
+        Returns:
+            Access token
+        """
+        with self._token_lock:
+            if force and stale is not None and self._access_token not in (None, stale):
+                return self._access_token
+            if not force and not self._token_cache_checked:
+                self._token_cache_checked = True
+                self._load_cached_tokens()
+            if not force and self._access_token and time.monotonic() < self._token_expires:
+                return self._access_token
+
+            if self._refresh_token and not force and self._refresh_access_token():
+                self._save_cached_tokens()
+                return self._access_token  # type: ignore[return-value]
+
+            self._login()
+            self._save_cached_tokens()
+            return self._access_token  # type: ignore[return-value]
+
+    def _load_cached_tokens(self) -> None:
+        """Adopt the token pair another process left in the token cache."""
+        if self.token_cache is None:
+            return
+        cached = self.token_cache.load(self.endpoint, self.username, self.password)
+        if cached is None:
+            return
+        access, refresh, remaining = cached
+        logger.debug(f"Reusing cached SDDC Manager tokens for {self.endpoint}")
+        self._access_token = access
+        self._refresh_token = refresh
+        self._token_expires = time.monotonic() + remaining
+
+    def _save_cached_tokens(self) -> None:
+        """Share the current token pair through the token cache."""
+        if self.token_cache is not None:
+            self.token_cache.store(
+                self.endpoint, self.username, self.password, self._access_token,
+                self._refresh_token, self._token_expires - time.monotonic(),
+            )
+
+    def _login(self) -> None:
+        """Request a new token pair with the configured credentials."""
+        logger.debug(f"Requesting SDDC Manager access token from {self.endpoint}")
+        try:
+            response = self._send(
+                'POST', self._url('/v1/tokens'),
+                json={'username': self.username, 'password': self.password},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise VCFClientError(f"Login to {self.endpoint} failed: {e}") from e
+
+        if response.status_code in (401, 403):
+            raise VCFAuthenticationError(
+                f"SDDC Manager rejected credentials for {self.username}",
+                response.status_code,
+            )
+        if not response.ok:
+            raise VCFClientError(
+                f"Login to {self.endpoint} failed with HTTP {response.status_code}",
+                response.status_code,
+            )
+
+        self._store_tokens(response.json())
+        self.logins += 1
+
+    def _refresh_access_token(self) -> bool:
+        """Exchange the refresh token for a new access token.
+
+        Returns:
+            True if a new access token was obtained, False otherwise
+        """
+        try:
+            response = self._send(
+                'PATCH', self._url('/v1/tokens/access-token/refresh'),
+                json=self._refresh_token,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            logger.debug(f"Access token refresh failed: {e}")
+            return False
+
+        if not response.ok:
+            self._refresh_token = None
+            return False
+
+        body = response.json() if response.content else None
+        token = body.get('accessToken') if isinstance(body, dict) else body
+        if not token:
+            return False
+        self._access_token = token
+        self._token_expires = time.monotonic() + self.token_ttl
+        self.token_refreshes += 1
+        return True
+
+    def _store_tokens(self, body: Dict[str, Any]) -> None:
+        """Cache the token pair returned by a login call."""
+        self._access_token = body.get('accessToken')
+        refresh = body.get('refreshToken')
+        self._refresh_token = refresh.get('id') if isinstance(refresh, dict) else refresh
+        self._token_expires = time.monotonic() + self.token_ttl
+        if not self._access_token:
+            raise VCFAuthenticationError("SDDC Manager returned no access token")
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Perform an authenticated API call.
+
+        A 401 response triggers one transparent re-login and replay.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the endpoint, or an absolute URL
+            timeout: Per-call timeout in seconds, defaults to the client timeout
+            **kwargs: Extra arguments passed to ``requests.Session.request``
+
+        Returns:
+            HTTP response
+        """
+        url = self._url(path)
+        timeout = self.timeout if timeout is None else timeout
+
+        token = None
+        for attempt in range(2):
+            token = self.authenticate(force=attempt > 0, stale=token)
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers['Authorization'] = f"Bearer {token}"
+            try:
+                response = self._send(
+                    method, url, headers=headers, timeout=timeout, **kwargs
+                )
+            except requests.RequestException as e:
+                raise VCFClientError(f"{method} {url} failed: {e}") from e
+
+            if response.status_code != 401:
+                break
+            logger.debug(f"Access token rejected for {method} {url}, re-authenticating")
+            kwargs['headers'] = headers
+
+        if response.status_code >= 400:
+            raise VCFClientError(
+                f"{method} {url} failed with HTTP {response.status_code}",
+                response.status_code,
+            )
+        if self.cache is not None and method.upper() not in ('GET', 'HEAD'):
+            # Writes change the collection, so cached reads of it are stale
+            self.cache.invalidate(_collection(path))
+        return response
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None, use_cache: bool = True) -> Any:
+        """GET an API resource and return the decoded JSON body.
+
+        Fresh cached bodies are returned without contacting the server; stale
+        ones are revalidated with ``If-None-Match``/``If-Modified-Since``.
+        Cached bodies are shared between callers and must not be mutated.
+
+        Args:
+            path: API path
+            params: Optional query parameters
+            timeout: Optional per-call timeout in seconds
+            use_cache: Whether the response cache may serve this call
+
+        Returns:
+            Decoded JSON body
+        """
+        cache = self.cache if use_cache else None
+        if cache is None:
+            response = self.request('GET', path, params=params, timeout=timeout)
+            return response.json() if response.content else None
+
+        key = cache.make_key('/' + path.lstrip('/'), params)
+        entry, fresh = cache.lookup(key)
+        if entry is not None and fresh:
+            return entry.value
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = self.request('GET', path, params=params, timeout=timeout,
+                                headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(key)
+            return entry.value
+
+        value = response.json() if response.content else None
+        cache.put(
+            key, value, size=len(response.content),
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+        return value
+
+    def post(self, path: str, body: Any = None, timeout: Optional[float] = None) -> Any:
+        """POST a JSON body and return the decoded JSON response.
+
+        Args:
+            path: API path
+            body: JSON-serializable request body
+            timeout: Optional per-call timeout in seconds
+
+        Returns:
+            Decoded JSON body, or None for an empty response
+        """
+        response = self.request('POST', path, json=body, timeout=timeout)
+        return response.json() if response.content else None
+
+    def iter_elements(self, path: str, params: Optional[Dict[str, Any]] = None,
+                      page_size: int = 100,
+                      use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """Iterate over every element of a paginated collection.
+
+        Args:
+            path: Collection path, e.g. /v1/hosts
+            params: Optional query parameters
+            page_size: Number of elements requested per page
+            use_cache: Whether the response cache may serve the pages
+
+        Yields:
+            Collection elements
+        """
+        query = dict(params or {})
+        query['pageSize'] = page_size
+        page = 0
+        while True:
+            query['pageNumber'] = page
+            body = self.get(path, params=query, use_cache=use_cache)
+            if not isinstance(body, dict):
+                return
+            yield from body.get('elements') or []
+
+            metadata = body.get('pageMetadata') or {}
+            total_pages = metadata.get('totalPages', 1)
+            page += 1
+            if page >= total_pages:
+                return
+
+    def get_all(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Return every element of a paginated collection.
+
+        Args:
+            path: Collection path, e.g. /v1/hosts
+            params: Optional query parameters
+
+        Returns:
+            List of elements
+        """
+        return list(self.iter_elements(path, params=params))
+
+    def close(self) -> None:
+        """Close pooled connections and report the authentications made."""
+        if self.logins or self.token_refreshes:
+            cache = '' if self.token_cache is not None else ' (no token cache; every run logs in)'
+            logger.info(f"SDDC Manager {self.endpoint}: {self.logins} password logins, "
+                        f"{self.token_refreshes} token refreshes{cache}")
+            self.logins = self.token_refreshes = 0
+        self.session.close()
+        for gauge in (API_POOL_SATURATION, CACHE_HIT_RATIO, CACHE_ENTRIES):
+            gauge.remove(self.instance)
+
+    def __enter__(self) -> 'SDDCManagerClient':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _retry_after(response: requests.Response) -> float:
+    """Seconds requested by a numeric Retry-After header, or 0."""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After', 0)))
+    except ValueError:
+        return 0.0
+
+
+def _collection(path: str) -> str:
+    """Return the collection prefix of an API path, e.g. /v1/hosts."""
+    parts = urlparse(path).path.strip('/').split('/')
+    return '/' + '/'.join(parts[:2])
@@ -0,0 +1,466 @@
+"""
+Compliance rules evaluated against collected inventory.
+
+Rules are derived from domain specs (``config/vcf-config.template.yml``
+format): the cluster host minimum, the vSAN deduplication and compression
+settings, the NSX Manager cluster size and the required NSX transport
+zones of every domain. Inventory is reduced to compact tuples of the fields
+the rules read (one per cluster and per NSX cluster), split into shards and
+evaluated on a process pool, so large estates use every core instead of
+being held to one by the GIL. Estates that fit in one shard are evaluated
+in-process, where starting workers would cost more than it saves.
+
+Every rule kind declares the object type and fields it reads, and the
+``RuleIndex`` maps each (object type, domain, field) to the rules that
+depend on it. ``IncrementalCompliance`` keeps the last evaluated objects
+and findings; after an inventory refresh it re-evaluates only the rules
+indexed under fields that actually changed, so the cost of a recheck
+follows the size of the change rather than rules times objects.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPLIANT = 'compliant'
+NON_COMPLIANT = 'non_compliant'
+
+# Rule kinds
+CLUSTER_MIN_HOSTS = 'cluster_min_hosts'
+VSAN_DATA_SERVICES = 'vsan_data_services'
+NSX_MANAGERS = 'nsx_manager_cluster_size'
+NSX_TRANSPORT_ZONES = 'nsx_transport_zones'
+
+# Subjects evaluated per shard
+DEFAULT_SHARD_SIZE = 2000
+
+# Compact inputs shipped to worker processes:
+#   rule:    (id, kind, params)
+#   cluster: ('cluster', domain, name, hosts, deduplication, compression)
+#   nsx:     ('nsx', domain, name, managers, ((zone name, zone type), ...))
+RuleTuple = Tuple[str, str, Tuple[Any, ...]]
+Subject = Tuple[Any, ...]
+SubjectKey = Tuple[str, str, str]
+Shard = Tuple[Dict[Tuple[str, str], Tuple[RuleTuple, ...]], List[Subject]]
+FindingTuple = Tuple[str, str, str, str, str, str]
+
+# Subject kind -> field names of its tuple
+SUBJECT_FIELDS = {
+    'cluster': ('kind', 'domain', 'name', 'hosts', 'deduplication', 'compression'),
+    'nsx': ('kind', 'domain', 'name', 'managers', 'zones'),
+}
+
+# Rule kind -> (subject kind, subject fields the rule reads)
+DEPENDENCIES = {
+    CLUSTER_MIN_HOSTS: ('cluster', ('hosts',)),
+    VSAN_DATA_SERVICES: ('cluster', ('deduplication', 'compression')),
+    NSX_MANAGERS: ('nsx', ('managers',)),
+    NSX_TRANSPORT_ZONES: ('nsx', ('zones',)),
+}
+
+
+class Rule:
+    """A policy requirement for one domain."""
+
+    __slots__ = ('kind', 'domain', 'params')
+
+    def __init__(self, kind: str, domain: str, params: Tuple[Any, ...] = ()):
+        self.kind = kind
+        self.domain = domain
+        self.params = params
+
+    @property
+    def id(self) -> str:
+        """Rule identifier, e.g. ``cluster_min_hosts:mgmt01``."""
+        return f"{self.kind}:{self.domain}"
+
+    def as_tuple(self) -> RuleTuple:
+        """Return the compact form shipped to worker processes."""
+        return (self.id, self.kind, self.params)
+
+    def __repr__(self) -> str:
+        return f"Rule({self.id!r}, {self.params!r})"
+
+
+class Finding:
+    """Outcome of one rule for one cluster or NSX cluster."""
+
+    __slots__ = ('rule', 'kind', 'domain', 'target', 'status', 'message')
+
+    def __init__(self, rule: str, kind: str, domain: str, target: str, status: str,
+                 message: str = ''):
+        self.rule = rule
+        self.kind = kind
+        self.domain = domain
+        self.target = target
+        self.status = status
+        self.message = message
+
+    @property
+    def compliant(self) -> bool:
+        """Return True if the target satisfies the rule."""
+        return self.status == COMPLIANT
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the finding as a dictionary."""
+        return {
+            'rule': self.rule,
+            'kind': self.kind,
+            'domain': self.domain,
+            'target': self.target,
+            'status': self.status,
+            'message': self.message,
+        }
+
+
+def rules_from_spec(spec: Mapping[str, Any]) -> List[Rule]:
+    """Derive the compliance rules of every domain in a spec.
+
+    Args:
+        spec: Validated domain spec
+
+    Returns:
+        Rules in spec order
+    """
+    domains = [spec['management_domain']] if spec.get('management_domain') else []
+    domains.extend(spec.get('workload_domains') or [])
+    rules = []
+    for domain in domains:
+        name = domain['name']
+        clusters = domain.get('clusters') or ([domain['cluster']] if domain.get('cluster') else [])
+        hosts = [int(cluster.get('hosts', 0)) for cluster in clusters]
+        if hosts:
+            rules.append(Rule(CLUSTER_MIN_HOSTS, name, (min(hosts),)))
+        vsan = domain.get('vsan') or {}
+        if 'deduplication' in vsan or 'compression' in vsan:
+            rules.append(Rule(VSAN_DATA_SERVICES, name,
+                              (vsan.get('deduplication'), vsan.get('compression'))))
+        nsx = domain.get('nsx') or {}
+        if nsx.get('manager_cluster_size'):
+            rules.append(Rule(NSX_MANAGERS, name, (int(nsx['manager_cluster_size']),)))
+        zones = tuple(sorted((zone['name'], str(zone.get('type', '')).upper())
+                             for zone in nsx.get('transport_zones') or []))
+        if zones:
+            rules.append(Rule(NSX_TRANSPORT_ZONES, name, zones))
+    return rules
+
+
+class RuleIndex:
+    """Rules indexed by the object type, domain and fields they depend on."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        """Compile the index.
+
+        Args:
+            rules: Rules to index
+        """
+        self.rules = list(rules)
+        by_subject: Dict[Tuple[str, str], List[RuleTuple]] = {}
+        by_field: Dict[Tuple[str, str], Dict[int, List[RuleTuple]]] = {}
+        for rule in self.rules:
+            kind, fields = DEPENDENCIES[rule.kind]
+            key = (kind, rule.domain)
+            by_subject.setdefault(key, []).append(rule.as_tuple())
+            positions = by_field.setdefault(key, {})
+            for field in fields:
+                positions.setdefault(SUBJECT_FIELDS[kind].index(field), []).append(
+                    rule.as_tuple())
+        # (subject kind, domain) -> rules applying to such subjects
+        self.by_subject: Dict[Tuple[str, str], Tuple[RuleTuple, ...]] = {
+            key: tuple(dependents) for key, dependents in by_subject.items()}
+        # (subject kind, domain) -> field position -> rules reading that field
+        self.by_field: Dict[Tuple[str, str], Dict[int, Tuple[RuleTuple, ...]]] = {
+            key: {pos: tuple(dependents) for pos, dependents in positions.items()}
+            for key, positions in by_field.items()}
+
+    def rules_for(self, subject: Subject) -> Tuple[RuleTuple, ...]:
+        """Rules that apply to a subject."""
+        return self.by_subject.get((subject[0], subject[1]), ())
+
+    def affected(self, old: Subject, new: Subject) -> List[RuleTuple]:
+        """Rules reading a field that differs between two versions of a subject."""
+        positions = self.by_field.get((new[0], new[1]))
+        if not positions:
+            return []
+        rules: Dict[str, RuleTuple] = {}
+        for position, dependents in positions.items():
+            if old[position] != new[position]:
+                rules.update((rule[0], rule) for rule in dependents)
+        return list(rules.values())
+
+
+def subject_key(subject: Subject) -> SubjectKey:
+    """Identity of a subject across inventory refreshes."""
+    return (subject[0], subject[1], subject[2])
+
+
+def subjects(inventory: Mapping[str, Any]) -> Iterator[Subject]:
+    """Reduce inventory to the compact tuples the rules evaluate.
+
+    Clusters and NSX clusters are keyed by domain name; the vSAN settings of
+    a cluster come from its datastore in ``vsan_datastores``.
+    """
+    names = {d['id']: d.get('name') or d['id'] for d in inventory.get('domains') or []}
+    vsan = {}
+    for datastore in inventory.get('vsan_datastores') or []:
+        cluster_id = (datastore.get('cluster') or {}).get('id')
+        vsan[cluster_id] = (datastore.get('deduplication'), datastore.get('compression'))
+    for cluster in inventory.get('clusters') or []:
+        domain = names.get((cluster.get('domain') or {}).get('id'))
+        if domain is None:
+            continue
+        dedup, compression = vsan.get(cluster['id'], (None, None))
+        yield ('cluster', domain, cluster.get('name') or cluster['id'],
+               len(cluster.get('hosts') or []), dedup, compression)
+    for nsx in inventory.get('nsx_clusters') or []:
+        zones = tuple(sorted((zone.get('name'), str(zone.get('type', '')).upper())
+                             for zone in nsx.get('transportZones') or []))
+        for ref in nsx.get('domains') or []:
+            domain = names.get(ref.get('id'))
+            if domain is not None:
+                yield ('nsx', domain, nsx.get('vipFqdn') or nsx['id'],
+                       len(nsx.get('nodes') or []), zones)
+
+
+def _check(kind: str, params: Tuple[Any, ...], subject: Subject) -> Optional[Tuple[bool, str]]:
+    """Evaluate one rule against one subject, or None if it does not apply."""
+    if subject[0] == 'cluster':
+        _, _, _, hosts, dedup, compression = subject
+        if kind == CLUSTER_MIN_HOSTS:
+            return hosts >= params[0], f"{hosts} hosts, minimum {params[0]}"
+        if kind == VSAN_DATA_SERVICES:
+            if dedup is None and compression is None:
+                return False, 'No vSAN datastore reported'
+            want_dedup, want_compression = params
+            wrong = [name for name, want, have in (('deduplication', want_dedup, dedup),
+                                                   ('compression', want_compression, compression))
+                     if want is not None and bool(have) != want]
+            return not wrong, (f"{', '.join(wrong)} not as specified" if wrong
+                               else 'vSAN data services as specified')
+    elif subject[0] == 'nsx':
+        _, _, _, managers, zones = subject
+        if kind == NSX_MANAGERS:
+            return managers >= params[0], f"{managers} managers, minimum {params[0]}"
+        if kind == NSX_TRANSPORT_ZONES:
+            missing = sorted(set(params) - set(zones))
+            return not missing, (
+                'Missing transport zones: ' + ', '.join(f"{n} ({t})" for n, t in missing)
+                if missing else 'Transport zones present')
+    return None
+
+
+def evaluate(rules: Iterable[RuleTuple], subject: Subject) -> List[FindingTuple]:
+    """Evaluate rules against one subject."""
+    findings = []
+    for rule_id, kind, params in rules:
+        outcome = _check(kind, params, subject)
+        if outcome is not None:
+            passed, message = outcome
+            findings.append((rule_id, kind, subject[1], subject[2],
+                             COMPLIANT if passed else NON_COMPLIANT, message))
+    return findings
+
+
+def evaluate_shard(shard: Shard) -> List[FindingTuple]:
+    """Evaluate the indexed rules of a shard against its subjects.
+
+    Runs in worker processes, so inputs and outputs are plain tuples.
+    """
+    rules, items = shard
+    findings = []
+    for subject in items:
+        findings.extend(evaluate(rules.get((subject[0], subject[1]), ()), subject))
+    return findings
+
+
+def _undeployed(rules: Iterable[Rule], deployed: Iterable[str]) -> List[Finding]:
+    """Findings for rules of domains missing from the inventory."""
+    deployed = set(deployed)
+    return [Finding(rule.id, rule.kind, rule.domain, rule.domain, NON_COMPLIANT,
+                    'Domain not deployed')
+            for rule in rules if rule.domain not in deployed]
+
+
+def _domains(inventory: Mapping[str, Any]) -> List[str]:
+    return [d.get('name') or d['id'] for d in inventory.get('domains') or []]
+
+
+class ComplianceEngine:
+    """Evaluates compliance rules over inventory on a process pool."""
+
+    def __init__(self, rules: Iterable[Rule], processes: int = 0,
+                 shard_size: int = DEFAULT_SHARD_SIZE):
+        """Initialize the engine.
+
+        Args:
+            rules: Rules to evaluate
+            processes: Worker processes, 0 for one per CPU and 1 to stay in-process
+            shard_size: Subjects evaluated per work unit
+        """
+        self.index = RuleIndex(rules)
+        self.rules = self.index.rules
+        self.processes = int(processes) or os.cpu_count() or 1
+        self.shard_size = max(1, int(shard_size))
+
+    @classmethod
+    def from_config(cls, rules: Iterable[Rule], config: Dict[str, Any]) -> 'ComplianceEngine':
+        """Build an engine with the performance settings of the configuration."""
+        performance = config.get('performance') or {}
+        return cls(rules, processes=performance.get('compliance_processes', 0),
+                   shard_size=performance.get('compliance_shard_size', DEFAULT_SHARD_SIZE))
+
+    def shards(self, items: Sequence[Subject]) -> List[Shard]:
+        """Split subjects into shards carrying only the rules that apply to them."""
+        index = self.index.by_subject
+        shards = []
+        for start in range(0, len(items), self.shard_size):
+            chunk = items[start:start + self.shard_size]
+            keys = {(subject[0], subject[1]) for subject in chunk}
+            shards.append(({key: index[key] for key in keys if key in index}, chunk))
+        return shards
+
+    def evaluate(self, inventory: Mapping[str, Any]) -> List[Finding]:
+        """Evaluate every rule against the inventory.
+
+        Rules of domains missing from the inventory produce one
+        non-compliant finding each.
+
+        Args:
+            inventory: Inventory as returned by ``collect_inventory``
+
+        Returns:
+            Findings in inventory order
+        """
+        findings = self.evaluate_subjects(list(subjects(inventory)))
+        findings.extend(_undeployed(self.rules, _domains(inventory)))
+        return findings
+
+    def evaluate_subjects(self, items: Sequence[Subject]) -> List[Finding]:
+        """Evaluate the applicable rules against compact subjects, sharded."""
+        shards = self.shards(items)
+        if self.processes > 1 and len(shards) > 1:
+            workers = min(self.processes, len(shards))
+            logger.debug(f"Evaluating {len(items)} compliance subjects in {len(shards)} "
+                         f"shards on {workers} processes")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(evaluate_shard, shards))
+        else:
+            results = [evaluate_shard(shard) for shard in shards]
+
+        return [Finding(*finding) for result in results for finding in result]
+
+
+class IncrementalCompliance:
+    """Compliance findings kept current across inventory refreshes."""
+
+    def __init__(self, engine: ComplianceEngine):
+        """Initialize the state.
+
+        Args:
+            engine: Engine holding the rules; it runs the first, full
+                evaluation, later refreshes evaluate changed objects in-process
+        """
+        self.engine = engine
+        self.index = engine.index
+        self._subjects: Dict[SubjectKey, Subject] = {}
+        # (rule ID, target) -> finding for deployed objects
+        self._findings: Dict[Tuple[str, str], Finding] = {}
+        # Rule ID -> finding for rules of domains that are not deployed
+        self._undeployed: Dict[str, Finding] = {}
+        self.refreshes = 0
+
+    @property
+    def rules(self) -> List[Rule]:
+        """Indexed rules."""
+        return self.index.rules
+
+    @property
+    def findings(self) -> List[Finding]:
+        """Current findings."""
+        return list(self._findings.values()) + list(self._undeployed.values())
+
+    def _store(self, findings: Iterable[Finding]) -> List[Finding]:
+        """Record findings, returning those that are new or changed."""
+        changed = []
+        for finding in findings:
+            key = (finding.rule, finding.target)
+            previous = self._findings.get(key)
+            if previous is None or (previous.status, previous.message) != (
+                    finding.status, finding.message):
+                changed.append(finding)
+            self._findings[key] = finding
+        return changed
+
+    def refresh(self, inventory: Mapping[str, Any]) -> Dict[str, Any]:
+        """Bring the findings up to date with a newly collected inventory.
+
+        New objects are checked against every rule that applies to them,
+        changed objects only against the rules reading a changed field, and
+        the findings of removed objects are dropped. Unchanged objects cost
+        one tuple comparison.
+
+        Args:
+            inventory: Inventory as returned by ``collect_inventory``
+
+        Returns:
+            ``evaluated`` (rule evaluations performed), ``changed`` (new or
+            changed findings) and ``removed`` (number of dropped findings)
+        """
+        current = {subject_key(subject): subject for subject in subjects(inventory)}
+        if not self.refreshes:
+            findings = self.engine.evaluate_subjects(list(current.values()))
+            evaluated, changed = len(findings), self._store(findings)
+        else:
+            evaluated, changed = 0, []
+            for key, subject in current.items():
+                previous = self._subjects.get(key)
+                if previous is None:
+                    rules = self.index.rules_for(subject)
+                elif previous != subject:
+                    rules = self.index.affected(previous, subject)
+                else:
+                    continue
+                evaluated += len(rules)
+                changed.extend(self._store(Finding(*f) for f in evaluate(rules, subject)))
+
+        removed = 0
+        for key, subject in self._subjects.items():
+            if key not in current:
+                for rule_id, _, _ in self.index.rules_for(subject):
+                    if self._findings.pop((rule_id, subject[2]), None) is not None:
+                        removed += 1
+
+        undeployed = {f.rule: f for f in _undeployed(self.rules, _domains(inventory))}
+        removed += len(self._undeployed.keys() - undeployed.keys())
+        changed.extend(f for rule, f in undeployed.items() if rule not in self._undeployed)
+        self._undeployed = undeployed
+
+        self._subjects = current
+        self.refreshes += 1
+        logger.debug(f"Compliance refresh evaluated {evaluated} rules, "
+                     f"{len(changed)} findings changed, {removed} removed")
+        return {'evaluated': evaluated, 'changed': changed, 'removed': removed}
+
+
+def summarize_findings(findings: List[Finding], duration: float) -> Dict[str, Any]:
+    """Build the compliance report.
+
+    Args:
+        findings: Evaluated findings
+        duration: Evaluation time in seconds
+
+    Returns:
+        Report dictionary
+    """
+    counts: Dict[str, int] = {}
+    for finding in findings:
+        counts[finding.status] = counts.get(finding.status, 0) + 1
+    return {
+        'status': COMPLIANT if all(f.compliant for f in findings) else NON_COMPLIANT,
+        'duration': round(duration, 3),
+        'counts': counts,
+        'findings': [f.to_dict() for f in findings],
+    }
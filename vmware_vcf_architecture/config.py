@@ -0,0 +1,489 @@
+"""
+Layered, validated and cached configuration loading.
+
+Configuration is built from four layers, lowest priority first: built-in
+defaults, the YAML configuration file, environment variables and command
+line overrides. Layers are deep-merged, so a file's ``vcf:`` section only
+replaces the keys it actually sets. Parsed YAML documents are cached per
+path and reused until the file's mtime and content hash change, and the
+libyaml C loader is used when PyYAML was built with it.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS: Dict[str, Any] = {
+    'app': {
+        'name': 'vmware-vcf-architecture',
+        'version': '1.0.0',
+        'debug': False,
+    },
+    'logging': {
+        'level': 'INFO',
+        'format': 'text',
+    },
+    'vcf': {
+        'endpoint': '',
+        'username': '',
+        'password': '',
+        'verify_ssl': True,
+    },
+}
+
+# Environment variable -> (config path, converter)
+ENVIRONMENT = {
+    'DEBUG': (('app', 'debug'), 'bool'),
+    'LOG_LEVEL': (('logging', 'level'), 'str'),
+    'LOG_FORMAT': (('logging', 'format'), 'log_format'),
+    'VCF_ENDPOINT': (('vcf', 'endpoint'), 'str'),
+    'VCF_USERNAME': (('vcf', 'username'), 'str'),
+    'VCF_PASSWORD': (('vcf', 'password'), 'str'),
+    'VCF_VERIFY_SSL': (('vcf', 'verify_ssl'), 'bool'),
+    'ENABLE_METRICS': (('monitoring', 'enable_metrics'), 'bool'),
+    'METRICS_PORT': (('monitoring', 'metrics_port'), 'int'),
+}
+
+NUMBER = (int, float)
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+# Section -> key -> (accepted types, allowed values or minimum, or None)
+SCHEMA: Dict[str, Dict[str, Tuple[Any, Any]]] = {
+    'app': {
+        'name': (str, None),
+        'version': (str, None),
+        'debug': (bool, None),
+        'environment': (str, None),
+    },
+    'logging': {
+        'level': (str, LOG_LEVELS),
+        'format': (str, ('json', 'text')),
+        'file': (str, None),
+        'max_size': ((str, int), None),
+        'backup_count': (int, 0),
+    },
+    'vcf': {
+        'endpoint': (str, None),
+        'username': (str, None),
+        'password': (str, None),
+        'verify_ssl': (bool, None),
+        'timeout': (NUMBER, 0),
+        'retry_attempts': (int, 0),
+        'instances': (list, None),
+    },
+    'security': {
+        'enable_encryption': (bool, None),
+        'token_expiry': (NUMBER, 0),
+        'max_login_attempts': (int, 1),
+        'token_cache_file': (str, None),
+    },
+    'performance': {
+        'max_workers': (int, 1),
+        'batch_size': (int, 1),
+        'cache_ttl': (NUMBER, 0),
+        'cache_max_entries': (int, 1),
+        'cache_max_bytes': (int, 1),
+        'cache_ttls': (dict, None),
+        'task_poll_interval': (NUMBER, 0),
+        'task_poll_max_interval': (NUMBER, 0),
+        'rate_limit': (NUMBER, 0),
+        'rate_limit_burst': (NUMBER, 1),
+        'rate_limits': (dict, None),
+        'circuit_failure_threshold': (int, 0),
+        'circuit_reset_timeout': (NUMBER, 0),
+        'federation_timeout': (NUMBER, 0),
+        'compliance_processes': (int, 0),
+        'compliance_shard_size': (int, 1),
+    },
+    'monitoring': {
+        'enable_metrics': (bool, None),
+        'metrics_port': (int, 0),
+        'health_check_interval': (NUMBER, 0),
+        'change_feed': (bool, None),
+        'change_feed_interval': (NUMBER, 0),
+        'health_port': (int, 0),
+        'health_host': (str, None),
+    },
+    'validation': {
+        'check_timeout': (NUMBER, 0),
+        'deadline': (NUMBER, 0),
+        'min_nsx_managers': (int, 1),
+        'cert_expiry_warning_days': (NUMBER, 0),
+        'spec_files': (list, None),
+    },
+    'inventory': {
+        'snapshot_file': (str, None),
+    },
+    'capacity': {
+        'reserve_hosts': (int, 0),
+        'slack_space': (NUMBER, 0),
+    },
+}
+
+REQUIRED_SECTIONS = ('app', 'logging')
+
+# Domain spec (vcf-config.template.yml) cluster keys and their minimums
+CLUSTER_SCHEMA = {
+    'name': (str, None),
+    'hosts': (int, 1),
+    'cpu_cores': (int, 1),
+    'memory_gb': (NUMBER, 1),
+}
+
+_VARIABLE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+_cache: Dict[str, Tuple[int, int, str, Any]] = {}
+# Path -> (document, serialized env and override layers, config, errors)
+_compiled: Dict[str, Tuple[Any, str, Dict[str, Any], List[str]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _yaml_loader() -> Any:
+    """Return the fastest available safe YAML loader class."""
+    import yaml
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _parse_yaml(data: bytes) -> Any:
+    """Parse a YAML document."""
+    import yaml
+    return yaml.load(data, Loader=_yaml_loader())  # nosec B506 - safe loader
+
+
+def load_yaml(path: str) -> Any:
+    """Load a YAML file, reusing the parsed document while the file is unchanged.
+
+    The cache is keyed by path and validated by mtime and size; when those
+    change, the content hash decides whether the file has to be reparsed.
+    Callers must treat the returned document as read-only.
+
+    Args:
+        path: YAML file path
+
+    Returns:
+        Parsed document with ``${VAR}`` references expanded from the environment
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[3]
+
+    with open(key, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if cached is not None and cached[2] == digest:
+        document = cached[3]
+    else:
+        document = expand_variables(_parse_yaml(data))
+        logger.debug(f"Parsed YAML {path}")
+    with _cache_lock:
+        _cache[key] = (stat.st_mtime_ns, stat.st_size, digest, document)
+    return document
+
+
+def clear_cache() -> None:
+    """Forget every cached YAML document and compiled configuration."""
+    with _cache_lock:
+        _cache.clear()
+        _compiled.clear()
+        _validated_specs.clear()
+
+
+def expand_variables(value: Any) -> Any:
+    """Replace ``${VAR}`` references in strings with environment values.
+
+    References to unset variables are left untouched.
+    """
+    if isinstance(value, str):
+        if '${' not in value:
+            return value
+        return _VARIABLE.sub(lambda m: os.environ.get(m.group(1), m.group(0)), value)
+    if isinstance(value, dict):
+        return {k: expand_variables(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [expand_variables(v) for v in value]
+    return value
+
+
+def deep_merge(base: Mapping[str, Any], override: Mapping[str, Any]) -> Dict[str, Any]:
+    """Merge two mappings recursively without modifying either.
+
+    Nested mappings are merged key by key; any other value in ``override``
+    replaces the value in ``base``. The result shares no nested mappings or
+    lists with either input, so it can be changed freely.
+    """
+    merged = copy.deepcopy(dict(base))
+    _merge_into(merged, override)
+    return merged
+
+
+def _merge_into(target: Dict[str, Any], override: Mapping[str, Any]) -> None:
+    """Merge copies of the values of ``override`` into ``target`` in place."""
+    for key, value in override.items():
+        current = target.get(key)
+        if isinstance(current, dict) and isinstance(value, Mapping):
+            _merge_into(current, value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+def _convert(raw: str, kind: str) -> Any:
+    if kind == 'bool':
+        return raw.strip().lower() in ('1', 'true', 'yes', 'on')
+    if kind == 'int':
+        return int(raw)
+    if kind == 'log_format':
+        return 'json' if raw.strip().lower() == 'json' else 'text'
+    return raw
+
+
+def environment_layer(environ: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """Build the configuration layer for the environment variables that are set."""
+    environ = os.environ if environ is None else environ
+    layer: Dict[str, Any] = {}
+    for name, (path, kind) in ENVIRONMENT.items():
+        if name not in environ:
+            continue
+        try:
+            value = _convert(environ[name], kind)
+        except ValueError:
+            logger.warning(f"Ignoring invalid value for {name}: {environ[name]!r}")
+            continue
+        section = layer.setdefault(path[0], {})
+        section[path[1]] = value
+    return layer
+
+
+def load_config(config_file: Optional[str] = None,
+                overrides: Optional[Mapping[str, Any]] = None,
+                environ: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """Build the effective configuration.
+
+    Args:
+        config_file: YAML configuration file, skipped when missing
+        overrides: Command line layer, highest priority
+        environ: Environment to read, defaults to ``os.environ``
+
+    Returns:
+        Merged configuration dictionary, owned by the caller
+    """
+    return load_validated_config(config_file, overrides, environ)[0]
+
+
+def load_validated_config(config_file: Optional[str] = None,
+                          overrides: Optional[Mapping[str, Any]] = None,
+                          environ: Optional[Mapping[str, str]] = None
+                          ) -> Tuple[Dict[str, Any], List[str]]:
+    """Build the effective configuration and its validation errors.
+
+    The merged and validated result is compiled once per version of the
+    file, environment layer and overrides; later calls only copy it.
+
+    Args:
+        config_file: YAML configuration file, skipped when missing
+        overrides: Command line layer, highest priority
+        environ: Environment to read, defaults to ``os.environ``
+
+    Returns:
+        (merged configuration owned by the caller, schema errors)
+    """
+    document = None
+    if config_file and os.path.exists(config_file):
+        try:
+            document = load_yaml(config_file)
+            logger.info(f"Loaded configuration from {config_file}")
+        except Exception as e:
+            logger.warning(f"Failed to load config file {config_file}: {e}")
+    layers = json.dumps([environment_layer(environ), overrides or {}],
+                        sort_keys=True, default=str)
+    key = os.path.abspath(config_file) if config_file else ''
+    with _cache_lock:
+        compiled = _compiled.get(key)
+    if compiled is None or compiled[0] is not document or compiled[1] != layers:
+        config = copy.deepcopy(DEFAULTS)
+        if isinstance(document, Mapping):
+            _merge_into(config, document)
+        _merge_into(config, environment_layer(environ))
+        if overrides:
+            _merge_into(config, overrides)
+        compiled = (document, layers, config, validate(config))
+        with _cache_lock:
+            _compiled[key] = compiled
+    return copy.deepcopy(compiled[2]), list(compiled[3])
+
+
+def _check(value: Any, spec: Tuple[Any, Any], path: str, errors: List[str]) -> None:
+    """Check one value against a (types, constraint) schema entry."""
+    types, constraint = spec
+    if isinstance(value, bool) and bool not in (types if isinstance(types, tuple) else (types,)):
+        errors.append(f"{path}: expected {_type_name(types)}, got bool")
+        return
+    if not isinstance(value, types):
+        errors.append(f"{path}: expected {_type_name(types)}, got {type(value).__name__}")
+        return
+    if isinstance(constraint, tuple):
+        if value not in constraint and str(value).upper() not in constraint:
+            errors.append(f"{path}: must be one of {', '.join(constraint)}")
+    elif constraint is not None and value < constraint:
+        errors.append(f"{path}: must be at least {constraint}")
+
+
+def _type_name(types: Any) -> str:
+    if isinstance(types, tuple):
+        return ' or '.join(t.__name__ for t in types)
+    return types.__name__
+
+
+def validate(config: Mapping[str, Any],
+             required: Sequence[str] = REQUIRED_SECTIONS) -> List[str]:
+    """Validate a configuration against the schema.
+
+    Unknown sections and keys are allowed so deployments can carry extra
+    settings.
+
+    Returns:
+        List of error messages, empty when the configuration is valid
+    """
+    errors = [f"Missing required configuration key: {key}"
+              for key in required if key not in config]
+    for section, keys in SCHEMA.items():
+        values = config.get(section)
+        if values is None:
+            continue
+        if not isinstance(values, Mapping):
+            errors.append(f"{section}: expected mapping, got {type(values).__name__}")
+            continue
+        for key, spec in keys.items():
+            if key in values and values[key] is not None:
+                _check(values[key], spec, f"{section}.{key}", errors)
+    instances = (config.get('vcf') or {}).get('instances')
+    if isinstance(instances, list):
+        _validate_instances(instances, errors)
+    return errors
+
+
+def _validate_instances(instances: List[Any], errors: List[str]) -> None:
+    """Check each ``vcf.instances`` entry against the ``vcf`` schema."""
+    keys = dict(SCHEMA['vcf'], name=(str, None))
+    del keys['instances']
+    names = set()
+    for index, entry in enumerate(instances):
+        path = f"vcf.instances[{index}]"
+        if not isinstance(entry, Mapping):
+            errors.append(f"{path}: expected mapping, got {type(entry).__name__}")
+            continue
+        if not entry.get('endpoint'):
+            errors.append(f"{path}.endpoint: required")
+        name = entry.get('name')
+        if name in names:
+            errors.append(f"{path}.name: duplicate instance name {name}")
+        elif name:
+            names.add(name)
+        for key, spec in keys.items():
+            if key in entry and entry[key] is not None:
+                _check(entry[key], spec, f"{path}.{key}", errors)
+
+
+def spec_clusters(domain: Mapping[str, Any]) -> List[Mapping[str, Any]]:
+    """Return the clusters of a spec domain, from ``clusters`` or a single ``cluster``."""
+    clusters = domain.get('clusters')
+    if clusters is None:
+        clusters = [domain['cluster']] if domain.get('cluster') else []
+    return list(clusters)
+
+
+def validate_spec(spec: Mapping[str, Any]) -> List[str]:
+    """Validate a VCF domain spec such as ``config/vcf-config.template.yml``.
+
+    Each domain declares one ``cluster`` mapping or a ``clusters`` list of
+    them; the list takes precedence.
+
+    Returns:
+        List of error messages, empty when the spec is valid
+    """
+    errors: List[str] = []
+    domains = []
+    if 'management_domain' in spec:
+        domains.append(('management_domain', spec['management_domain']))
+    workload = spec.get('workload_domains') or []
+    if not isinstance(workload, list):
+        errors.append('workload_domains: expected list')
+        workload = []
+    domains.extend((f"workload_domains[{i}]", d) for i, d in enumerate(workload))
+
+    names = set()
+    for path, domain in domains:
+        if not isinstance(domain, Mapping):
+            errors.append(f"{path}: expected mapping")
+            continue
+        name = domain.get('name')
+        if not isinstance(name, str) or not name:
+            errors.append(f"{path}.name: required")
+        elif name in names:
+            errors.append(f"{path}.name: duplicate domain name {name}")
+        names.add(name)
+        if 'clusters' in domain:
+            clusters = domain['clusters']
+            if not isinstance(clusters, list) or not clusters:
+                errors.append(f"{path}.clusters: expected non-empty list")
+                clusters = []
+            entries = [(f"{path}.clusters[{i}]", c) for i, c in enumerate(clusters)]
+        else:
+            entries = [(f"{path}.cluster", domain.get('cluster'))]
+        cluster_names = set()
+        for cluster_path, cluster in entries:
+            if not isinstance(cluster, Mapping):
+                errors.append(f"{cluster_path}: required mapping")
+                continue
+            for key, entry in CLUSTER_SCHEMA.items():
+                if key not in cluster:
+                    errors.append(f"{cluster_path}.{key}: required")
+                else:
+                    _check(cluster[key], entry, f"{cluster_path}.{key}", errors)
+            if cluster.get('name') in cluster_names:
+                errors.append(f"{cluster_path}.name: duplicate cluster name {cluster['name']}")
+            cluster_names.add(cluster.get('name'))
+        networks = domain.get('networks')
+        if networks is not None and not isinstance(networks, Mapping):
+            errors.append(f"{path}.networks: expected mapping")
+    return errors
+
+
+# Path -> last spec document that passed validation
+_validated_specs: Dict[str, Any] = {}
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """Load and validate a VCF domain spec, validating each file version once.
+
+    Args:
+        path: Spec file path
+
+    Returns:
+        Parsed spec; callers must treat it as read-only
+
+    Raises:
+        ValueError: If the spec does not pass validation
+    """
+    document = load_yaml(path)
+    if not isinstance(document, dict):
+        raise ValueError(f"{path}: spec must be a mapping")
+    key = os.path.abspath(path)
+    with _cache_lock:
+        validated = _validated_specs.get(key) is document
+    if not validated:
+        errors = validate_spec(document)
+        if errors:
+            raise ValueError(f"Invalid VCF spec {path}: " + '; '.join(errors))
+        with _cache_lock:
+            _validated_specs[key] = document
+    return document
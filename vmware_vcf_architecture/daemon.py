@@ -0,0 +1,198 @@
+"""
+Long-running health daemon.
+
+A background thread refreshes the application health every
+``monitoring.health_check_interval`` seconds and stores the serialized
+result. The HTTP endpoint only copies those cached bytes to the socket, so
+probe latency is independent of VCF endpoint latency and probe storms never
+reach SDDC Manager. ``request_refresh`` brings the next refresh forward, so
+a change feed can publish new health as soon as the estate changes and the
+interval only bounds staleness when nothing happens.
+"""
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HealthFunc = Callable[[], Dict[str, Any]]
+
+STARTING_BODY = json.dumps({'status': 'starting'}).encode()
+
+
+class HealthDaemon:
+    """Background health refresher with a cached HTTP endpoint."""
+
+    def __init__(self, check: HealthFunc, interval: float = 30,
+                 host: str = '0.0.0.0', port: int = 8080,  # nosec B104
+                 refresh_timeout: Optional[float] = None):
+        """Initialize the daemon.
+
+        Args:
+            check: Callable returning the health status dictionary
+            interval: Seconds between background refreshes
+            host: Address the HTTP endpoint binds to
+            port: Port the HTTP endpoint listens on, 0 for an ephemeral port
+            refresh_timeout: Longest a single refresh may legitimately take,
+                e.g. the federation timeout while waiting on a slow site
+        """
+        self.check = check
+        self.interval = max(0.01, float(interval))
+        self.refresh_timeout = float(refresh_timeout or 0)
+        self.host = host
+        self.port = port
+        # (HTTP status, serialized body, monotonic refresh time), swapped atomically
+        self._cached: Tuple[int, bytes, float] = (503, STARTING_BODY, 0.0)
+        self._last: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: list = []
+
+    @property
+    def last_result(self) -> Optional[Dict[str, Any]]:
+        """Most recent health result, or None before the first refresh."""
+        return self._last
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address the HTTP endpoint is bound to."""
+        if self._server is None:
+            raise RuntimeError("Health daemon is not running")
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def refresh(self) -> Dict[str, Any]:
+        """Recompute health and publish it to the endpoint.
+
+        Returns:
+            Health status dictionary
+        """
+        try:
+            result = self.check()
+        except Exception as e:
+            logger.exception(f"Health refresh failed: {e}")
+            result = {'status': 'unhealthy', 'error': str(e)}
+        status = 200 if result.get('status') == 'healthy' else 503
+        body = json.dumps(result, default=str).encode()
+        self._last = result
+        self._cached = (status, body, time.monotonic())
+        return result
+
+    @property
+    def stale_after(self) -> float:
+        """Seconds after the last refresh at which the refresher counts as stuck.
+
+        The next refresh starts one interval after the last one finished and
+        may take up to ``refresh_timeout``, so a slow site alone never makes
+        the daemon look dead.
+        """
+        return self.interval + max(2 * self.interval, self.refresh_timeout) + 5
+
+    def is_live(self) -> bool:
+        """Return True while the refresher keeps results reasonably fresh."""
+        refreshed = self._cached[2]
+        if not refreshed:
+            return not self._stop.is_set()
+        return time.monotonic() - refreshed < self.stale_after
+
+    def request_refresh(self, *args: Any) -> None:
+        """Refresh health now instead of at the end of the interval.
+
+        Accepts and ignores arguments so it can be subscribed to callbacks
+        directly. Requests arriving during a refresh cause one more refresh.
+        """
+        self._wakeup.set()
+
+    def _refresh_loop(self) -> None:
+        """Refresh health until stopped."""
+        self.refresh()
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                return
+            self.refresh()
+
+    def start(self) -> 'HealthDaemon':
+        """Start the refresher and the HTTP endpoint."""
+        self._stop.clear()
+        self._wakeup.clear()
+        self._server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._threads = [
+            threading.Thread(target=self._refresh_loop, name='vcf-health-refresh', daemon=True),
+            threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.5},
+                             name='vcf-health-http', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        host, port = self.address
+        logger.info(f"Health daemon listening on {host}:{port}, refresh every {self.interval}s")
+        return self
+
+    def stop(self) -> None:
+        """Stop the refresher and the HTTP endpoint."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=self.interval + 1)
+        self._threads = []
+
+    def serve_forever(self) -> None:
+        """Run until stop() is called or the process is interrupted."""
+        if self._server is None:
+            self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            logger.info("Health daemon interrupted")
+        finally:
+            self.stop()
+
+    def __enter__(self) -> 'HealthDaemon':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def _make_handler(daemon: HealthDaemon) -> type:
+    """Build a request handler class bound to a daemon instance."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            path = self.path.split('?', 1)[0].rstrip('/')
+            if path == '/health':
+                status, body, _ = daemon._cached
+                self._send(status, body)
+            elif path == '/health/live':
+                live = daemon.is_live()
+                self._send(200 if live else 503,
+                           b'{"status": "alive"}' if live else b'{"status": "stale"}')
+            else:
+                self._send(404, b'{"error": "not found"}')
+
+    return Handler
@@ -0,0 +1,285 @@
+"""
+Change feed built on the SDDC Manager task stream.
+
+Every change SDDC Manager makes to the estate (commissioning hosts,
+expanding clusters, deploying domains) runs as a task that names the
+resources it touched. Instead of re-reading every collection on a fixed
+interval, ``ChangeFeed`` reads the task list once per round and picks up
+the tasks that finished after its cursor, the completion time of the last
+task it delivered. For each delivered task it drops the cached responses
+of the touched resources, so the next read fetches exactly those objects
+again, and notifies subscribers such as the health daemon.
+
+Only the first round reads the whole task history; later rounds stop
+paging at the first page of tasks created before the oldest task that was
+still running, so a quiet estate costs one page per round.
+
+The first round only positions the cursor: what finished before the feed
+started is already reflected in the next read. A round that fails keeps the
+cursor, so tasks finishing during an outage are delivered once the API
+answers again.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .client import SDDCManagerClient, VCFClientError
+from .tasks import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Collections whose cached responses a change to a resource type makes stale.
+# The touched resource itself is dropped from the first collection; the
+# others only lose their listings, which embed or count the resource.
+RESOURCE_COLLECTIONS: Dict[str, Tuple[str, ...]] = {
+    'HOST': ('/v1/hosts', '/v1/clusters', '/v1/domains'),
+    'ESXI': ('/v1/hosts', '/v1/clusters', '/v1/domains'),
+    'CLUSTER': ('/v1/clusters', '/v1/hosts', '/v1/domains'),
+    'DOMAIN': ('/v1/domains', '/v1/clusters', '/v1/hosts', '/v1/vcenters',
+               '/v1/nsxt-clusters'),
+    'VCENTER': ('/v1/vcenters',),
+    'NSXT_MANAGER': ('/v1/nsxt-clusters',),
+    'NSXT_CLUSTER': ('/v1/nsxt-clusters',),
+    'SDDC_MANAGER': ('/v1/sddc-managers',),
+}
+
+# Collections dropped for tasks that name no resource of a known type
+ALL_COLLECTIONS = ('/v1/domains', '/v1/clusters', '/v1/hosts', '/v1/vcenters',
+                   '/v1/nsxt-clusters')
+
+# Tasks requested per page of the task listing
+TASK_PAGE_SIZE = 100
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    """Parse an SDDC Manager ISO 8601 timestamp, or return None."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _finished(task: Dict[str, Any]) -> bool:
+    """Return True if a task reached a terminal status."""
+    return str(task.get('status', '')).upper() in TERMINAL_STATUSES
+
+
+def _completed_at(task: Dict[str, Any]) -> Optional[datetime]:
+    """Completion time of a finished task, or None."""
+    return _timestamp(task.get('completionTimestamp')) if _finished(task) else None
+
+
+class Change:
+    """A finished task and the resources it touched."""
+
+    __slots__ = ('task_id', 'name', 'status', 'completed_at', 'resources')
+
+    def __init__(self, task_id: str, name: str, status: str, completed_at: datetime,
+                 resources: List[Tuple[str, Optional[str]]]):
+        self.task_id = task_id
+        self.name = name
+        self.status = status
+        self.completed_at = completed_at
+        self.resources = resources
+
+    @classmethod
+    def from_task(cls, task: Dict[str, Any], completed_at: datetime) -> 'Change':
+        """Build a change from an SDDC Manager task body."""
+        resources = [
+            (str(resource.get('type', '')).upper(), resource.get('resourceId'))
+            for resource in task.get('resources') or [] if isinstance(resource, dict)
+        ]
+        return cls(task['id'], task.get('name', ''), str(task.get('status', '')).upper(),
+                   completed_at, resources)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the change."""
+        return {
+            'task_id': self.task_id,
+            'name': self.name,
+            'status': self.status,
+            'completed_at': self.completed_at.isoformat(),
+            'resources': [{'type': kind, 'id': rid} for kind, rid in self.resources],
+        }
+
+
+Subscriber = Callable[[List[Change]], None]
+
+
+class ChangeFeed:
+    """Cursor over finished SDDC Manager tasks that invalidates cached reads."""
+
+    def __init__(self, client: SDDCManagerClient, interval: float = 30.0):
+        """Initialize the feed.
+
+        Args:
+            client: Pooled SDDC Manager client whose cache is invalidated
+            interval: Seconds between rounds of the background thread
+        """
+        self.client = client
+        self.interval = max(0.01, float(interval))
+        self._cursor: Optional[datetime] = None
+        # Tasks delivered with the cursor's timestamp, to tell apart ties
+        self._at_cursor: Set[str] = set()
+        # Every task created before this was finished when last read
+        self._horizon: Optional[datetime] = None
+        self._primed = False
+        self._subscribers: List[Subscriber] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, client: SDDCManagerClient, config: Dict[str, Any]) -> 'ChangeFeed':
+        """Create a feed from the ``monitoring`` configuration section."""
+        monitoring = config.get('monitoring') or {}
+        return cls(client, interval=monitoring.get('change_feed_interval', 30.0))
+
+    @property
+    def cursor(self) -> Optional[str]:
+        """Completion time of the last delivered task, ISO 8601."""
+        return self._cursor.isoformat() if self._cursor is not None else None
+
+    def subscribe(self, callback: Subscriber) -> None:
+        """Call a function with every non-empty batch of changes.
+
+        Callbacks run on the feed's thread after the cache was invalidated.
+        """
+        self._subscribers.append(callback)
+
+    def poll(self) -> List[Change]:
+        """Run one round: read new task completions and apply them.
+
+        Returns:
+            Changes delivered in this round, oldest first
+        """
+        try:
+            tasks = self._read_tasks()
+        except VCFClientError as e:
+            logger.warning(f"Change feed round failed, keeping cursor {self.cursor}: {e}")
+            return []
+
+        finished = []
+        for task in tasks:
+            completed_at = _completed_at(task)
+            if completed_at is None or 'id' not in task:
+                continue
+            if self._cursor is not None and (
+                    completed_at < self._cursor
+                    or (completed_at == self._cursor and task['id'] in self._at_cursor)):
+                continue
+            finished.append(Change.from_task(task, completed_at))
+        finished.sort(key=lambda change: change.completed_at)
+
+        if finished:
+            newest = finished[-1].completed_at
+            if newest != self._cursor:
+                self._at_cursor = set()
+            self._cursor = newest
+            self._at_cursor.update(c.task_id for c in finished if c.completed_at == newest)
+        if not self._primed:
+            self._primed = True
+            logger.info(f"Change feed positioned at {self.cursor}")
+            return []
+
+        for change in finished:
+            self._invalidate(change)
+        if finished:
+            logger.info(f"Change feed delivered {len(finished)} finished tasks, "
+                        f"cursor {self.cursor}")
+            for callback in self._subscribers:
+                try:
+                    callback(finished)
+                except Exception as e:
+                    logger.exception(f"Change feed subscriber failed: {e}")
+        return finished
+
+    def _read_tasks(self) -> List[Dict[str, Any]]:
+        """Read the task listing down to the horizon.
+
+        Paging stops after a page that is ordered newest first and ends with
+        a task created before the horizon: that task and every older one had
+        already finished when the previous round read them.
+        """
+        pages = self.client.iter_elements('/v1/tasks', page_size=TASK_PAGE_SIZE,
+                                          use_cache=False)
+        tasks: List[Dict[str, Any]] = []
+        while True:
+            page = list(islice(pages, TASK_PAGE_SIZE))
+            tasks.extend(page)
+            if len(page) < TASK_PAGE_SIZE:
+                break
+            first = _timestamp(page[0].get('creationTimestamp'))
+            last = _timestamp(page[-1].get('creationTimestamp'))
+            if (self._horizon is not None and first is not None and last is not None
+                    and first >= last and last < self._horizon):
+                pages.close()
+                break
+
+        created = [_timestamp(task.get('creationTimestamp')) for task in tasks]
+        running = [stamp for task, stamp in zip(tasks, created)
+                   if stamp is not None and not _finished(task)]
+        known = [stamp for stamp in created if stamp is not None]
+        if running:
+            self._horizon = min(running)
+        elif known:
+            self._horizon = max(known)
+        return tasks
+
+    def _invalidate(self, change: Change) -> int:
+        """Drop the cached responses a change made stale."""
+        cache = self.client.cache
+        if cache is None:
+            return 0
+        known = [(kind, rid) for kind, rid in change.resources if kind in RESOURCE_COLLECTIONS]
+        removed = 0
+        if not known:
+            for collection in ALL_COLLECTIONS:
+                removed += cache.invalidate_path(collection)
+        for kind, resource_id in known:
+            collection, *related = RESOURCE_COLLECTIONS[kind]
+            if resource_id:
+                removed += cache.invalidate_path(collection, subpaths=False)
+                removed += cache.invalidate_path(f"{collection}/{resource_id}")
+            else:
+                removed += cache.invalidate_path(collection)
+            for path in related:
+                removed += cache.invalidate_path(path, subpaths=False)
+        logger.debug(f"Task {change.task_id} ({change.name}) invalidated {removed} "
+                     f"cached responses")
+        return removed
+
+    def _run(self) -> None:
+        """Poll until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.exception(f"Change feed round failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> 'ChangeFeed':
+        """Start the feed thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='vcf-change-feed',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the feed thread; the cursor is kept for a restart."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=self.interval + 5)
+
+    def __enter__(self) -> 'ChangeFeed':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
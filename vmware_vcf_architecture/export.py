@@ -0,0 +1,225 @@
+"""
+Streaming export of inventory and reports.
+
+Records are produced by generators and written one at a time (Parquet: one
+row group per batch), so peak memory stays flat no matter how large the
+estate is. Inventory is read page by page straight from SDDC Manager
+instead of being collected into one dictionary first.
+
+NDJSON keeps every record complete. CSV and Parquet are tabular: nested
+objects are flattened to dotted columns (``domain.id``), and only the
+columns listed for the dataset are written. Parquet requires the optional
+``pyarrow`` dependency (``pip install .[export]``).
+"""
+
+import csv
+import json
+import logging
+import sys
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .automation import BatchExecutor
+from .client import SDDCManagerClient, VCFClientError
+from .inventory import COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('ndjson', 'csv', 'parquet')
+
+# Dataset -> tabular columns as (name, Parquet type)
+FIELDS: Dict[str, List[Tuple[str, str]]] = {
+    'inventory': [
+        ('section', 'string'), ('id', 'string'), ('name', 'string'), ('fqdn', 'string'),
+        ('status', 'string'), ('type', 'string'), ('version', 'string'),
+        ('domain.id', 'string'), ('cluster.id', 'string'),
+    ],
+    'validation': [
+        ('name', 'string'), ('status', 'string'), ('message', 'string'),
+        ('duration', 'double'),
+    ],
+    'compliance': [
+        ('rule', 'string'), ('kind', 'string'), ('domain', 'string'), ('target', 'string'),
+        ('status', 'string'), ('message', 'string'),
+    ],
+}
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_SIZE = 1000
+
+
+def iter_inventory(client: SDDCManagerClient, executor: Optional[BatchExecutor] = None,
+                   errors: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream inventory records section by section.
+
+    Collections are paged with ``iter_elements`` and bypass the response
+    cache. vSAN datastores are read per cluster on the batch executor in a
+    second pass over the cluster listing. Collections that fail are
+    recorded in ``errors`` and skipped.
+
+    Args:
+        client: Pooled SDDC Manager client
+        executor: Executor for the per-cluster datastore reads
+        errors: Optional dictionary receiving failures by section
+
+    Yields:
+        Inventory objects with a ``section`` key
+    """
+    errors = {} if errors is None else errors
+    for section, path in COLLECTIONS.items():
+        try:
+            for element in client.iter_elements(path, use_cache=False):
+                yield dict(element, section=section)
+        except VCFClientError as e:
+            logger.warning(f"Export of {section} failed: {e}")
+            errors[section] = str(e)
+
+    def vsan_clusters() -> Iterator[Dict[str, Any]]:
+        try:
+            for cluster in client.iter_elements('/v1/clusters', use_cache=False):
+                if cluster.get('primaryDatastoreType', 'VSAN') == 'VSAN':
+                    yield cluster
+        except VCFClientError as e:
+            errors['vsan_datastores'] = str(e)
+
+    executor = executor or BatchExecutor()
+    with executor:
+        for item in executor.map_items(
+            lambda cluster: client.get(f"/v1/clusters/{cluster['id']}/datastores",
+                                       use_cache=False),
+            vsan_clusters(),
+        ):
+            if not item.ok:
+                errors[f"vsan:{item.item['id']}"] = str(item.error)
+                continue
+            body = item.value
+            listing = body.get('elements') if isinstance(body, dict) else body
+            for datastore in listing or []:
+                if datastore.get('type', 'VSAN') == 'VSAN':
+                    yield dict(datastore, section='vsan_datastores')
+
+
+def flatten(record: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Flatten nested objects to dotted keys; lists are JSON-encoded."""
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (list, tuple)):
+            flat[name] = json.dumps(value, sort_keys=True)
+        else:
+            flat[name] = value
+    return flat
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], stream: IO[str]) -> int:
+    """Write one JSON document per line.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, default=str))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+def write_csv(records: Iterable[Dict[str, Any]], stream: IO[str],
+              fields: List[str]) -> int:
+    """Write flattened records as CSV with a fixed header.
+
+    Returns:
+        Number of records written
+    """
+    writer = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(flatten(record))
+        count += 1
+    return count
+
+
+def write_parquet(records: Iterable[Dict[str, Any]], path: str,
+                  fields: List[Tuple[str, str]],
+                  batch_size: Optional[int] = None) -> int:
+    """Write flattened records to a Parquet file, one row group per batch.
+
+    Returns:
+        Number of records written
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError("Parquet export requires pyarrow: pip install .[export]") from e
+
+    batch_size = batch_size or PARQUET_BATCH_SIZE
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in fields])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch: List[Dict[str, Any]] = []
+        for record in records:
+            flat = flatten(record)
+            batch.append({name: _cell(flat.get(name), kind) for name, kind in fields})
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+def _cell(value: Any, kind: str) -> Any:
+    """Coerce a value to the column's Parquet type."""
+    if value is None:
+        return None
+    if kind == 'string':
+        return value if isinstance(value, str) else json.dumps(value)
+    return value
+
+
+def export(records: Iterable[Dict[str, Any]], fmt: str, output: str,
+           fields: List[Tuple[str, str]], stdout: Optional[IO[str]] = None) -> int:
+    """Stream records to a file or standard output.
+
+    Args:
+        records: Records to write
+        fmt: One of ``FORMATS``
+        output: File path, or ``-`` for standard output
+        fields: Tabular columns for CSV and Parquet
+        stdout: Stream used for ``-``, defaults to ``sys.stdout``
+
+    Returns:
+        Number of records written
+
+    Raises:
+        ValueError: If the format is unknown or Parquet is written to stdout
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'parquet':
+        if output == '-':
+            raise ValueError("Parquet export needs an output file")
+        return write_parquet(records, output, fields)
+
+    def write(stream: IO[str]) -> int:
+        if fmt == 'csv':
+            return write_csv(records, stream, [name for name, _ in fields])
+        return write_ndjson(records, stream)
+
+    if output == '-':
+        stream = stdout or sys.stdout
+        try:
+            return write(stream)
+        finally:
+            stream.flush()
+    with open(output, 'w', newline='' if fmt == 'csv' else None) as f:
+        return write(f)
@@ -0,0 +1,278 @@
+"""
+Federation of several SDDC Managers.
+
+Sites are listed under ``vcf.instances``; every entry is merged over the
+rest of the ``vcf`` section, so shared settings such as ``verify_ssl`` or
+``timeout`` are written once and each site only sets its endpoint and
+credentials. Every site gets its own client, connection pool, rate limiter
+and circuit breaker.
+
+Fleet-wide operations run on one thread per site and merge the results,
+so fleet latency is that of the slowest site rather than the sum of all of
+them. A site that fails or misses ``performance.federation_timeout`` is
+reported on its own without holding up the others.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+from .client import SDDCManagerClient
+from .config import deep_merge
+from .inventory import InventoryCollector
+from .profiling import in_context
+from .validation import ERROR, TIMEOUT, CheckResult, build_deployment_checks
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def instance_configs(config: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Expand ``vcf.instances`` into one application configuration per site.
+
+    Args:
+        config: Full application configuration dictionary
+
+    Returns:
+        (site name, configuration) pairs in configuration order; empty when
+        no instances are configured. Sites without a ``name`` are named
+        after their endpoint's host and port.
+
+    Raises:
+        ValueError: If two sites share a name
+    """
+    vcf = config.get('vcf') or {}
+    shared = {key: value for key, value in vcf.items() if key != 'instances'}
+    sites: List[Tuple[str, Dict[str, Any]]] = []
+    names = set()
+    for index, entry in enumerate(vcf.get('instances') or []):
+        site = deep_merge(shared, entry)
+        name = site.pop('name', None) or urlparse(site.get('endpoint', '')).netloc
+        name = name or f"instance-{index}"
+        if name in names:
+            raise ValueError(f"Duplicate VCF instance name: {name}")
+        names.add(name)
+        sites.append((name, dict(config, vcf=site)))
+    return sites
+
+
+class SiteResult:
+    """Outcome of an operation on one site."""
+
+    __slots__ = ('name', 'value', 'error', 'duration')
+
+    def __init__(self, name: str, value: Any = None, error: Optional[BaseException] = None,
+                 duration: float = 0.0):
+        self.name = name
+        self.value = value
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        """True if the operation completed without error."""
+        return self.error is None
+
+
+class Federation:
+    """Concurrent operations across several SDDC Managers."""
+
+    def __init__(self, sites: List[Tuple[str, Dict[str, Any]]],
+                 timeout: Optional[float] = None):
+        """Initialize the federation.
+
+        Args:
+            sites: (site name, application configuration) pairs
+            timeout: Seconds a fleet-wide operation waits for the slowest
+                site, or None to wait for every site
+        """
+        self.sites = dict(sites)
+        self.timeout = timeout or None
+        self._clients: Dict[str, SDDCManagerClient] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'Federation':
+        """Build the federation from ``vcf.instances``."""
+        performance = config.get('performance') or {}
+        return cls(instance_configs(config), timeout=performance.get('federation_timeout'))
+
+    @property
+    def names(self) -> List[str]:
+        """Site names in configuration order."""
+        return list(self.sites)
+
+    def client(self, name: str) -> SDDCManagerClient:
+        """Return the pooled client of a site, created on first use."""
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                client = SDDCManagerClient.from_config(self.sites[name])
+                self._clients[name] = client
+            return client
+
+    def fan_out(self, func: Callable[[str, SDDCManagerClient], T],
+                timeout: Optional[float] = None) -> Dict[str, SiteResult]:
+        """Run an operation on every site concurrently.
+
+        Args:
+            func: Callable taking the site name and client
+            timeout: Overrides the federation timeout
+
+        Returns:
+            Result per site in configuration order; sites that did not
+            finish in time carry a ``TimeoutError``
+        """
+        timeout = timeout or self.timeout
+
+        def call(name: str) -> SiteResult:
+            start = time.perf_counter()
+            try:
+                value = func(name, self.client(name))
+                return SiteResult(name, value, duration=time.perf_counter() - start)
+            except Exception as e:
+                logger.warning(f"VCF instance {name} failed: {e}")
+                return SiteResult(name, error=e, duration=time.perf_counter() - start)
+
+        if not self.sites:
+            return {}
+        executor = ThreadPoolExecutor(max_workers=len(self.sites),
+                                      thread_name_prefix='vcf-federation')
+        try:
+            futures = {name: executor.submit(in_context(call), name) for name in self.sites}
+            wait(futures.values(), timeout=timeout)
+        finally:
+            # Stragglers finish in the background, bounded by their request timeouts
+            executor.shutdown(wait=False)
+        results = {}
+        for name, future in futures.items():
+            if future.done():
+                results[name] = future.result()
+            else:
+                logger.warning(f"VCF instance {name} did not respond within {timeout}s")
+                results[name] = SiteResult(
+                    name, error=TimeoutError(f"No response within {timeout}s"),
+                    duration=timeout or 0.0)
+        return results
+
+    def health(self) -> Dict[str, Any]:
+        """Probe every SDDC Manager concurrently.
+
+        Returns:
+            ``status`` (healthy only if every site responded), the wall
+            time in ``duration_ms`` and one entry per site under ``instances``
+        """
+        start = time.perf_counter()
+        results = self.fan_out(
+            lambda name, client: client.get('/v1/sddc-managers', use_cache=False))
+        instances = {}
+        for name, result in results.items():
+            entry: Dict[str, Any] = {
+                'status': 'healthy' if result.ok else 'unhealthy',
+                'latency_ms': round(result.duration * 1000, 3),
+            }
+            if not result.ok:
+                entry['error'] = str(result.error)
+            client = self._clients.get(name)
+            if client is not None:
+                entry['targets'] = client.guards.state()
+            instances[name] = entry
+        return {
+            'status': 'healthy' if all(r.ok for r in results.values()) else 'unhealthy',
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            'instances': instances,
+        }
+
+    def collect_inventory(self) -> Dict[str, Any]:
+        """Collect every site's inventory concurrently and merge it.
+
+        Objects keep their SDDC Manager fields and gain an ``instance`` key.
+        Collection errors are prefixed with the site name; a site that
+        failed entirely is reported under its name.
+
+        Returns:
+            Inventory dictionary in the single-site layout plus ``instances``
+            (object counts per site)
+        """
+        def collect(name: str, client: SDDCManagerClient) -> Dict[str, Any]:
+            max_workers = (self.sites[name].get('performance') or {}).get('max_workers', 4)
+            return asyncio.run(InventoryCollector(client, max_workers).collect())
+
+        merged: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        instances: Dict[str, Dict[str, int]] = {}
+        for name, result in self.fan_out(collect).items():
+            if not result.ok:
+                errors[name] = str(result.error)
+                continue
+            counts = {}
+            for section, value in result.value.items():
+                if isinstance(value, list):
+                    merged.setdefault(section, []).extend(
+                        dict(item, instance=name) for item in value)
+                    counts[section] = len(value)
+            instances[name] = counts
+            errors.update({f"{name}:{key}": error
+                           for key, error in result.value['errors'].items()})
+        merged['collected_at'] = datetime.now(timezone.utc).isoformat()
+        merged['errors'] = errors
+        merged['instances'] = instances
+        logger.info(f"Collected inventory from {len(instances)}/{len(self.sites)} instances")
+        return merged
+
+    def iter_validation(self) -> Iterator[CheckResult]:
+        """Validate every site concurrently, yielding results as they finish.
+
+        Check names are prefixed with the site (``site-a/vcenter``). A site
+        whose checks cannot be run yields one ``error`` result, and sites
+        still running at the federation timeout yield one ``timeout`` result.
+
+        Yields:
+            Check results in completion order
+        """
+        results: 'queue.Queue[Tuple[str, Optional[CheckResult]]]' = queue.Queue()
+
+        def validate(name: str) -> None:
+            try:
+                engine = build_deployment_checks(self.client(name), self.sites[name])
+                for result in engine.run():
+                    result.name = f"{name}/{result.name}"
+                    results.put((name, result))
+            except Exception as e:
+                logger.warning(f"Validation of VCF instance {name} failed: {e}")
+                results.put((name, CheckResult(name, ERROR, str(e))))
+            finally:
+                results.put((name, None))
+
+        running = set(self.sites)
+        for name in self.sites:
+            threading.Thread(target=in_context(validate), args=(name,), daemon=True,
+                             name=f"vcf-federation-{name}").start()
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        while running:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                name, result = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if result is None:
+                running.discard(name)
+            else:
+                yield result
+        for name in sorted(running):
+            yield CheckResult(name, TIMEOUT, f"No result within {self.timeout}s",
+                              self.timeout or 0.0)
+
+    def close(self) -> None:
+        """Release every site's pooled connections."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
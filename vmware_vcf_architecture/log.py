@@ -0,0 +1,196 @@
+"""
+Logging pipeline.
+
+Application threads only put records on an in-memory queue; a single
+``QueueListener`` thread formats them and writes to the console and a
+size-rotated log file. Log I/O therefore never blocks API worker threads on
+the handler lock. Records are formatted as JSON lines or plain text
+according to ``logging.format``.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional
+
+DEFAULT_FILE = 'vmware-vcf-architecture.log'
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?I?B?)?\s*$', re.IGNORECASE)
+_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime',
+}
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener's handlers.
+
+    The stock handler renders the message and traceback into ``msg`` with a
+    plain formatter, which would flatten JSON output. This keeps the merged
+    message and the traceback text as separate, picklable fields instead.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_size(value: Any) -> int:
+    """Convert a size such as ``10MB`` or ``512K`` to bytes.
+
+    Args:
+        value: Size in bytes or as a string with an optional K/M/G unit
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If the size cannot be parsed
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    match = _SIZE.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid size: {value!r}")
+    number, unit = match.groups()
+    return int(float(number) * _UNITS[(unit or '')[:1].upper()])
+
+
+def build_handlers(settings: Mapping[str, Any]) -> List[logging.Handler]:
+    """Create the console and rotating file handlers described by settings.
+
+    Args:
+        settings: The ``logging`` configuration section
+
+    Returns:
+        Handlers to attach to the queue listener
+    """
+    formatter: logging.Formatter
+    if str(settings.get('format', 'text')).lower() == 'json':
+        formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    # Standard output carries command results such as exports and reports
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stderr)]
+    filename = settings.get('file', DEFAULT_FILE)
+    if filename:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            filename,
+            maxBytes=parse_size(settings.get('max_size', DEFAULT_MAX_SIZE)),
+            backupCount=int(settings.get('backup_count', DEFAULT_BACKUP_COUNT)),
+            delay=True,
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(settings: Optional[Mapping[str, Any]] = None, force: bool = False) -> bool:
+    """Route root logger records through the queue listener.
+
+    Like ``logging.basicConfig``, nothing is done if the root logger already
+    has handlers installed elsewhere, unless ``force`` is set. Without
+    settings an existing pipeline is kept; with settings it is replaced.
+
+    Args:
+        settings: Optional ``logging`` configuration section
+        force: Remove handlers installed elsewhere from the root logger
+
+    Returns:
+        True if the pipeline was (re)configured
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger()
+    with _lock:
+        if _queue_handler is not None and settings is None:
+            return False
+        if _queue_handler is None and root.handlers and not force:
+            return False
+        settings = settings or {}
+
+        _stop_listener()
+        if force:
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+        log_queue: 'queue.SimpleQueue[logging.LogRecord]' = queue.SimpleQueue()
+        _queue_handler = _QueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(
+            log_queue, *build_handlers(settings), respect_handler_level=True
+        )
+        _listener.start()
+        root.addHandler(_queue_handler)
+        level = str(settings.get('level', 'INFO')).upper()
+        if isinstance(logging.getLevelName(level), int):
+            root.setLevel(level)
+        else:
+            root.setLevel(logging.INFO)
+            logging.getLogger(__name__).warning(f"Unknown log level {level!r}, using INFO")
+        return True
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and remove the pipeline from the root logger."""
+    with _lock:
+        _stop_listener()
+
+
+def _stop_listener() -> None:
+    """Detach the queue handler, drain the queue and close the listener's handlers."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
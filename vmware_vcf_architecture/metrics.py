@@ -0,0 +1,374 @@
+"""
+Prometheus metrics with low-overhead recording.
+
+Counters, gauges and histograms write to a per-thread shard, so the hot
+path is a thread-local dictionary update with no lock and no contention
+between worker threads. Shards are only merged when ``/metrics`` is
+scraped. The text exposition format is rendered directly, without a
+client library dependency.
+"""
+
+import bisect
+import functools
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds, tuned for REST calls against SDDC Manager
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Metric:
+    """Base class holding per-thread shards of label values to samples."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[LabelValues, Any]]] = []
+        # Samples recorded by threads that have since exited
+        self._retired: Dict[LabelValues, Any] = {}
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[LabelValues, Any]:
+        """Return the calling thread's shard, registering it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[LabelValues, Any] = {}
+            self._local.shard = shard
+            with self._shards_lock:
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _retire_dead_shards(self) -> None:
+        """Fold shards of exited threads into the retired totals; caller holds the lock."""
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                for key, value in shard.items():
+                    self._retired[key] = self._merge(self._retired.get(key), value)
+        self._shards = alive
+
+    @staticmethod
+    def _merge(total: Any, value: Any) -> Any:
+        """Combine two samples for the same label values."""
+        return value if total is None else total + value
+
+    def _snapshots(self) -> List[Dict[LabelValues, Any]]:
+        """Copy every shard; dict copies are atomic under the GIL."""
+        with self._shards_lock:
+            shards = [shard for _, shard in self._shards]
+            retired = dict(self._retired)
+        return [retired] + [dict(shard) for shard in shards]
+
+    def _format_labels(self, values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, values))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + '}'
+
+    def samples(self) -> Iterator[str]:
+        """Yield exposition lines for this metric."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render HELP, TYPE and sample lines."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        """Increase the counter for a label combination."""
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Return the merged counter value for a label combination."""
+        return sum(shard.get(labelvalues, 0) for shard in self._snapshots())
+
+    def samples(self) -> Iterator[str]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        for key in sorted(totals):
+            yield f"{self.name}{self._format_labels(key)} {_num(totals[key])}"
+
+
+class Gauge(_Metric):
+    """Gauge supporting increments, absolute values and scrape-time callbacks."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        """Increase the gauge for a label combination."""
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def dec(self, amount: float = 1, *labelvalues: str) -> None:
+        """Decrease the gauge for a label combination."""
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) - amount
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        """Set an absolute value for a label combination."""
+        self._values[labelvalues] = value
+
+    def set_function(self, func: Callable[[], float], *labelvalues: str) -> None:
+        """Evaluate a callable at scrape time for a label combination."""
+        self._functions[labelvalues] = func
+
+    def remove(self, *labelvalues: str) -> None:
+        """Forget a label combination."""
+        self._values.pop(labelvalues, None)
+        self._functions.pop(labelvalues, None)
+
+    def value(self, *labelvalues: str) -> float:
+        """Return the current value for a label combination."""
+        return self._collect().get(labelvalues, 0.0)
+
+    def _collect(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = dict(self._values)
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        for key, func in list(self._functions.items()):
+            try:
+                totals[key] = float(func())
+            except Exception:
+                totals[key] = math.nan
+        return totals
+
+    def samples(self) -> Iterator[str]:
+        totals = self._collect()
+        for key in sorted(totals):
+            yield f"{self.name}{self._format_labels(key)} {_num(totals[key])}"
+
+
+class Histogram(_Metric):
+    """Histogram with fixed buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    @staticmethod
+    def _merge(total: Any, value: Any) -> Any:
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation for a label combination."""
+        shard = self._shard()
+        slots = shard.get(labelvalues)
+        if slots is None:
+            # One slot per bucket, one for +Inf, then sum
+            slots = shard[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        slots[bisect.bisect_left(self.buckets, value)] += 1
+        slots[-1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        """Return the number of observations for a label combination."""
+        return int(sum(sum(shard[labelvalues][:-1]) for shard in self._snapshots()
+                       if labelvalues in shard))
+
+    def samples(self) -> Iterator[str]:
+        merged: Dict[LabelValues, List[float]] = {}
+        for shard in self._snapshots():
+            for key, slots in shard.items():
+                merged[key] = self._merge(merged.get(key), slots)
+        for key in sorted(merged):
+            slots = merged[key]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), slots[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(float(bound))
+                yield f"{self.name}_bucket{self._format_labels(key, ('le', le))} {_num(cumulative)}"
+            yield f"{self.name}_sum{self._format_labels(key)} {_num(slots[-1])}"
+            yield f"{self.name}_count{self._format_labels(key)} {_num(cumulative)}"
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Any) -> Any:
+        """Add a metric, returning the already registered one on name clashes."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create or return a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create or return a gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create or return a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = Registry()
+
+API_REQUEST_DURATION = REGISTRY.histogram(
+    'vcf_api_request_duration_seconds',
+    'Duration of outbound VCF API calls',
+    ('instance', 'endpoint', 'method', 'status'),
+)
+API_IN_FLIGHT = REGISTRY.gauge(
+    'vcf_api_requests_in_flight',
+    'Outbound VCF API calls currently holding a pooled connection',
+    ('instance',),
+)
+API_POOL_SATURATION = REGISTRY.gauge(
+    'vcf_api_pool_saturation',
+    'Fraction of the connection pool in use',
+    ('instance',),
+)
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    'vcf_cache_hit_ratio',
+    'Fraction of cached reads served without contacting the server',
+    ('instance',),
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    'vcf_cache_entries',
+    'Number of cached API responses',
+    ('instance',),
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    'vcf_queue_depth',
+    'Work items waiting for a worker',
+    ('queue',),
+)
+HEALTH_CHECK_DURATION = REGISTRY.histogram(
+    'vcf_health_check_duration_seconds',
+    'Duration of application health checks',
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def endpoint_template(path: str) -> str:
+    """Collapse object IDs in an API path to keep label cardinality bounded.
+
+    ``/v1/clusters/<id>/datastores`` becomes ``/v1/clusters/{id}/datastores``.
+    """
+    parts = path.split('?', 1)[0].split('/')
+    # parts: ['', 'v1', '<collection>', '<id>', ...]
+    for index in range(3, len(parts), 2):
+        if parts[index]:
+            parts[index] = '{id}'
+    return '/'.join(parts)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _num(value: float) -> str:
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 'NaN'
+        if value.is_integer():
+            return str(int(value)) if abs(value) < 1e15 else repr(value)
+        return repr(value)
+    return str(value)
+
+
+class MetricsServer:
+    """HTTP endpoint exposing a registry on ``/metrics``."""
+
+    def __init__(self, registry: Registry = REGISTRY, host: str = '0.0.0.0',  # nosec B104
+                 port: int = 9090):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address the endpoint is bound to."""
+        if self._server is None:
+            raise RuntimeError("Metrics server is not running")
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def start(self) -> 'MetricsServer':
+        """Start serving in a background thread."""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                if self.path.split('?', 1)[0] != '/metrics':
+                    body, status, content_type = b'not found\n', 404, 'text/plain'
+                else:
+                    body, status, content_type = registry.render().encode(), 200, CONTENT_TYPE
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.5},
+                         name='vcf-metrics-http', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the endpoint."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MetricsServer':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
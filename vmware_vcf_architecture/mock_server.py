@@ -0,0 +1,388 @@
+"""
+Local mock SDDC Manager API server.
+
+Serves a synthetic VCF estate over HTTP on the loopback interface so the
+client and the components built on it can be exercised without a real
+SDDC Manager. Estate size and per-request latency are configurable.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _timestamp() -> str:
+    """Current time in the SDDC Manager timestamp format."""
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class MockSDDCManager:
+    """In-process SDDC Manager API simulator."""
+
+    def __init__(
+        self,
+        domains: int = 2,
+        clusters_per_domain: int = 1,
+        hosts_per_cluster: int = 4,
+        latency: float = 0.0,
+        username: str = 'admin@local',
+        password: str = 'VMware1!',
+    ):
+        """Initialize the simulator.
+
+        Args:
+            domains: Number of workload domains besides the management domain
+            clusters_per_domain: Clusters created in every domain
+            hosts_per_cluster: Hosts created in every cluster
+            latency: Delay in seconds added to every request
+            username: Accepted login username
+            password: Accepted login password
+        """
+        self.latency = latency
+        # Seconds a newly created task stays IN_PROGRESS
+        self.task_duration = 0.0
+        self._task_schedule: Dict[str, Any] = {}
+        # Status returned by every authorized GET while set, to simulate outages
+        self.fail_status: Optional[int] = None
+        self.username = username
+        self.password = password
+        self.tokens: Dict[str, str] = {}
+        self.logins = 0
+        self.connections = 0
+        self.not_modified = 0
+        self.requests: List[str] = []
+        self.lock = threading.Lock()
+        self.resources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._build_estate(domains, clusters_per_domain, hosts_per_cluster)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _build_estate(self, domains: int, clusters_per_domain: int,
+                      hosts_per_cluster: int) -> None:
+        """Populate the synthetic inventory."""
+        collections = ['domains', 'clusters', 'hosts', 'vcenters',
+                       'nsxt-clusters', 'datastores', 'sddc-managers', 'tasks']
+        self.resources = {name: {} for name in collections}
+        self.resources['sddc-managers']['sddc-manager-0'] = {
+            'id': 'sddc-manager-0',
+            'fqdn': 'sddc-manager.example.com',
+            'version': '5.2.0.0',
+            'status': 'ACTIVE',
+        }
+
+        for d in range(domains + 1):
+            domain_id = f"domain-{d}"
+            domain_type = 'MANAGEMENT' if d == 0 else 'VI'
+            name = 'mgmt01' if d == 0 else f"wld{d:02d}"
+            cluster_refs = []
+            for c in range(clusters_per_domain):
+                cluster_id = f"{domain_id}-cluster-{c}"
+                host_refs = []
+                for h in range(hosts_per_cluster):
+                    host_id = f"{cluster_id}-host-{h}"
+                    host_refs.append({'id': host_id})
+                    self.resources['hosts'][host_id] = {
+                        'id': host_id,
+                        'fqdn': f"esx{h:02d}.{name}-c{c}.example.com",
+                        'status': 'ASSIGNED',
+                        'domain': {'id': domain_id},
+                        'cluster': {'id': cluster_id},
+                        'cpu': {'cores': 28},
+                        'memory': {'totalCapacityMB': 524288},
+                    }
+                datastore_id = f"{cluster_id}-vsan"
+                self.resources['datastores'][datastore_id] = {
+                    'id': datastore_id,
+                    'name': f"{name}-c{c}-vsan",
+                    'type': 'VSAN',
+                    'cluster': {'id': cluster_id},
+                    'deduplication': True,
+                    'compression': True,
+                }
+                self.resources['clusters'][cluster_id] = {
+                    'id': cluster_id,
+                    'name': f"{name}-cluster-{c}",
+                    'domain': {'id': domain_id},
+                    'hosts': host_refs,
+                    'primaryDatastoreType': 'VSAN',
+                    'primaryDatastoreName': f"{name}-c{c}-vsan",
+                }
+                cluster_refs.append({'id': cluster_id})
+
+            self.resources['vcenters'][f"{domain_id}-vc"] = {
+                'id': f"{domain_id}-vc",
+                'fqdn': f"vcenter-{name}.example.com",
+                'domain': {'id': domain_id},
+                'status': 'ACTIVE',
+            }
+            self.resources['nsxt-clusters'][f"{domain_id}-nsx"] = {
+                'id': f"{domain_id}-nsx",
+                'vipFqdn': f"nsx-{name}.example.com",
+                'domains': [{'id': domain_id}],
+                'status': 'ACTIVE',
+                'nodes': [{'id': f"{domain_id}-nsx-{n}"} for n in range(3)],
+                'transportZones': [{'name': 'tz-overlay', 'type': 'OVERLAY'},
+                                   {'name': 'tz-vlan', 'type': 'VLAN'}],
+            }
+            self.resources['domains'][domain_id] = {
+                'id': domain_id,
+                'name': name,
+                'type': domain_type,
+                'status': 'ACTIVE',
+                'clusters': cluster_refs,
+            }
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._server is None:
+            raise RuntimeError("Mock SDDC Manager is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockSDDCManager':
+        """Start serving on an ephemeral loopback port."""
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MockSDDCManager':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def request_count(self, prefix: str = '') -> int:
+        """Return the number of requests whose path starts with a prefix."""
+        with self.lock:
+            return sum(1 for path in self.requests if path.startswith(prefix))
+
+    def issue_token(self) -> Dict[str, Any]:
+        """Create a new token pair."""
+        with self.lock:
+            self.logins += 1
+            access = uuid.uuid4().hex
+            refresh = uuid.uuid4().hex
+            self.tokens[access] = refresh
+        return {'accessToken': access, 'refreshToken': {'id': refresh}}
+
+    def add_task(self, name: str, resources: Optional[List[Dict[str, Any]]] = None,
+                 duration: Optional[float] = None, result: str = 'SUCCESSFUL') -> Dict[str, Any]:
+        """Create a task that finishes with a result after a duration.
+
+        Args:
+            name: Task name
+            resources: Resources the task acts on
+            duration: Seconds the task stays IN_PROGRESS, defaults to task_duration
+            result: Final task status
+        """
+        duration = self.task_duration if duration is None else duration
+        with self.lock:
+            task_id = f"task-{len(self.resources['tasks'])}"
+            task = {'id': task_id, 'name': name, 'status': 'IN_PROGRESS',
+                    'resources': resources or [], 'creationTimestamp': _timestamp()}
+            self.resources['tasks'][task_id] = task
+            self._task_schedule[task_id] = (time.monotonic() + duration, result)
+        self.update_tasks()
+        return dict(task)
+
+    def update_tasks(self) -> None:
+        """Finish the tasks whose duration has elapsed."""
+        now = time.monotonic()
+        with self.lock:
+            for task_id, (due, result) in list(self._task_schedule.items()):
+                if due <= now:
+                    self.resources['tasks'][task_id]['status'] = result
+                    self.resources['tasks'][task_id]['completionTimestamp'] = _timestamp()
+                    del self._task_schedule[task_id]
+
+    def commission_hosts(self, specs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add commissioned hosts to the inventory and return the task."""
+        refs = []
+        with self.lock:
+            for spec in specs:
+                host_id = f"host-{len(self.resources['hosts'])}"
+                refs.append({'resourceId': host_id, 'type': 'HOST', 'fqdn': spec['fqdn']})
+                self.resources['hosts'][host_id] = {
+                    'id': host_id,
+                    'fqdn': spec['fqdn'],
+                    'status': 'UNASSIGNED_USEABLE',
+                    'networkPoolId': spec.get('networkPoolId'),
+                }
+        return self.add_task('Commissioning host(s) with VMware Cloud Foundation', refs)
+
+    def revoke_tokens(self) -> None:
+        """Invalidate every issued access token."""
+        with self.lock:
+            self.tokens.clear()
+
+
+def _make_handler(server: MockSDDCManager) -> type:
+    """Build a request handler class bound to a simulator instance."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; without TCP_NODELAY the
+        # body waits for the client's delayed ACK and adds ~40ms per request
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with server.lock:
+                server.connections += 1
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, body: Any = None,
+                  headers: Optional[Dict[str, str]] = None) -> None:
+            payload = b'' if body is None else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _send_resource(self, body: Any) -> None:
+            payload = json.dumps(body, sort_keys=True).encode()
+            etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                with server.lock:
+                    server.not_modified += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self._send(200, body, headers={'ETag': etag})
+
+        def _read_body(self) -> Any:
+            length = int(self.headers.get('Content-Length') or 0)
+            if not length:
+                return None
+            return json.loads(self.rfile.read(length))
+
+        def _authorized(self) -> bool:
+            header = self.headers.get('Authorization', '')
+            token = header[7:] if header.startswith('Bearer ') else ''
+            with server.lock:
+                return token in server.tokens
+
+        def _begin(self) -> Any:
+            parsed = urlparse(self.path)
+            with server.lock:
+                server.requests.append(parsed.path)
+            if server.latency:
+                time.sleep(server.latency)
+            return parsed
+
+        def do_POST(self) -> None:
+            parsed = self._begin()
+            body = self._read_body()
+            if parsed.path == '/v1/tokens':
+                if (isinstance(body, dict) and body.get('username') == server.username
+                        and body.get('password') == server.password):
+                    self._send(200, server.issue_token())
+                else:
+                    self._send(401, {'errorCode': 'AUTHENTICATION_FAILED'})
+                return
+            if not self._authorized():
+                self._send(401, {'errorCode': 'UNAUTHORIZED'})
+                return
+            if parsed.path == '/v1/hosts':
+                if not isinstance(body, list) or not all(
+                        isinstance(spec, dict) and spec.get('fqdn') for spec in body):
+                    self._send(400, {'errorCode': 'INVALID_HOST_SPEC'})
+                    return
+                self._send(202, server.commission_hosts(body))
+                return
+            self._send(404, {'errorCode': 'NOT_FOUND'})
+
+        def do_PATCH(self) -> None:
+            parsed = self._begin()
+            body = self._read_body()
+            if parsed.path == '/v1/tokens/access-token/refresh':
+                with server.lock:
+                    known = body in server.tokens.values()
+                if known:
+                    self._send(200, server.issue_token()['accessToken'])
+                else:
+                    self._send(401, {'errorCode': 'INVALID_REFRESH_TOKEN'})
+                return
+            self._send(404, {'errorCode': 'NOT_FOUND'})
+
+        def do_GET(self) -> None:
+            parsed = self._begin()
+            if not self._authorized():
+                self._send(401, {'errorCode': 'UNAUTHORIZED'})
+                return
+            if server.fail_status:
+                self._send(server.fail_status, {'errorCode': 'SERVICE_UNAVAILABLE'})
+                return
+
+            parts = [p for p in parsed.path.split('/') if p]
+            if len(parts) < 2 or parts[0] != 'v1' or parts[1] not in server.resources:
+                self._send(404, {'errorCode': 'NOT_FOUND'})
+                return
+
+            if parts[1] == 'tasks':
+                server.update_tasks()
+            collection = server.resources[parts[1]]
+            query = parse_qs(parsed.query)
+            if len(parts) == 2:
+                elements = list(collection.values())
+                if 'status' in query:
+                    elements = [e for e in elements if e.get('status') == query['status'][0]]
+                for key in ('domainId', 'clusterId'):
+                    if key in query:
+                        ref = 'domain' if key == 'domainId' else 'cluster'
+                        elements = [e for e in elements
+                                    if (e.get(ref) or {}).get('id') == query[key][0]]
+                if parts[1] == 'tasks':
+                    # Most recent tasks first, as SDDC Manager lists them
+                    elements.reverse()
+                body: Dict[str, Any] = {'elements': elements}
+                if 'pageSize' in query:
+                    size = max(1, int(query['pageSize'][0]))
+                    number = int(query.get('pageNumber', ['0'])[0])
+                    body = {
+                        'elements': elements[number * size:(number + 1) * size],
+                        'pageMetadata': {
+                            'pageNumber': number, 'pageSize': size,
+                            'totalElements': len(elements),
+                            'totalPages': max(1, -(-len(elements) // size)),
+                        },
+                    }
+                self._send_resource(body)
+            elif len(parts) == 3 and parts[2] in collection:
+                self._send_resource(collection[parts[2]])
+            elif len(parts) == 4 and parts[1] == 'clusters' and parts[3] == 'datastores':
+                if parts[2] not in collection:
+                    self._send(404, {'errorCode': 'NOT_FOUND'})
+                    return
+                elements = [d for d in server.resources['datastores'].values()
+                            if d['cluster']['id'] == parts[2]]
+                self._send_resource(elements)
+            else:
+                self._send(404, {'errorCode': 'NOT_FOUND'})
+
+    return Handler
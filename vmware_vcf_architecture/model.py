@@ -0,0 +1,336 @@
+"""
+Compact typed inventory model.
+
+SDDC Manager returns every object as a nested JSON dictionary. Held as-is,
+tens of thousands of hosts cost several times their payload in dictionary
+overhead, and finding the hosts of one cluster is a scan over all of them.
+The entities here keep only the fields the tool uses in ``__slots__``
+classes, intern repeated strings (IDs, statuses, types), and the
+``InventoryModel`` indexes them by ID, domain, cluster and tag so lookups
+are dictionary hits.
+"""
+
+import sys
+from collections import defaultdict
+from typing import (
+    Any, ClassVar, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union,
+)
+
+
+def _str(value: Any) -> Optional[str]:
+    """Intern a string value so equal IDs and statuses share one object."""
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+def _ref(body: Mapping[str, Any], key: str) -> Optional[str]:
+    """Return the ID of a ``{'id': ...}`` reference."""
+    ref = body.get(key)
+    return _str(ref.get('id')) if isinstance(ref, Mapping) else None
+
+
+def _tags(body: Mapping[str, Any]) -> Tuple[str, ...]:
+    """Return tag names from a list of strings or ``{'name': ...}`` objects."""
+    tags = []
+    for tag in body.get('tags') or ():
+        name = tag.get('name') if isinstance(tag, Mapping) else tag
+        if isinstance(name, str):
+            tags.append(sys.intern(name))
+    return tuple(tags)
+
+
+class Entity:
+    """Base class for inventory objects."""
+
+    __slots__ = ('id', 'tags')
+
+    kind: ClassVar[str] = 'entity'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the entity's fields as a dictionary."""
+        fields: Dict[str, Any] = {}
+        for cls in reversed(type(self).__mro__):
+            for name in getattr(cls, '__slots__', ()):
+                value = getattr(self, name)
+                fields[name] = list(value) if isinstance(value, tuple) else value
+        return fields
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.id!r})"
+
+
+class Domain(Entity):
+    """Workload or management domain."""
+
+    __slots__ = ('name', 'type', 'status')
+
+    kind = 'domain'
+
+    def __init__(self, id: str, name: Optional[str] = None, type: Optional[str] = None,
+                 status: Optional[str] = None, tags: Tuple[str, ...] = ()):
+        self.id = sys.intern(id)
+        self.name = name
+        self.type = type
+        self.status = status
+        self.tags = tags
+
+    @classmethod
+    def from_api(cls, body: Mapping[str, Any]) -> 'Domain':
+        """Build a domain from an SDDC Manager ``/v1/domains`` element."""
+        return cls(body['id'], body.get('name'), _str(body.get('type')),
+                   _str(body.get('status')), _tags(body))
+
+
+class Cluster(Entity):
+    """vSphere cluster."""
+
+    __slots__ = ('name', 'domain_id', 'status', 'datastore_type')
+
+    kind = 'cluster'
+
+    def __init__(self, id: str, name: Optional[str] = None, domain_id: Optional[str] = None,
+                 status: Optional[str] = None, datastore_type: Optional[str] = None,
+                 tags: Tuple[str, ...] = ()):
+        self.id = sys.intern(id)
+        self.name = name
+        self.domain_id = domain_id
+        self.status = status
+        self.datastore_type = datastore_type
+        self.tags = tags
+
+    @classmethod
+    def from_api(cls, body: Mapping[str, Any]) -> 'Cluster':
+        """Build a cluster from an SDDC Manager ``/v1/clusters`` element."""
+        return cls(body['id'], body.get('name'), _ref(body, 'domain'),
+                   _str(body.get('status')), _str(body.get('primaryDatastoreType')),
+                   _tags(body))
+
+
+class Host(Entity):
+    """ESXi host."""
+
+    __slots__ = ('fqdn', 'status', 'domain_id', 'cluster_id', 'cpu_cores', 'memory_mb')
+
+    kind = 'host'
+
+    def __init__(self, id: str, fqdn: Optional[str] = None, status: Optional[str] = None,
+                 domain_id: Optional[str] = None, cluster_id: Optional[str] = None,
+                 cpu_cores: int = 0, memory_mb: int = 0, tags: Tuple[str, ...] = ()):
+        self.id = sys.intern(id)
+        self.fqdn = fqdn
+        self.status = status
+        self.domain_id = domain_id
+        self.cluster_id = cluster_id
+        self.cpu_cores = cpu_cores
+        self.memory_mb = memory_mb
+        self.tags = tags
+
+    @classmethod
+    def from_api(cls, body: Mapping[str, Any]) -> 'Host':
+        """Build a host from an SDDC Manager ``/v1/hosts`` element."""
+        cpu = body.get('cpu') or {}
+        memory = body.get('memory') or {}
+        return cls(body['id'], body.get('fqdn'), _str(body.get('status')),
+                   _ref(body, 'domain'), _ref(body, 'cluster'),
+                   int(cpu.get('cores') or 0), int(memory.get('totalCapacityMB') or 0),
+                   _tags(body))
+
+
+class Datastore(Entity):
+    """Cluster datastore."""
+
+    __slots__ = ('name', 'type', 'cluster_id')
+
+    kind = 'datastore'
+
+    def __init__(self, id: str, name: Optional[str] = None, type: Optional[str] = None,
+                 cluster_id: Optional[str] = None, tags: Tuple[str, ...] = ()):
+        self.id = sys.intern(id)
+        self.name = name
+        self.type = type
+        self.cluster_id = cluster_id
+        self.tags = tags
+
+    @classmethod
+    def from_api(cls, body: Mapping[str, Any]) -> 'Datastore':
+        """Build a datastore from a ``/v1/clusters/{id}/datastores`` element."""
+        return cls(body['id'], body.get('name'), _str(body.get('type')),
+                   _ref(body, 'cluster'), _tags(body))
+
+
+class Segment(Entity):
+    """NSX segment."""
+
+    __slots__ = ('name', 'domain_id', 'vlan_id', 'subnet')
+
+    kind = 'segment'
+
+    def __init__(self, id: str, name: Optional[str] = None, domain_id: Optional[str] = None,
+                 vlan_id: Optional[int] = None, subnet: Optional[str] = None,
+                 tags: Tuple[str, ...] = ()):
+        self.id = sys.intern(id)
+        self.name = name
+        self.domain_id = domain_id
+        self.vlan_id = vlan_id
+        self.subnet = subnet
+        self.tags = tags
+
+    @classmethod
+    def from_api(cls, body: Mapping[str, Any]) -> 'Segment':
+        """Build a segment from an NSX ``/policy/api/v1/infra/segments`` element."""
+        vlans = body.get('vlan_ids') or []
+        subnets = body.get('subnets') or []
+        return cls(
+            body['id'], body.get('display_name') or body.get('name'), _ref(body, 'domain'),
+            int(vlans[0]) if vlans else None,
+            subnets[0].get('network') if subnets else None,
+            _tags(body),
+        )
+
+
+AnyEntity = Union[Domain, Cluster, Host, Datastore, Segment]
+
+# Inventory section -> entity class
+SECTIONS = {
+    'domains': Domain,
+    'clusters': Cluster,
+    'hosts': Host,
+    'vsan_datastores': Datastore,
+    'segments': Segment,
+}
+
+
+class InventoryModel:
+    """Inventory entities indexed by ID, domain, cluster and tag."""
+
+    def __init__(self) -> None:
+        self.domains: Dict[str, Domain] = {}
+        self.clusters: Dict[str, Cluster] = {}
+        self.hosts: Dict[str, Host] = {}
+        self.datastores: Dict[str, Datastore] = {}
+        self.segments: Dict[str, Segment] = {}
+        self._by_domain: Dict[str, Dict[str, List[Entity]]] = defaultdict(
+            lambda: defaultdict(list))
+        self._by_cluster: Dict[str, Dict[str, List[Entity]]] = defaultdict(
+            lambda: defaultdict(list))
+        self._by_tag: Dict[str, List[Entity]] = defaultdict(list)
+
+    @classmethod
+    def from_inventory(cls, inventory: Mapping[str, Any]) -> 'InventoryModel':
+        """Build the model from collected inventory.
+
+        Args:
+            inventory: Inventory as returned by ``InventoryCollector.collect``
+
+        Returns:
+            Indexed model
+        """
+        model = cls()
+        for section, entity_cls in SECTIONS.items():
+            for body in inventory.get(section) or ():
+                model.add(entity_cls.from_api(body))
+        return model
+
+    def _store(self, kind: str) -> Dict[str, Any]:
+        """Return the ID map holding entities of a kind."""
+        return {
+            'domain': self.domains, 'cluster': self.clusters, 'host': self.hosts,
+            'datastore': self.datastores, 'segment': self.segments,
+        }[kind]
+
+    def add(self, entity: AnyEntity) -> None:
+        """Add or replace an entity and index it.
+
+        Hosts without a domain reference inherit the domain of their cluster
+        if the cluster is already known.
+        """
+        store = self._store(entity.kind)
+        if entity.id in store:
+            self.remove(entity.id, entity.kind)
+        if isinstance(entity, Host) and entity.domain_id is None:
+            cluster = self.clusters.get(entity.cluster_id or '')
+            if cluster is not None:
+                entity.domain_id = cluster.domain_id
+        for index, key in ((self._by_domain, getattr(entity, 'domain_id', None)),
+                           (self._by_cluster, getattr(entity, 'cluster_id', None))):
+            if key is not None:
+                index[key][entity.kind].append(entity)
+        for tag in entity.tags:
+            self._by_tag[tag].append(entity)
+        store[entity.id] = entity
+
+    def extend(self, entities: Iterable[AnyEntity]) -> None:
+        """Add several entities."""
+        for entity in entities:
+            self.add(entity)
+
+    def remove(self, entity_id: str, kind: str) -> Optional[Entity]:
+        """Remove an entity of a kind by ID and drop it from the indexes.
+
+        Returns:
+            The removed entity, or None if it was not present
+        """
+        entity = self._store(kind).pop(entity_id, None)
+        if entity is None:
+            return None
+        for index, key in ((self._by_domain, getattr(entity, 'domain_id', None)),
+                           (self._by_cluster, getattr(entity, 'cluster_id', None))):
+            if key is not None and key in index:
+                index[key][kind].remove(entity)
+        for tag in entity.tags:
+            self._by_tag[tag].remove(entity)
+        return entity
+
+    def get(self, entity_id: str) -> Optional[Entity]:
+        """Look up an entity of any kind by ID."""
+        for store in (self.hosts, self.clusters, self.domains, self.datastores, self.segments):
+            entity = store.get(entity_id)
+            if entity is not None:
+                return entity
+        return None
+
+    def clusters_in_domain(self, domain_id: str) -> List[Cluster]:
+        """Clusters of a domain."""
+        return self._indexed(self._by_domain, domain_id, 'cluster')
+
+    def hosts_in_domain(self, domain_id: str) -> List[Host]:
+        """Hosts of a domain."""
+        return self._indexed(self._by_domain, domain_id, 'host')
+
+    def segments_in_domain(self, domain_id: str) -> List[Segment]:
+        """NSX segments of a domain."""
+        return self._indexed(self._by_domain, domain_id, 'segment')
+
+    def hosts_in_cluster(self, cluster_id: str) -> List[Host]:
+        """Hosts of a cluster."""
+        return self._indexed(self._by_cluster, cluster_id, 'host')
+
+    def datastores_in_cluster(self, cluster_id: str) -> List[Datastore]:
+        """Datastores of a cluster."""
+        return self._indexed(self._by_cluster, cluster_id, 'datastore')
+
+    def tagged(self, tag: str, kind: Optional[str] = None) -> List[Entity]:
+        """Entities carrying a tag, optionally only of one kind (e.g. ``host``)."""
+        entities = self._by_tag.get(tag) or []
+        return [e for e in entities if kind is None or e.kind == kind]
+
+    @staticmethod
+    def _indexed(index: Dict[str, Dict[str, List[Entity]]], key: str,
+                 kind: str) -> List[Any]:
+        group = index.get(key)
+        return list(group.get(kind) or []) if group is not None else []
+
+    def __iter__(self) -> Iterator[Entity]:
+        for store in (self.domains, self.clusters, self.hosts, self.datastores, self.segments):
+            yield from store.values()
+
+    def __len__(self) -> int:
+        return (len(self.domains) + len(self.clusters) + len(self.hosts)
+                + len(self.datastores) + len(self.segments))
+
+    def counts(self) -> Dict[str, int]:
+        """Number of entities of each kind."""
+        return {
+            'domains': len(self.domains), 'clusters': len(self.clusters),
+            'hosts': len(self.hosts), 'datastores': len(self.datastores),
+            'segments': len(self.segments),
+        }
@@ -0,0 +1,184 @@
+"""
+Network plan validation.
+
+Collects every subnet and static address declared by VCF domain specs and
+finds duplicate or nested subnets and conflicting addresses. Entries are
+sorted once by address range and checked in a single sweep, so a plan with
+n entries costs O(n log n) rather than comparing every pair.
+
+CIDR blocks never partially overlap: two blocks are either disjoint or one
+contains the other. The sweep therefore only has to keep the chain of
+blocks enclosing the current position on a stack.
+"""
+
+import ipaddress
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# Conflict kinds
+DUPLICATE = 'duplicate'
+CONTAINMENT = 'containment'
+ADDRESS_CONFLICT = 'address_conflict'
+RESERVED_ADDRESS = 'reserved_address'
+INVALID = 'invalid'
+
+
+class NetworkEntry:
+    """A subnet or static address declared in a plan."""
+
+    __slots__ = ('owner', 'network', 'is_address', 'start', 'end')
+
+    def __init__(self, owner: str, network: IPNetwork, is_address: bool = False):
+        """Initialize the entry.
+
+        Args:
+            owner: Where the entry was declared, e.g. ``prod-wld01.vsan``
+            network: Subnet, or a host network for a single address
+            is_address: True for a static address rather than a subnet
+        """
+        self.owner = owner
+        self.network = network
+        self.is_address = is_address
+        self.start = int(network.network_address)
+        self.end = int(network.broadcast_address)
+
+    @property
+    def label(self) -> str:
+        """Owner and address or CIDR, for messages."""
+        value = self.network.network_address if self.is_address else self.network
+        return f"{self.owner} ({value})"
+
+    def sort_key(self) -> Tuple[int, int, int, bool]:
+        """Order by family and start; enclosing blocks come before the blocks they contain."""
+        return (self.network.version, self.start, -self.end, self.is_address)
+
+
+class Conflict:
+    """A problem found between two plan entries."""
+
+    __slots__ = ('kind', 'first', 'second', 'message')
+
+    def __init__(self, kind: str, first: str, second: Optional[str], message: str):
+        self.kind = kind
+        self.first = first
+        self.second = second
+        self.message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the conflict as a dictionary."""
+        return {
+            'kind': self.kind,
+            'first': self.first,
+            'second': self.second,
+            'message': self.message,
+        }
+
+
+def collect_entries(spec: Mapping[str, Any], prefix: str = '') -> Tuple[List[NetworkEntry],
+                                                                         List[Conflict]]:
+    """Extract the subnets and static addresses declared by a domain spec.
+
+    Subnets come from each domain's ``networks`` mapping; static addresses
+    from the ``ip_address`` of top-level sections such as ``sddc_manager``
+    and ``vcenter``.
+
+    Args:
+        spec: Parsed domain spec
+        prefix: Optional owner prefix, e.g. the site or file name
+
+    Returns:
+        Tuple of (entries, conflicts for values that are not valid networks)
+    """
+    entries: List[NetworkEntry] = []
+    invalid: List[Conflict] = []
+
+    def add(owner: str, value: Any, is_address: bool) -> None:
+        owner = f"{prefix}{owner}"
+        try:
+            if is_address:
+                network = ipaddress.ip_network(ipaddress.ip_address(str(value)))
+            else:
+                network = ipaddress.ip_network(str(value), strict=True)
+        except ValueError as e:
+            invalid.append(Conflict(INVALID, owner, None, f"{owner}: {e}"))
+            return
+        entries.append(NetworkEntry(owner, network, is_address))
+
+    domains = list(spec.get('workload_domains') or [])
+    if isinstance(spec.get('management_domain'), Mapping):
+        domains.insert(0, spec['management_domain'])
+    for domain in domains:
+        for name, cidr in (domain.get('networks') or {}).items():
+            add(f"{domain.get('name')}.{name}", cidr, False)
+
+    for section, values in spec.items():
+        if isinstance(values, Mapping) and values.get('ip_address'):
+            add(f"{section}.ip_address", values['ip_address'], True)
+    return entries, invalid
+
+
+def find_conflicts(entries: Iterable[NetworkEntry]) -> List[Conflict]:
+    """Find duplicate and nested subnets and conflicting addresses.
+
+    An address inside a declared subnet is expected; using the subnet's
+    network or broadcast address is reported.
+
+    Args:
+        entries: Plan entries from any number of specs
+
+    Returns:
+        Conflicts in address order
+    """
+    conflicts: List[Conflict] = []
+    stack: List[NetworkEntry] = []
+    version = 0
+    for entry in sorted(entries, key=NetworkEntry.sort_key):
+        if entry.network.version != version:
+            stack, version = [], entry.network.version
+        while stack and stack[-1].end < entry.start:
+            stack.pop()
+        if stack:
+            conflict = _classify(stack[-1], entry)
+            if conflict is not None:
+                conflicts.append(conflict)
+        stack.append(entry)
+    return conflicts
+
+
+def _classify(outer: NetworkEntry, inner: NetworkEntry) -> Optional[Conflict]:
+    """Describe the problem between an entry and the block enclosing it."""
+    same = outer.start == inner.start and outer.end == inner.end
+    if outer.is_address:
+        # Only an identical address can sort under an address
+        return Conflict(ADDRESS_CONFLICT, outer.owner, inner.owner,
+                        f"{inner.label} reuses the address of {outer.label}")
+    if not inner.is_address:
+        if same:
+            return Conflict(DUPLICATE, outer.owner, inner.owner,
+                            f"{inner.label} duplicates {outer.label}")
+        return Conflict(CONTAINMENT, outer.owner, inner.owner,
+                        f"{inner.label} lies inside {outer.label}")
+    if outer.network.num_addresses > 2 and inner.start in (outer.start, outer.end):
+        return Conflict(RESERVED_ADDRESS, outer.owner, inner.owner,
+                        f"{inner.label} is the network or broadcast address of {outer.label}")
+    return None
+
+
+def check_plan(specs: Iterable[Tuple[str, Mapping[str, Any]]]) -> List[Conflict]:
+    """Validate the network plan of one or more specs together.
+
+    Args:
+        specs: (name, spec) pairs; with more than one spec, names prefix owners
+
+    Returns:
+        Invalid values followed by conflicts
+    """
+    specs = list(specs)
+    entries: List[NetworkEntry] = []
+    conflicts: List[Conflict] = []
+    for name, spec in specs:
+        found, invalid = collect_entries(spec, f"{name}:" if len(specs) > 1 else '')
+        entries.extend(found)
+        conflicts.extend(invalid)
+    return conflicts + find_conflicts(entries)
@@ -0,0 +1,233 @@
+"""
+Desired-state planning.
+
+Compares the domains and clusters of a domain spec with collected inventory
+and produces the minimal ordered change set needed to converge, in the
+spirit of a Terraform plan. Both sides are reduced to the same tree and
+every domain and cluster subtree is fingerprinted bottom-up, so matching
+subtrees are skipped with one hash comparison instead of a deep walk, and an
+unchanged estate is recognized from the root fingerprint alone.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Change actions, in execution order
+DEPLOY_MANAGEMENT_DOMAIN = 'deploy_management_domain'
+CREATE_WORKLOAD_DOMAIN = 'create_workload_domain'
+ADD_CLUSTER = 'add_cluster'
+EXPAND_CLUSTER = 'expand_cluster'
+SHRINK_CLUSTER = 'shrink_cluster'
+REMOVE_CLUSTER = 'remove_cluster'
+REMOVE_DOMAIN = 'remove_domain'
+
+ACTION_ORDER = (
+    DEPLOY_MANAGEMENT_DOMAIN, CREATE_WORKLOAD_DOMAIN, ADD_CLUSTER, EXPAND_CLUSTER,
+    SHRINK_CLUSTER, REMOVE_CLUSTER, REMOVE_DOMAIN,
+)
+DESTRUCTIVE = frozenset((SHRINK_CLUSTER, REMOVE_CLUSTER, REMOVE_DOMAIN))
+
+# Parsed specs are reused by identity (see config.load_spec), so their trees
+# are cached for the last few documents.
+_TREE_CACHE_SIZE = 8
+_tree_cache: 'OrderedDict[int, Tuple[Mapping[str, Any], StateTree]]' = OrderedDict()
+_tree_lock = threading.Lock()
+
+
+def _digest(value: Any) -> str:
+    """Hash a JSON-serializable value."""
+    body = json.dumps(value, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(body.encode()).hexdigest()
+
+
+class Node:
+    """A fingerprinted domain or cluster."""
+
+    __slots__ = ('attrs', 'children', 'fingerprint')
+
+    def __init__(self, attrs: Dict[str, Any], children: Optional[Dict[str, 'Node']] = None):
+        """Initialize the node and fingerprint it from its attributes and children.
+
+        Args:
+            attrs: Compared attributes of this node
+            children: Child nodes by name
+        """
+        self.attrs = attrs
+        self.children = children or {}
+        self.fingerprint = _digest([
+            attrs, sorted((name, child.fingerprint) for name, child in self.children.items())
+        ])
+
+
+class StateTree:
+    """Domains and clusters reduced to the attributes the plan compares."""
+
+    __slots__ = ('domains', 'types', 'fingerprint')
+
+    def __init__(self, domains: Dict[str, Node], types: Dict[str, str]):
+        self.domains = domains
+        self.types = types
+        self.fingerprint = _digest(sorted((n, d.fingerprint) for n, d in domains.items()))
+
+    @classmethod
+    def from_spec(cls, spec: Mapping[str, Any]) -> 'StateTree':
+        """Build the desired state from a domain spec.
+
+        Domains declare a single ``cluster`` or a ``clusters`` list, each with
+        a ``name`` and a ``hosts`` count.
+        """
+        key = id(spec)
+        with _tree_lock:
+            cached = _tree_cache.get(key)
+            if cached is not None and cached[0] is spec:
+                _tree_cache.move_to_end(key)
+                return cached[1]
+
+        domains: Dict[str, Node] = {}
+        types: Dict[str, str] = {}
+        entries = [('VI', d) for d in spec.get('workload_domains') or []]
+        if spec.get('management_domain'):
+            entries.insert(0, ('MANAGEMENT', spec['management_domain']))
+        for domain_type, domain in entries:
+            clusters = domain.get('clusters') or []
+            if not clusters and domain.get('cluster'):
+                clusters = [domain['cluster']]
+            domains[domain['name']] = Node({}, {
+                cluster['name']: Node({'hosts': int(cluster.get('hosts', 0))})
+                for cluster in clusters
+            })
+            types[domain['name']] = domain_type
+        tree = cls(domains, types)
+
+        with _tree_lock:
+            _tree_cache[key] = (spec, tree)
+            while len(_tree_cache) > _TREE_CACHE_SIZE:
+                _tree_cache.popitem(last=False)
+        return tree
+
+    @classmethod
+    def from_inventory(cls, inventory: Mapping[str, Any]) -> 'StateTree':
+        """Build the live state from collected inventory."""
+        clusters_by_domain: Dict[str, Dict[str, Node]] = {}
+        for cluster in inventory.get('clusters') or []:
+            domain_id = (cluster.get('domain') or {}).get('id')
+            clusters_by_domain.setdefault(domain_id, {})[cluster.get('name') or cluster['id']] = \
+                Node({'hosts': len(cluster.get('hosts') or [])})
+
+        domains: Dict[str, Node] = {}
+        types: Dict[str, str] = {}
+        for domain in inventory.get('domains') or []:
+            name = domain.get('name') or domain['id']
+            domains[name] = Node({}, clusters_by_domain.get(domain['id'], {}))
+            types[name] = domain.get('type', 'VI')
+        return cls(domains, types)
+
+
+class Change:
+    """One planned action."""
+
+    __slots__ = ('action', 'domain', 'cluster', 'details')
+
+    def __init__(self, action: str, domain: str, cluster: Optional[str] = None,
+                 details: Optional[Dict[str, Any]] = None):
+        self.action = action
+        self.domain = domain
+        self.cluster = cluster
+        self.details = details or {}
+
+    @property
+    def destructive(self) -> bool:
+        """True if the change removes capacity or objects."""
+        return self.action in DESTRUCTIVE
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the change as a dictionary."""
+        return {
+            'action': self.action,
+            'domain': self.domain,
+            'cluster': self.cluster,
+            'details': self.details,
+            'destructive': self.destructive,
+        }
+
+    def __str__(self) -> str:
+        target = f"{self.domain}/{self.cluster}" if self.cluster else self.domain
+        details = ', '.join(f"{k}={v}" for k, v in sorted(self.details.items()))
+        return f"{self.action} {target}" + (f" ({details})" if details else '')
+
+
+def plan(desired: StateTree, actual: StateTree, remove_domains: bool = False) -> List[Change]:
+    """Compute the ordered change set that turns the live state into the desired one.
+
+    Live domains missing from the spec are left alone unless
+    ``remove_domains`` is set, since a spec often covers only some of the
+    estate's domains. The management domain is never removed.
+
+    Args:
+        desired: State built from the spec
+        actual: State built from the inventory
+        remove_domains: Plan removal of live workload domains the spec omits
+
+    Returns:
+        Changes ordered by ACTION_ORDER, then by domain and cluster name
+    """
+    changes: List[Change] = []
+    if desired.fingerprint == actual.fingerprint:
+        return changes
+
+    for name, want in desired.domains.items():
+        have = actual.domains.get(name)
+        if have is None:
+            management = desired.types.get(name) == 'MANAGEMENT'
+            changes.append(Change(
+                DEPLOY_MANAGEMENT_DOMAIN if management else CREATE_WORKLOAD_DOMAIN, name,
+                details={
+                    'clusters': len(want.children),
+                    'hosts': sum(c.attrs['hosts'] for c in want.children.values()),
+                },
+            ))
+            continue
+        if have.fingerprint == want.fingerprint:
+            continue
+        changes.extend(_plan_clusters(name, want, have))
+
+    for name, have in actual.domains.items():
+        if (remove_domains and name not in desired.domains
+                and actual.types.get(name) != 'MANAGEMENT'):
+            changes.append(Change(REMOVE_DOMAIN, name, details={'clusters': len(have.children)}))
+
+    rank = {action: i for i, action in enumerate(ACTION_ORDER)}
+    changes.sort(key=lambda c: (rank[c.action], c.domain, c.cluster or ''))
+    return changes
+
+
+def _plan_clusters(domain: str, want: Node, have: Node) -> List[Change]:
+    """Diff the clusters of a domain whose fingerprints differ."""
+    changes: List[Change] = []
+    for name, cluster in want.children.items():
+        current = have.children.get(name)
+        if current is None:
+            changes.append(Change(ADD_CLUSTER, domain, name, {'hosts': cluster.attrs['hosts']}))
+        elif current.fingerprint != cluster.fingerprint:
+            delta = cluster.attrs['hosts'] - current.attrs['hosts']
+            if delta:
+                changes.append(Change(
+                    EXPAND_CLUSTER if delta > 0 else SHRINK_CLUSTER, domain, name,
+                    {'hosts': abs(delta), 'from': current.attrs['hosts'],
+                     'to': cluster.attrs['hosts']},
+                ))
+    for name, current in have.children.items():
+        if name not in want.children:
+            changes.append(Change(REMOVE_CLUSTER, domain, name, {'hosts': current.attrs['hosts']}))
+    return changes
+
+
+def summarize(changes: List[Change]) -> Dict[str, int]:
+    """Count changes by kind, like ``Plan: 1 to add, 2 to change, 0 to destroy``."""
+    add = sum(1 for c in changes if c.action in (
+        DEPLOY_MANAGEMENT_DOMAIN, CREATE_WORKLOAD_DOMAIN, ADD_CLUSTER))
+    destroy = sum(1 for c in changes if c.action in (REMOVE_CLUSTER, REMOVE_DOMAIN))
+    return {'add': add, 'change': len(changes) - add - destroy, 'destroy': destroy}
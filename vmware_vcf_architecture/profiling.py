@@ -0,0 +1,170 @@
+"""
+Opt-in profiling and lightweight phase timers.
+
+``PhaseTimer`` records wall-clock durations of named phases (config load,
+health sub-checks, validation steps) and, while collecting, aggregates the
+API calls made by the client. Timers log each phase at DEBUG and a summary
+at INFO; JSON logs carry the figures as ``phase``/``duration_ms`` and
+``timings`` fields. ``profiled`` wraps a block in cProfile for the
+``--profile`` command line flag. Recording costs one ``perf_counter`` pair
+per phase, and API call aggregation is skipped entirely while no timer is
+collecting.
+
+Collecting timers are tracked in a context variable, so a timer only sees
+the calls of the operation it wraps, not every call in the process. Work
+handed to executor or worker threads starts in an empty context; wrap it
+with ``in_context`` where it is queued to keep its calls with the timer.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = 'vmware-vcf-architecture.prof'
+
+T = TypeVar('T')
+
+# Timers aggregating the API calls of the current operation
+_collecting: 'contextvars.ContextVar[Tuple[PhaseTimer, ...]]' = contextvars.ContextVar(
+    'vcf_collecting_timers', default=())
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class PhaseTimer:
+    """Durations of named phases and aggregated API calls."""
+
+    def __init__(self, label: str):
+        """Initialize the timer.
+
+        Args:
+            label: Name of the timed operation, used in log messages
+        """
+        self.label = label
+        self.phases: Dict[str, float] = {}
+        # 'METHOD endpoint' -> [count, total seconds, max seconds]
+        self.calls: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block as a named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record a phase measured elsewhere; repeated names accumulate."""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        logger.debug(f"{self.label} phase {name} took {_ms(seconds)}ms",
+                     extra={'phase': f"{self.label}.{name}", 'duration_ms': _ms(seconds)})
+
+    def record_call(self, call: str, seconds: float) -> None:
+        """Aggregate one API call."""
+        with self._lock:
+            stats = self.calls.get(call)
+            if stats is None:
+                self.calls[call] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    @contextmanager
+    def collecting(self) -> Iterator['PhaseTimer']:
+        """Aggregate API calls made in this context while the block runs."""
+        token = _collecting.set(_collecting.get() + (self,))
+        try:
+            yield self
+        finally:
+            _collecting.reset(token)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the timer was created."""
+        return time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return phase durations and API call statistics in milliseconds."""
+        with self._lock:
+            timings: Dict[str, Any] = {
+                'total_ms': _ms(self.elapsed),
+                'phases': {name: _ms(seconds) for name, seconds in self.phases.items()},
+            }
+            if self.calls:
+                timings['api_calls'] = {
+                    call: {'count': int(count), 'total_ms': _ms(total), 'max_ms': _ms(peak)}
+                    for call, (count, total, peak) in sorted(self.calls.items())
+                }
+        return timings
+
+    def log_summary(self, level: int = logging.INFO) -> Dict[str, Any]:
+        """Log and return the timings."""
+        timings = self.to_dict()
+        phases = ', '.join(f"{name}={ms}ms" for name, ms in timings['phases'].items())
+        logger.log(level, f"{self.label} took {timings['total_ms']}ms ({phases})",
+                   extra={'timings': timings})
+        return timings
+
+
+def record_call(call: str, seconds: float) -> None:
+    """Report an API call to the timers collecting in the current context."""
+    for timer in _collecting.get():
+        timer.record_call(call, seconds)
+
+
+def in_context(func: Callable[..., T]) -> Callable[..., T]:
+    """Bind a callable to the caller's collecting timers.
+
+    Call this where work is handed to another thread; each invocation runs
+    in its own copy of the captured context, so concurrent workers can share
+    one wrapper.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+@contextmanager
+def profiled(path: Optional[str] = None, top: int = 30) -> Iterator[None]:
+    """Run a block under cProfile and write the statistics.
+
+    cProfile only sees the thread that enters the block, so the profile
+    covers orchestration: configuration, scheduling and waiting on results.
+    Work done on executor and worker threads shows up as time spent waiting
+    for it; ``PhaseTimer`` timings cover those threads.
+
+    The binary profile (for ``python -m pstats`` or snakeviz) is written to
+    ``path`` and the top functions by cumulative time to ``path + '.txt'``.
+
+    Args:
+        path: Profile output file
+        top: Number of functions in the text summary
+    """
+    import cProfile
+    import pstats
+
+    path = path or DEFAULT_PROFILE
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        with open(f"{path}.txt", 'w') as f:
+            pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(top)
+        logger.info(f"Profile written to {path} (summary in {path}.txt)")
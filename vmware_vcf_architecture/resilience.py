@@ -0,0 +1,240 @@
+"""
+Client-side throttling and circuit breaking per API target.
+
+Every target (an SDDC Manager, vCenter or NSX Manager, identified by host and
+port) gets its own token-bucket rate limiter and circuit breaker. The limiter
+smooths bursts from worker pools into a steady request rate. The breaker
+counts consecutive transport errors and 5xx/429 responses; once the threshold
+is reached it opens and calls fail immediately instead of piling retries on a
+struggling server. After the reset timeout one trial call is let through
+(half-open): success closes the circuit, failure opens it again.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Circuit states
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class TokenBucket:
+    """Token-bucket rate limiter."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity, defaults to one second worth of tokens
+        """
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst if burst else rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, sleeping until one is available.
+
+        Args:
+            timeout: Maximum seconds to wait, None waits as long as needed
+
+        Returns:
+            True if a token was taken, False if the timeout would be exceeded
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the breaker closed.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.failures = 0
+        self.opened = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout passed."""
+        with self._lock:
+            return self._current(time.monotonic())
+
+    def _current(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trial = False
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        with self._lock:
+            if self._current(time.monotonic()) != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a call may be made now.
+
+        In the half-open state only one trial call is allowed at a time.
+        """
+        with self._lock:
+            state = self._current(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give back a call allowed by ``allow`` that was never sent."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self._state = CLOSED
+            self._trial = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+
+class TargetGuard:
+    """Rate limiter and circuit breaker of one API target."""
+
+    __slots__ = ('target', 'limiter', 'breaker', 'throttled', 'rejected')
+
+    def __init__(self, target: str, limiter: Optional[TokenBucket] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.target = target
+        self.limiter = limiter
+        self.breaker = breaker
+        self.throttled = 0
+        self.rejected = 0
+
+    def state(self) -> Dict[str, Any]:
+        """Return the guard state for health reporting."""
+        state: Dict[str, Any] = {'throttled': self.throttled, 'rejected': self.rejected}
+        if self.limiter is not None:
+            state['rate_limit'] = self.limiter.rate
+            state['tokens'] = round(self.limiter.tokens, 2)
+        if self.breaker is not None:
+            state.update({
+                'circuit': self.breaker.state,
+                'failures': self.breaker.failures,
+                'opened': self.breaker.opened,
+            })
+        return state
+
+
+class TargetGuards:
+    """Per-target guards created on first use from shared settings."""
+
+    def __init__(self, rate_limit: float = 0, burst: Optional[float] = None,
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the registry.
+
+        Args:
+            rate_limit: Requests per second per target, 0 disables throttling
+            burst: Requests allowed back to back, defaults to the rate
+            rate_limits: Per-target rates keyed by host[:port], e.g.
+                {'nsx01.example.com': 5}
+            failure_threshold: Consecutive failures that open a circuit,
+                0 disables circuit breaking
+            reset_timeout: Seconds a circuit stays open before a trial call
+        """
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.rate_limits = dict(rate_limits or {})
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._guards: Dict[str, TargetGuard] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'TargetGuards':
+        """Create guards from the ``performance`` configuration section."""
+        performance = config.get('performance') or {}
+        return cls(
+            rate_limit=performance.get('rate_limit', 0),
+            burst=performance.get('rate_limit_burst'),
+            rate_limits=performance.get('rate_limits'),
+            failure_threshold=performance.get('circuit_failure_threshold', 5),
+            reset_timeout=performance.get('circuit_reset_timeout', 30),
+        )
+
+    def get(self, target: str) -> TargetGuard:
+        """Return the guard of a target, creating it on first use."""
+        guard = self._guards.get(target)
+        if guard is not None:
+            return guard
+        with self._lock:
+            guard = self._guards.get(target)
+            if guard is None:
+                rate = self.rate_limits.get(target, self.rate_limit)
+                guard = TargetGuard(
+                    target,
+                    limiter=TokenBucket(rate, self.burst) if rate > 0 else None,
+                    breaker=CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                    if self.failure_threshold > 0 else None,
+                )
+                self._guards[target] = guard
+            return guard
+
+    @property
+    def open_circuits(self) -> int:
+        """Number of targets whose circuit is currently open."""
+        return sum(1 for guard in list(self._guards.values())
+                   if guard.breaker is not None and guard.breaker.state == OPEN)
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state of every target seen so far."""
+        return {target: guard.state() for target, guard in sorted(self._guards.items())}
@@ -0,0 +1,371 @@
+"""
+Incremental inventory sync against a persistent SQLite snapshot.
+
+The snapshot stores every inventory object keyed by section and object ID
+together with its modification time (when the API reports one) and a
+content digest. A sync revalidates each collection with the ETag recorded
+on the previous run, page by page for large collections, so unchanged
+collections cost bodiless 304s, and only objects whose modification stamp
+changed are written back. vSAN datastores are refetched only for clusters
+that were added or changed.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .client import SDDCManagerClient, VCFClientError
+from .inventory import COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Fields SDDC Manager and vCenter use to report object modification time
+MODIFIED_FIELDS = ('modifiedTime', 'lastModified', 'lastUpdateTime', 'updateTime')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    section TEXT NOT NULL,
+    id TEXT NOT NULL,
+    modified TEXT,
+    digest TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (section, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SyncResult:
+    """Summary of the changes applied by one sync."""
+
+    __slots__ = ('added', 'updated', 'removed', 'unchanged_sections', 'errors')
+
+    def __init__(self) -> None:
+        self.added: Dict[str, List[str]] = {}
+        self.updated: Dict[str, List[str]] = {}
+        self.removed: Dict[str, List[str]] = {}
+        self.unchanged_sections: List[str] = []
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def changed(self) -> bool:
+        """Return True if any object was added, updated or removed."""
+        return any(self.added.values()) or any(self.updated.values()) or any(self.removed.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the per-section change counts."""
+        return {
+            'added': {k: len(v) for k, v in self.added.items() if v},
+            'updated': {k: len(v) for k, v in self.updated.items() if v},
+            'removed': {k: len(v) for k, v in self.removed.items() if v},
+            'unchanged_sections': list(self.unchanged_sections),
+            'errors': dict(self.errors),
+        }
+
+
+def object_stamp(obj: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    """Return the modification time and content digest of an object."""
+    modified = next((str(obj[f]) for f in MODIFIED_FIELDS if obj.get(f)), None)
+    body = json.dumps(obj, sort_keys=True, separators=(',', ':'))
+    return modified, hashlib.sha1(body.encode()).hexdigest()
+
+
+class InventorySnapshot:
+    """SQLite-backed store of the last synced inventory."""
+
+    def __init__(self, path: str = ':memory:'):
+        """Open or create a snapshot.
+
+        Args:
+            path: SQLite database file, ``:memory:`` for a transient snapshot
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def stamps(self, section: str) -> Dict[str, Tuple[Optional[str], str]]:
+        """Return the stored (modified, digest) pair of every object in a section."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, modified, digest FROM objects WHERE section = ?', (section,)
+            ).fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def objects(self, section: str) -> List[Dict[str, Any]]:
+        """Return every stored object of a section."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT body FROM objects WHERE section = ? ORDER BY id', (section,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def apply(self, section: str, upserts: Iterable[Dict[str, Any]],
+              deletes: Iterable[str]) -> None:
+        """Apply a delta to one section in a single transaction.
+
+        Args:
+            section: Inventory section name
+            upserts: Objects to insert or replace
+            deletes: IDs of objects to remove
+        """
+        rows = []
+        for obj in upserts:
+            modified, digest = object_stamp(obj)
+            rows.append((section, obj['id'], modified, digest,
+                         json.dumps(obj, separators=(',', ':'))))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?)', rows
+            )
+            self._conn.executemany(
+                'DELETE FROM objects WHERE section = ? AND id = ?',
+                [(section, object_id) for object_id in deletes],
+            )
+
+    def get_state(self, key: str) -> Optional[str]:
+        """Return a sync state value."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM sync_state WHERE key = ?', (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: Optional[str]) -> None:
+        """Store a sync state value."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?)', (key, value)
+            )
+
+    def load(self) -> Dict[str, Any]:
+        """Return the snapshot in the shape produced by ``InventoryCollector``."""
+        inventory: Dict[str, Any] = {
+            section: self.objects(section) for section in list(COLLECTIONS) + ['vsan_datastores']
+        }
+        inventory['collected_at'] = self.get_state('last_sync')
+        inventory['errors'] = {}
+        return inventory
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+
+class DeltaSync:
+    """Synchronizes an inventory snapshot with SDDC Manager."""
+
+    def __init__(self, client: SDDCManagerClient, snapshot: InventorySnapshot,
+                 max_workers: int = 4, page_size: int = 100):
+        """Initialize the synchronizer.
+
+        Args:
+            client: Pooled SDDC Manager client
+            snapshot: Snapshot to update
+            max_workers: Number of collections fetched concurrently
+            page_size: Number of objects requested per page
+        """
+        self.client = client
+        self.snapshot = snapshot
+        self.max_workers = max(1, int(max_workers))
+        self.page_size = max(1, int(page_size))
+
+    def _fetch(self, section: str, path: str
+               ) -> Tuple[Optional[List[Dict[str, Any]]], Dict[str, Optional[str]]]:
+        """Fetch a collection page by page, revalidating each page with its ETag.
+
+        Pages that answer 304 are rebuilt from the snapshot using the object
+        IDs recorded for them, so a change on one page of a large collection
+        only costs that page's body.
+
+        Returns:
+            Tuple of (elements, or None if no page changed since the last sync;
+            sync state to record once the elements are stored)
+        """
+        paging = json.loads(self.snapshot.get_state(f"pages:{section}") or 'null') or {}
+        page_ids: List[List[str]] = paging.get('ids') or []
+        validators = [self.snapshot.get_state(f"etag:{section}")] + (paging.get('etags') or [])
+        pages: List[Optional[List[Dict[str, Any]]]] = []
+        etags: List[Optional[str]] = []
+        total = max(1, len(page_ids))
+        while len(pages) < total:
+            number = len(pages)
+            etag = validators[number] if number < len(validators) else None
+            headers = {'If-None-Match': etag} if etag else {}
+            response = self.client.request(
+                'GET', path, headers=headers,
+                params={'pageNumber': number, 'pageSize': self.page_size},
+            )
+            if response.status_code == 304:
+                if number == 0 and not page_ids:
+                    return None, {}
+                pages.append(None)
+                etags.append(etag)
+                continue
+            body = response.json() if response.content else []
+            if not isinstance(body, dict):
+                return list(body or []), {f"etag:{section}": response.headers.get('ETag'),
+                                          f"pages:{section}": None}
+            pages.append(body.get('elements') or [])
+            etags.append(response.headers.get('ETag'))
+            total = max(1, int((body.get('pageMetadata') or {}).get('totalPages', 1)))
+
+        if all(page is None for page in pages) and len(pages) == len(page_ids):
+            return None, {}
+        state: Dict[str, Optional[str]] = {f"etag:{section}": etags[0], f"pages:{section}": None}
+        if len(pages) == 1:
+            return pages[0], state
+
+        stored = {}
+        if any(page is None for page in pages):
+            stored = {obj['id']: obj for obj in self.snapshot.objects(section)}
+        elements: List[Dict[str, Any]] = []
+        ids = []
+        for number, page in enumerate(pages):
+            if page is None:
+                page = [stored[i] for i in page_ids[number] if i in stored]
+            elements.extend(page)
+            ids.append([obj.get('id') for obj in page])
+        state[f"pages:{section}"] = json.dumps({'etags': etags[1:], 'ids': ids})
+        return elements, state
+
+    def _delta(self, section: str, elements: List[Dict[str, Any]],
+               prune: bool = True) -> Tuple[List[Dict[str, Any]], List[str], List[str], List[str]]:
+        """Compute the delta between fetched objects and the snapshot.
+
+        Returns:
+            Tuple of (objects to store, added IDs, updated IDs, removed IDs)
+        """
+        stored = self.snapshot.stamps(section)
+        upserts = []
+        added, updated = [], []
+        for obj in elements:
+            object_id = obj.get('id')
+            if not object_id:
+                continue
+            previous = stored.get(object_id)
+            stamp = object_stamp(obj)
+            if previous is None:
+                added.append(object_id)
+                upserts.append(obj)
+            elif (stamp[0] or stamp[1]) != (previous[0] or previous[1]):
+                updated.append(object_id)
+                upserts.append(obj)
+
+        seen = {obj.get('id') for obj in elements}
+        removed = [object_id for object_id in stored if object_id not in seen] if prune else []
+        return upserts, added, updated, removed
+
+    def _diff(self, section: str, elements: List[Dict[str, Any]], result: SyncResult) -> None:
+        """Compute and apply the delta between fetched objects and the snapshot."""
+        upserts, added, updated, removed = self._delta(section, elements)
+        self.snapshot.apply(section, upserts, removed)
+        result.added[section] = added
+        result.updated[section] = updated
+        result.removed[section] = removed
+
+    def sync(self) -> SyncResult:
+        """Bring the snapshot up to date.
+
+        Returns:
+            Summary of the applied changes
+        """
+        result = SyncResult()
+        sections = list(COLLECTIONS)
+        clusters = None
+
+        def fetch(section: str) -> Any:
+            try:
+                return self._fetch(section, COLLECTIONS[section])
+            except VCFClientError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='vcf-sync') as executor:
+            fetched = list(executor.map(fetch, sections))
+
+            for section, outcome in zip(sections, fetched):
+                if isinstance(outcome, VCFClientError):
+                    logger.warning(f"Delta sync of {section} failed: {outcome}")
+                    result.errors[section] = str(outcome)
+                    continue
+                elements, state = outcome
+                if elements is None:
+                    result.unchanged_sections.append(section)
+                    continue
+                if section == 'clusters':
+                    # Stored together with their datastores below
+                    clusters = outcome
+                    continue
+                self._diff(section, elements, result)
+                # Record the validators only once the delta is safely stored
+                self._save_state(state)
+
+            for section in ('clusters', 'vsan_datastores'):
+                result.added[section] = []
+                result.updated[section] = []
+                result.removed[section] = []
+            if clusters is not None:
+                self._sync_clusters(executor, *clusters, result)
+
+        self.snapshot.set_state('last_sync', datetime.now(timezone.utc).isoformat())
+        logger.info(f"Inventory delta sync: {result.to_dict()}")
+        return result
+
+    def _save_state(self, state: Dict[str, Optional[str]]) -> None:
+        """Record the validators returned by _fetch."""
+        for key, value in state.items():
+            self.snapshot.set_state(key, value)
+
+    def _sync_clusters(self, executor: ThreadPoolExecutor, elements: List[Dict[str, Any]],
+                       state: Dict[str, Optional[str]], result: SyncResult) -> None:
+        """Apply the cluster delta together with the datastores of changed clusters.
+
+        A cluster row is only stored once its datastores are, and the
+        collection's ETags only once every changed cluster was, so a cluster
+        whose datastores could not be read is picked up again by the next sync.
+        """
+        upserts, added, updated, removed = self._delta('clusters', elements)
+        changed = added + updated
+        listings = dict(zip(changed, executor.map(
+            lambda cluster_id: self._cluster_datastores(cluster_id, result), changed)))
+        failed = {cluster_id for cluster_id, listing in listings.items() if listing is None}
+
+        datastores = [d for listing in listings.values() if listing for d in listing]
+        ds_upserts, ds_added, ds_updated, _ = self._delta('vsan_datastores', datastores,
+                                                          prune=False)
+        # Prune per refetched or removed cluster; other clusters were not read
+        scope = (set(changed) - failed) | set(removed)
+        fresh = {d.get('id') for d in datastores}
+        ds_removed = [d['id'] for d in self.snapshot.objects('vsan_datastores')
+                      if (d.get('cluster') or {}).get('id') in scope and d['id'] not in fresh]
+        self.snapshot.apply('vsan_datastores', ds_upserts, ds_removed)
+        result.added['vsan_datastores'] = ds_added
+        result.updated['vsan_datastores'] = ds_updated
+        result.removed['vsan_datastores'] = ds_removed
+
+        self.snapshot.apply('clusters', [c for c in upserts if c['id'] not in failed], removed)
+        result.added['clusters'] = [i for i in added if i not in failed]
+        result.updated['clusters'] = [i for i in updated if i not in failed]
+        result.removed['clusters'] = removed
+        if not failed:
+            self._save_state(state)
+
+    def _cluster_datastores(self, cluster_id: str,
+                            result: SyncResult) -> Optional[List[Dict[str, Any]]]:
+        """Fetch the vSAN datastores of one cluster, or None if the read failed."""
+        try:
+            body = self.client.get(f"/v1/clusters/{cluster_id}/datastores", use_cache=False)
+        except VCFClientError as e:
+            result.errors[f"vsan:{cluster_id}"] = str(e)
+            return None
+        elements = (body.get('elements') or []) if isinstance(body, dict) else list(body or [])
+        return [d for d in elements if d.get('type', 'VSAN') == 'VSAN']
@@ -0,0 +1,274 @@
+"""
+Multiplexed tracking of long-running SDDC Manager tasks.
+
+Domain deployments, host commissioning and similar operations return a task
+that has to be polled until it finishes. Instead of one polling loop per
+task, every outstanding task is registered with a single ``TaskTracker``.
+Each round lists the in-progress tasks with one paginated query; tasks that
+have left that list are read individually, or with one listing of all tasks
+when many finish in the same round. The interval starts
+short and backs off while nothing changes. Completion is published through
+``concurrent.futures.Future`` objects, so callers can block, wait on several
+tasks, or attach callbacks.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .client import SDDCManagerClient, VCFClientError
+from .metrics import QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+SUCCESSFUL = 'SUCCESSFUL'
+TERMINAL_STATUSES = frozenset((SUCCESSFUL, 'FAILED', 'CANCELLED'))
+
+# Tasks leaving the in-progress list are read individually up to this count;
+# beyond it one listing of all tasks is cheaper.
+INDIVIDUAL_READ_LIMIT = 5
+
+
+class TaskFailedError(VCFClientError):
+    """Raised through a task's future when the task does not succeed."""
+
+    def __init__(self, task: Dict[str, Any]):
+        self.task = task
+        super().__init__(
+            f"Task {task.get('id')} ({task.get('name', 'unnamed')}) "
+            f"finished with status {task.get('status')}"
+        )
+
+
+class TaskTracker:
+    """Single poller for every outstanding SDDC Manager task."""
+
+    def __init__(self, client: SDDCManagerClient, min_interval: float = 1.0,
+                 max_interval: float = 30.0, backoff: float = 1.5):
+        """Initialize the tracker.
+
+        Args:
+            client: Pooled SDDC Manager client
+            min_interval: Seconds between polls right after a change
+            max_interval: Upper bound for the interval while nothing changes
+            backoff: Factor the interval grows by after an idle round
+        """
+        self.client = client
+        self.min_interval = max(0.01, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.backoff = max(1.0, float(backoff))
+        self.interval = self.min_interval
+        self._pending: Dict[str, 'Future[Dict[str, Any]]'] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._bulk = True
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, client: SDDCManagerClient, config: Dict[str, Any]) -> 'TaskTracker':
+        """Create a tracker from the ``performance`` configuration section."""
+        performance = config.get('performance') or {}
+        return cls(
+            client,
+            min_interval=performance.get('task_poll_interval', 1.0),
+            max_interval=performance.get('task_poll_max_interval', 30.0),
+        )
+
+    @property
+    def outstanding(self) -> int:
+        """Number of tasks that have not finished yet."""
+        with self._lock:
+            return len(self._pending)
+
+    def pending_ids(self) -> List[str]:
+        """IDs of the tasks that have not finished yet."""
+        with self._lock:
+            return list(self._pending)
+
+    def status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return the last task body seen for a task that has not finished.
+
+        Finished tasks are forgotten once their future is resolved; the
+        final body is the future's result.
+        """
+        with self._lock:
+            return self._last.get(task_id)
+
+    def track(self, task_id: str,
+              callback: Optional[Callable[['Future[Dict[str, Any]]'], None]] = None
+              ) -> 'Future[Dict[str, Any]]':
+        """Start tracking a task.
+
+        Tracking the same task again returns the existing future.
+
+        Args:
+            task_id: SDDC Manager task ID
+            callback: Optional callable invoked with the future once the task
+                finishes, on the poller thread
+
+        Returns:
+            Future resolving to the final task body, or raising
+            ``TaskFailedError`` if the task failed or was cancelled and
+            ``VCFClientError`` if SDDC Manager does not know the task
+        """
+        with self._lock:
+            future = self._pending.get(task_id)
+            if future is None:
+                future = Future()
+                future.set_running_or_notify_cancel()
+                self._pending[task_id] = future
+                QUEUE_DEPTH.set(len(self._pending), 'tasks')
+        if callback is not None:
+            future.add_done_callback(callback)
+        self.interval = self.min_interval
+        self.start()
+        self._wakeup.set()
+        return future
+
+    def wait(self, futures: Iterable['Future[Dict[str, Any]]'],
+             timeout: Optional[float] = None) -> bool:
+        """Wait until every given task has finished.
+
+        Returns:
+            True if all tasks finished within the timeout
+        """
+        _, not_done = wait(list(futures), timeout=timeout)
+        return not not_done
+
+    def poll(self) -> int:
+        """Run one polling round.
+
+        Returns:
+            Number of tasks that finished in this round
+        """
+        with self._lock:
+            task_ids = list(self._pending)
+        if not task_ids:
+            return 0
+
+        running = self._running_tasks()
+        if running is None:
+            tasks: Dict[str, Dict[str, Any]] = {}
+            departed = task_ids
+        else:
+            tasks = {task_id: running[task_id] for task_id in task_ids if task_id in running}
+            departed = [task_id for task_id in task_ids if task_id not in running]
+            if len(departed) > INDIVIDUAL_READ_LIMIT:
+                tasks.update(self._list_tasks(departed))
+                departed = [task_id for task_id in departed if task_id not in tasks]
+
+        finished = 0
+        for task_id in departed:
+            try:
+                tasks[task_id] = self.client.get(f"/v1/tasks/{task_id}", use_cache=False)
+            except VCFClientError as e:
+                if e.status_code == 404:
+                    finished += self._fail(task_id, e)
+                else:
+                    logger.warning(f"Polling task {task_id} failed: {e}")
+        return finished + sum(self._update(task_id, task) for task_id, task in tasks.items())
+
+    def _running_tasks(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """List in-progress tasks in bulk, or None if the query is unavailable."""
+        if not self._bulk:
+            return None
+        try:
+            return {
+                task['id']: task for task in self.client.iter_elements(
+                    '/v1/tasks', params={'status': 'IN_PROGRESS'}, use_cache=False)
+            }
+        except VCFClientError as e:
+            if e.status_code in (400, 404, 405):
+                logger.info("Bulk task query unsupported, polling tasks individually")
+                self._bulk = False
+            else:
+                logger.warning(f"Bulk task query failed: {e}")
+            return None
+
+    def _list_tasks(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read several tasks with one listing of all tasks."""
+        wanted = set(task_ids)
+        try:
+            return {
+                task['id']: task for task in self.client.iter_elements(
+                    '/v1/tasks', use_cache=False) if task.get('id') in wanted
+            }
+        except VCFClientError as e:
+            logger.warning(f"Task listing failed: {e}")
+            return {}
+
+    def _update(self, task_id: str, task: Dict[str, Any]) -> int:
+        """Record a task body and resolve its future if it finished."""
+        status = str(task.get('status', '')).upper()
+        with self._lock:
+            self._last[task_id] = task
+            if status not in TERMINAL_STATUSES:
+                return 0
+            future = self._pending.pop(task_id, None)
+            QUEUE_DEPTH.set(len(self._pending), 'tasks')
+        if future is not None:
+            logger.info(f"Task {task_id} finished with status {status}")
+            if status == SUCCESSFUL:
+                future.set_result(task)
+            else:
+                future.set_exception(TaskFailedError(task))
+        with self._lock:
+            if task_id not in self._pending:
+                self._last.pop(task_id, None)
+        return 0 if future is None else 1
+
+    def _fail(self, task_id: str, error: VCFClientError) -> int:
+        """Stop tracking a task SDDC Manager no longer knows and fail its future."""
+        with self._lock:
+            future = self._pending.pop(task_id, None)
+            self._last.pop(task_id, None)
+            QUEUE_DEPTH.set(len(self._pending), 'tasks')
+        if future is None:
+            return 0
+        logger.warning(f"Task {task_id} not found, no longer tracking it: {error}")
+        future.set_exception(VCFClientError(f"Task {task_id} not found", error.status_code))
+        return 1
+
+    def _run(self) -> None:
+        """Poll until stopped, backing off while nothing changes."""
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                return
+            try:
+                finished = self.poll()
+            except Exception as e:
+                logger.exception(f"Task polling round failed: {e}")
+                finished = 0
+            if finished:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+
+    def start(self) -> 'TaskTracker':
+        """Start the poller thread if it is not running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='vcf-task-poller',
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the poller; outstanding futures stay pending."""
+        self._stop.set()
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def __enter__(self) -> 'TaskTracker':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
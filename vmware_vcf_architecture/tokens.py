@@ -0,0 +1,208 @@
+"""
+On-disk cache of SDDC Manager access tokens.
+
+Short-lived processes (CLI runs, cron jobs, exec probes) would otherwise
+log in on every start. Tokens are stored per endpoint and user in one JSON
+file that every process on the host shares: readers take a shared
+``flock`` on a sidecar lock file, writers an exclusive one, and the file is
+replaced atomically with owner-only permissions.
+
+With ``security.enable_encryption`` each entry is encrypted with Fernet
+under a key derived from the account's password (PBKDF2 with a per-entry
+salt), so the file is useless without the credentials it caches. If the
+``cryptography`` dependency is missing from the installation the cache is
+disabled rather than falling back to plaintext.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# PBKDF2-SHA256 rounds for the per-entry encryption key
+KEY_ITERATIONS = 100_000
+# Seconds a cached refresh token is kept after its access token expired
+REFRESH_GRACE = 86400
+
+
+def _fernet(password: str, salt: bytes) -> Any:
+    """Build the Fernet cipher for an entry."""
+    from cryptography.fernet import Fernet
+    key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, KEY_ITERATIONS, dklen=32)
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+class TokenCache:
+    """Token pairs shared between processes through a locked file."""
+
+    def __init__(self, path: str, encrypt: bool = True):
+        """Initialize the cache.
+
+        Args:
+            path: Cache file; ``~`` is expanded and parent directories are
+                created with owner-only permissions on first write
+            encrypt: Encrypt entries with a key derived from the password
+        """
+        self.path = os.path.expanduser(path)
+        self.encrypt = encrypt
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['TokenCache']:
+        """Build the cache from the security settings.
+
+        Returns:
+            Cache for ``security.token_cache_file``, or None when no file is
+            configured or encryption is enabled but unavailable
+        """
+        security = config.get('security') or {}
+        path = security.get('token_cache_file')
+        if not path:
+            return None
+        encrypt = security.get('enable_encryption', True)
+        if encrypt:
+            try:
+                import cryptography.fernet  # noqa: F401
+            except ImportError:
+                logger.warning("Token cache disabled: security.enable_encryption requires "
+                               "cryptography, which is not installed")
+                return None
+        return cls(path, encrypt=encrypt)
+
+    @staticmethod
+    def key(endpoint: str, username: str) -> str:
+        """Entry key for an endpoint and user, without revealing either."""
+        return hashlib.sha256(f"{endpoint}\0{username}".encode()).hexdigest()
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """Hold the cache's sidecar lock."""
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(self.path) or '.'
+        if exclusive:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        elif not os.path.isdir(directory):
+            yield
+            return
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(fd)
+
+    def _read(self) -> Dict[str, Any]:
+        """Read all entries, treating a missing or damaged file as empty."""
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        """Atomically replace the file with owner-only permissions."""
+        directory = os.path.dirname(self.path) or '.'
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tokens-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self, endpoint: str, username: str,
+             password: str) -> Optional[Tuple[Optional[str], Optional[str], float]]:
+        """Look up the token pair of an endpoint and user.
+
+        Returns:
+            (access token, refresh token, seconds the access token remains
+            valid) or None if nothing usable is cached. The access token is
+            None once expired while the refresh token is still kept.
+        """
+        with self._locked(exclusive=False):
+            entry = self._read().get(self.key(endpoint, username))
+        if not isinstance(entry, dict):
+            return None
+        remaining = float(entry.get('expires_at', 0)) - time.time()
+        if remaining + REFRESH_GRACE <= 0:
+            return None
+        try:
+            if self.encrypt:
+                from cryptography.fernet import InvalidToken
+                try:
+                    data = _fernet(password, base64.b64decode(entry['salt'])).decrypt(
+                        entry['tokens'].encode())
+                except InvalidToken:
+                    # Written with other credentials, e.g. before a password change
+                    return None
+                tokens = json.loads(data)
+            else:
+                tokens = entry['tokens']
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Ignoring damaged token cache entry: {e}")
+            return None
+        access = tokens.get('access') if remaining > 0 else None
+        return access, tokens.get('refresh'), max(0.0, remaining)
+
+    def store(self, endpoint: str, username: str, password: str,
+              access: Optional[str], refresh: Optional[str], ttl: float) -> None:
+        """Save the token pair of an endpoint and user.
+
+        Args:
+            endpoint: SDDC Manager endpoint
+            username: Account the tokens belong to
+            password: Account password, used to derive the encryption key
+            access: Access token
+            refresh: Refresh token
+            ttl: Seconds the access token remains valid
+        """
+        tokens: Any = {'access': access, 'refresh': refresh}
+        entry: Dict[str, Any] = {'expires_at': time.time() + ttl}
+        if self.encrypt:
+            salt = os.urandom(16)
+            entry['salt'] = base64.b64encode(salt).decode()
+            entry['tokens'] = _fernet(password, salt).encrypt(
+                json.dumps(tokens).encode()).decode()
+        else:
+            entry['tokens'] = tokens
+        try:
+            with self._locked(exclusive=True):
+                now = time.time()
+                entries = {
+                    key: value for key, value in self._read().items()
+                    if isinstance(value, dict)
+                    and float(value.get('expires_at', 0)) + REFRESH_GRACE > now
+                }
+                entries[self.key(endpoint, username)] = entry
+                self._write(entries)
+        except OSError as e:
+            logger.warning(f"Could not write token cache {self.path}: {e}")
+
+    def discard(self, endpoint: str, username: str) -> None:
+        """Forget the tokens of an endpoint and user."""
+        try:
+            with self._locked(exclusive=True):
+                entries = self._read()
+                if entries.pop(self.key(endpoint, username), None) is not None:
+                    self._write(entries)
+        except OSError as e:
+            logger.warning(f"Could not write token cache {self.path}: {e}")
@@ -0,0 +1,435 @@
+"""
+Deployment validation engine.
+
+Validation checks form a dependency DAG that is executed on a thread pool.
+A check starts as soon as every check it depends on has passed, is skipped
+when one of them did not pass, and is abandoned with a ``timeout`` status
+once its own time budget runs out, so one hung endpoint never holds up
+independent checks. Results are yielded as each check finishes. Discovery
+checks may register further checks while running (one per workload domain,
+for example), so discovery itself is bounded by the same time budgets.
+"""
+
+import logging
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from .client import SDDCManagerClient
+from .profiling import in_context
+
+logger = logging.getLogger(__name__)
+
+PASSED = 'passed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+TIMEOUT = 'timeout'
+ERROR = 'error'
+
+# A check returns (passed, message)
+CheckFunc = Callable[[], Tuple[bool, str]]
+
+
+class Check:
+    """A single validation step."""
+
+    __slots__ = ('name', 'func', 'depends_on', 'timeout')
+
+    def __init__(self, name: str, func: CheckFunc, depends_on: Sequence[str] = (),
+                 timeout: Optional[float] = None):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+
+class CheckResult:
+    """Outcome of a validation step."""
+
+    __slots__ = ('name', 'status', 'message', 'duration')
+
+    def __init__(self, name: str, status: str, message: str = '', duration: float = 0.0):
+        self.name = name
+        self.status = status
+        self.message = message
+        self.duration = duration
+
+    @property
+    def passed(self) -> bool:
+        """Return True if the check passed."""
+        return self.status == PASSED
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a dictionary."""
+        return {
+            'name': self.name,
+            'status': self.status,
+            'message': self.message,
+            'duration': round(self.duration, 3),
+        }
+
+
+class ValidationEngine:
+    """Dependency-aware parallel check runner."""
+
+    def __init__(self, max_workers: int = 4, default_timeout: float = 30,
+                 deadline: Optional[float] = None):
+        """Initialize the engine.
+
+        Args:
+            max_workers: Maximum number of checks running at once
+            default_timeout: Time budget in seconds for checks without their own
+            deadline: Optional time budget in seconds for the whole run
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.default_timeout = default_timeout
+        self.deadline = deadline
+        self.checks: Dict[str, Check] = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    def add(self, name: str, func: CheckFunc, depends_on: Sequence[str] = (),
+            timeout: Optional[float] = None) -> None:
+        """Register a check.
+
+        Checks may be added while the engine runs, typically by a discovery
+        check; they may then only depend on checks that already exist.
+
+        Args:
+            name: Unique check name
+            func: Callable returning (passed, message)
+            depends_on: Names of checks that must pass first
+            timeout: Time budget in seconds, defaults to the engine default
+        """
+        with self._lock:
+            if name in self.checks:
+                raise ValueError(f"Duplicate validation check: {name}")
+            if self._running:
+                unknown = [dep for dep in depends_on if dep not in self.checks]
+                if unknown:
+                    raise ValueError(f"Check {name} depends on unknown check {unknown[0]}")
+            self.checks[name] = Check(name, func, depends_on, timeout)
+
+    def _verify_graph(self) -> None:
+        """Reject unknown dependencies and dependency cycles."""
+        for check in self.checks.values():
+            for dep in check.depends_on:
+                if dep not in self.checks:
+                    raise ValueError(f"Check {check.name} depends on unknown check {dep}")
+
+        remaining = {name: set(check.depends_on) for name, check in self.checks.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between checks: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    @staticmethod
+    def _execute(check: Check) -> CheckResult:
+        """Run one check and convert its outcome to a result."""
+        start = time.monotonic()
+        try:
+            passed, message = check.func()
+            status = PASSED if passed else FAILED
+        except Exception as e:
+            status, message = ERROR, f"{type(e).__name__}: {e}"
+        return CheckResult(check.name, status, message, time.monotonic() - start)
+
+    def run(self) -> Iterator[CheckResult]:
+        """Run every check, yielding results as they complete.
+
+        Yields:
+            Check results in completion order
+        """
+        self._verify_graph()
+        with self._lock:
+            self._running = True
+            pending = dict(self.checks)
+        known = set(pending)
+        expired = False
+        results: Dict[str, CheckResult] = {}
+        running: Dict[Future, Tuple[Check, float, float]] = {}
+        started = time.monotonic()
+        run_deadline = started + self.deadline if self.deadline else None
+
+        executors = [self._executor(len(pending))]
+        execute = in_context(self._execute)
+        try:
+            while True:
+                with self._lock:
+                    added = [check for name, check in self.checks.items() if name not in known]
+                for check in added:
+                    known.add(check.name)
+                    if expired:
+                        result = CheckResult(check.name, SKIPPED, 'Validation deadline exceeded')
+                        results[check.name] = result
+                        yield result
+                    else:
+                        pending[check.name] = check
+                if added and not expired:
+                    # The current pool has no headroom for threads abandoned
+                    # by the new checks, so submit from here on to a fresh one.
+                    executors.append(self._executor(len(pending)))
+                if not pending and not running:
+                    break
+
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name, check in list(pending.items()):
+                        states = [results.get(dep) for dep in check.depends_on]
+                        blocked = [r.name for r in states if r is not None and not r.passed]
+                        if blocked:
+                            del pending[name]
+                            result = CheckResult(
+                                name, SKIPPED, f"Dependency not passed: {', '.join(blocked)}"
+                            )
+                            results[name] = result
+                            progressed = True
+                            yield result
+                        elif all(states) and len(running) < self.max_workers:
+                            del pending[name]
+                            now = time.monotonic()
+                            budget = check.timeout or self.default_timeout
+                            future = executors[-1].submit(execute, check)
+                            running[future] = (check, now, now + budget)
+
+                if not running:
+                    continue
+
+                next_deadline = min(deadline for _, _, deadline in running.values())
+                if run_deadline is not None:
+                    next_deadline = min(next_deadline, run_deadline)
+                done, _ = wait(list(running), timeout=max(0.0, next_deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    running.pop(future)
+                    result = future.result()
+                    results[result.name] = result
+                    yield result
+
+                now = time.monotonic()
+                expired_run = run_deadline is not None and now >= run_deadline
+                for future, (check, begun, deadline) in list(running.items()):
+                    if expired_run or now >= deadline:
+                        running.pop(future)
+                        result = CheckResult(check.name, TIMEOUT,
+                                             'Check exceeded its time budget', now - begun)
+                        results[check.name] = result
+                        yield result
+
+                if expired_run:
+                    expired = True
+                    for name in list(pending):
+                        del pending[name]
+                        result = CheckResult(name, SKIPPED, 'Validation deadline exceeded')
+                        results[name] = result
+                        yield result
+        finally:
+            with self._lock:
+                self._running = False
+            for executor in executors:
+                executor.shutdown(wait=False)
+
+    def _executor(self, checks: int) -> ThreadPoolExecutor:
+        """Create a pool for running up to ``checks`` checks.
+
+        Abandoned (timed out) checks keep their thread, so allow enough
+        threads that they never eat into the concurrency budget.
+
+        Args:
+            checks: Number of checks that will be submitted to the pool
+
+        Returns:
+            Thread pool
+        """
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers + checks,
+            thread_name_prefix='vcf-validate',
+        )
+
+
+def summarize_results(results: List[CheckResult], duration: float) -> Dict[str, Any]:
+    """Build the validation report.
+
+    Args:
+        results: Check results
+        duration: Total validation time in seconds
+
+    Returns:
+        Report dictionary
+    """
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return {
+        'status': PASSED if all(r.passed for r in results) else FAILED,
+        'duration': round(duration, 3),
+        'counts': counts,
+        'results': [r.to_dict() for r in results],
+    }
+
+
+def _elements(body: Any) -> List[Dict[str, Any]]:
+    """Normalize a list or paginated response body to a list of elements."""
+    if isinstance(body, dict):
+        return body.get('elements') or []
+    return list(body or [])
+
+
+def _unhealthy(objects: List[Dict[str, Any]], label: str) -> List[str]:
+    """Return a description of every object reporting an error state."""
+    return [
+        f"{obj.get(label) or obj.get('id')} ({obj.get('status')})"
+        for obj in objects
+        if str(obj.get('status', 'ACTIVE')).upper() in ('ERROR', 'FAILED', 'DISCONNECTED')
+    ]
+
+
+def build_deployment_checks(client: SDDCManagerClient, config: Dict[str, Any]) -> ValidationEngine:
+    """Build the VCF deployment validation DAG.
+
+    Args:
+        client: Pooled SDDC Manager client
+        config: Full application configuration dictionary
+
+    Returns:
+        Engine loaded with the deployment checks
+    """
+    settings = config.get('validation') or {}
+    max_workers = (config.get('performance') or {}).get('max_workers', 4)
+    check_timeout = settings.get('check_timeout', 30)
+    min_nsx_nodes = settings.get('min_nsx_managers', 3)
+    cert_warning_days = settings.get('cert_expiry_warning_days', 30)
+    verify_ssl = (config.get('vcf') or {}).get('verify_ssl', True)
+    engine = ValidationEngine(max_workers=max_workers, default_timeout=check_timeout,
+                              deadline=settings.get('deadline'))
+
+    def fetch(path: str) -> List[Dict[str, Any]]:
+        return _elements(client.get(path, timeout=check_timeout, use_cache=False))
+
+    endpoint = urlparse(client.endpoint)
+    port = endpoint.port or (443 if endpoint.scheme == 'https' else 80)
+
+    def check_network() -> Tuple[bool, str]:
+        with socket.create_connection((endpoint.hostname, port), timeout=check_timeout):
+            pass
+        return True, f"{endpoint.hostname}:{port} reachable"
+
+    def check_certificates() -> Tuple[bool, str]:
+        if endpoint.scheme != 'https':
+            return True, 'TLS not in use'
+        if not verify_ssl:
+            return True, 'Certificate verification disabled (vcf.verify_ssl is false)'
+        context = ssl.create_default_context()
+        with socket.create_connection((endpoint.hostname, port), timeout=check_timeout) as sock:
+            with context.wrap_socket(sock, server_hostname=endpoint.hostname) as tls:
+                cert = tls.getpeercert() or {}
+        remaining = (ssl.cert_time_to_seconds(cert['notAfter']) - time.time()) / 86400
+        if remaining < cert_warning_days:
+            return False, f"Certificate expires in {remaining:.0f} days"
+        return True, f"Certificate valid for {remaining:.0f} days"
+
+    def check_sddc_manager() -> Tuple[bool, str]:
+        managers = fetch('/v1/sddc-managers')
+        if not managers:
+            return False, 'No SDDC Manager reported'
+        bad = _unhealthy(managers, 'fqdn')
+        if bad:
+            return False, f"Unhealthy: {', '.join(bad)}"
+        version = managers[0].get('version')
+        return True, f"SDDC Manager {version} responding" if version else 'SDDC Manager responding'
+
+    def check_vcenter() -> Tuple[bool, str]:
+        vcenters = fetch('/v1/vcenters')
+        if not vcenters:
+            return False, 'No vCenter Server registered'
+        bad = _unhealthy(vcenters, 'fqdn')
+        if bad:
+            return False, f"Unhealthy: {', '.join(bad)}"
+        return True, f"{len(vcenters)} vCenter Server(s) healthy"
+
+    def check_nsx() -> Tuple[bool, str]:
+        clusters = fetch('/v1/nsxt-clusters')
+        if not clusters:
+            return False, 'No NSX Manager cluster registered'
+        small = [c.get('vipFqdn') or c.get('id') for c in clusters
+                 if len(c.get('nodes') or []) < min_nsx_nodes]
+        bad = _unhealthy(clusters, 'vipFqdn')
+        if small:
+            return False, f"Fewer than {min_nsx_nodes} managers: {', '.join(small)}"
+        if bad:
+            return False, f"Unhealthy: {', '.join(bad)}"
+        return True, f"{len(clusters)} NSX Manager cluster(s) healthy"
+
+    def check_vsan() -> Tuple[bool, str]:
+        clusters = [c for c in fetch('/v1/clusters')
+                    if c.get('primaryDatastoreType', 'VSAN') == 'VSAN']
+        if not clusters:
+            return True, '0 vSAN cluster(s) have datastores'
+        # Datastores are read per cluster; fetch them concurrently
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(clusters)),
+                                thread_name_prefix='vcf-validate-vsan') as pool:
+            datastores = list(pool.map(
+                in_context(lambda c: fetch(f"/v1/clusters/{c['id']}/datastores")), clusters))
+        missing = [c.get('name') or c['id'] for c, stores in zip(clusters, datastores)
+                   if not any(d.get('type', 'VSAN') == 'VSAN' for d in stores)]
+        if missing:
+            return False, f"No vSAN datastore on: {', '.join(missing)}"
+        return True, f"{len(clusters)} vSAN cluster(s) have datastores"
+
+    def check_network_plan() -> Tuple[bool, str]:
+        from .config import load_spec
+        from .network import check_plan
+        conflicts = check_plan((path, load_spec(path)) for path in spec_files)
+        if conflicts:
+            shown = '; '.join(c.message for c in conflicts[:5])
+            more = f" (+{len(conflicts) - 5} more)" if len(conflicts) > 5 else ''
+            return False, f"{len(conflicts)} network plan conflict(s): {shown}{more}"
+        return True, f"No conflicts in {len(spec_files)} network plan(s)"
+
+    engine.add('network', check_network)
+    spec_files = list(settings.get('spec_files') or [])
+    if spec_files:
+        engine.add('network_plan', check_network_plan)
+    engine.add('certificates', check_certificates, depends_on=['network'])
+    engine.add('sddc_manager', check_sddc_manager, depends_on=['network'])
+    engine.add('vcenter', check_vcenter, depends_on=['sddc_manager'])
+    engine.add('nsx', check_nsx, depends_on=['sddc_manager'])
+    engine.add('vsan', check_vsan, depends_on=['vcenter'])
+
+    def check_domains() -> Tuple[bool, str]:
+        # Runs inside the engine, so a hung listing is bounded by the check
+        # timeout and the run deadline like every other call
+        domains = fetch('/v1/domains')
+        for domain in domains:
+            engine.add(f"domain:{domain.get('name') or domain['id']}",
+                       _domain_check(client, domain['id'], check_timeout),
+                       depends_on=['domains', 'vcenter', 'nsx'])
+        return True, f"{len(domains)} workload domain(s) found"
+
+    engine.add('domains', check_domains, depends_on=['sddc_manager'])
+    return engine
+
+
+def _domain_check(client: SDDCManagerClient, domain_id: str, timeout: float) -> CheckFunc:
+    """Build the health check for one workload domain."""
+
+    def check() -> Tuple[bool, str]:
+        domain = client.get(f"/v1/domains/{domain_id}", timeout=timeout, use_cache=False)
+        status = str(domain.get('status', 'ACTIVE')).upper()
+        if status != 'ACTIVE':
+            return False, f"Domain status is {status}"
+        if not domain.get('clusters'):
+            return False, 'Domain has no clusters'
+        return True, f"{len(domain['clusters'])} cluster(s), status ACTIVE"
+
+    return check